@@ -0,0 +1,32 @@
+"""add notification delivery uniqueness
+
+Revision ID: 4c9d2e7a1f35
+Revises: b7e3c1f04a92
+Create Date: 2025-02-05 14:37:09.512864
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c9d2e7a1f35'
+down_revision: Union[str, None] = 'b7e3c1f04a92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the first delivery of every (user_id, job_id) before enforcing one per pair
+    op.execute("""
+        DELETE FROM notifications a
+        USING notifications b
+        WHERE a.user_id = b.user_id AND a.job_id = b.job_id AND a.id > b.id
+    """)
+    op.create_unique_constraint('uq_notifications_user_id_job_id', 'notifications', ['user_id', 'job_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_notifications_user_id_job_id', 'notifications', type_='unique')
@@ -0,0 +1,65 @@
+"""add hot query indexes
+
+Revision ID: b7e3c1f04a92
+Revises: d1dc469f90f0
+Create Date: 2025-02-03 10:12:41.208315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3c1f04a92'
+down_revision: Union[str, None] = 'd1dc469f90f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # latest jobs: ORDER BY created_at DESC LIMIT 10
+    op.create_index('ix_jobs_created_at', 'jobs', [sa.text('created_at DESC')], unique=False)
+
+    # notification history: WHERE user_id = ? ORDER BY sent_at DESC, joined to jobs on job_id
+    op.create_index(
+        'ix_notifications_user_id_sent_at', 'notifications', ['user_id', sa.text('sent_at DESC')],
+        unique=False, postgresql_include=['job_id']
+    )
+
+    # update_user uniqueness checks; most users have neither id set
+    op.create_index(
+        'ix_users_telegram_id', 'users', ['telegram_id'],
+        unique=False, postgresql_where=sa.text('telegram_id IS NOT NULL')
+    )
+    op.create_index(
+        'ix_users_discord_id', 'users', ['discord_id'],
+        unique=False, postgresql_where=sa.text('discord_id IS NOT NULL')
+    )
+
+    # Drop duplicate subscriptions before enforcing (user_id, item_id) uniqueness
+    op.execute("""
+        DELETE FROM user_subscriptions a
+        USING user_subscriptions b
+        WHERE a.user_id = b.user_id AND a.item_id = b.item_id AND a.id > b.id
+    """)
+    op.create_unique_constraint('uq_user_subscriptions_user_id_item_id', 'user_subscriptions', ['user_id', 'item_id'])
+    # keyword subscribers: subscription_items.keyword -> item_id -> user_id, answered from the index alone
+    op.create_index(
+        'ix_user_subscriptions_item_id_user_id', 'user_subscriptions', ['item_id', 'user_id'], unique=False
+    )
+    # Both single-column indexes are now prefixes of the composite ones
+    op.drop_index('ix_user_subscriptions_user_id', table_name='user_subscriptions')
+    op.drop_index('ix_user_subscriptions_item_id', table_name='user_subscriptions')
+
+
+def downgrade() -> None:
+    op.create_index('ix_user_subscriptions_item_id', 'user_subscriptions', ['item_id'], unique=False)
+    op.create_index('ix_user_subscriptions_user_id', 'user_subscriptions', ['user_id'], unique=False)
+    op.drop_index('ix_user_subscriptions_item_id_user_id', table_name='user_subscriptions')
+    op.drop_constraint('uq_user_subscriptions_user_id_item_id', 'user_subscriptions', type_='unique')
+    op.drop_index('ix_users_discord_id', table_name='users')
+    op.drop_index('ix_users_telegram_id', table_name='users')
+    op.drop_index('ix_notifications_user_id_sent_at', table_name='notifications')
+    op.drop_index('ix_jobs_created_at', table_name='jobs')
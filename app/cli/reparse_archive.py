@@ -0,0 +1,69 @@
+import argparse
+import sys
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.html_archive import HtmlArchive
+from app.services.scraper_service import reparse_archive
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Re-parse archived chickpt pages without network access"
+    )
+    parser.add_argument(
+        "--archive-dir",
+        default=settings.SCRAPER_ARCHIVE_DIR,
+        help="archive directory (defaults to SCRAPER_ARCHIVE_DIR)",
+    )
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="save re-parsed jobs to the database instead of printing them",
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    return parser.parse_args(argv)
+
+def save_batch(job_repo, batch) -> int:
+    saved = job_repo.save_jobs(batch) or []
+    # Rows that already existed are remembered too, so URLs backfilled before the
+    # filter was in use stop showing up as unknown to the scraper
+    job_repo.remember_urls(batch)
+    return len(saved)
+
+def save_in_batches(jobs, batch_size: int) -> int:
+    from app.dependencies.database import SessionLocal
+    from app.dependencies.redis import redis_client
+    from app.repositories.job_repository import JobRepository
+
+    db = SessionLocal()
+    saved = 0
+    try:
+        job_repo = JobRepository(db, redis_client)
+        batch = []
+        for job in jobs:
+            batch.append(job)
+            if len(batch) >= batch_size:
+                saved += save_batch(job_repo, batch)
+                batch = []
+        if batch:
+            saved += save_batch(job_repo, batch)
+    finally:
+        db.close()
+    return saved
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if not args.archive_dir:
+        logger.error("No archive directory given and SCRAPER_ARCHIVE_DIR is not set")
+        return 1
+
+    jobs = reparse_archive(HtmlArchive(args.archive_dir))
+    if args.save:
+        saved = save_in_batches(jobs, args.batch_size)
+        logger.info(f"Saved {saved} re-parsed jobs")
+    else:
+        for job in jobs:
+            sys.stdout.write(job.model_dump_json() + "\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
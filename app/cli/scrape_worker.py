@@ -0,0 +1,23 @@
+import asyncio
+from app.core.logger import logger
+from app.dependencies.database import SessionLocal
+from app.dependencies.redis import redis_client, close_connection
+from app.services.http_client import close_http_client
+from app.services.scrape_scheduler import ScrapeScheduler
+
+async def main():
+    scrape_scheduler = ScrapeScheduler(SessionLocal, redis_client)
+    scrape_scheduler.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        logger.info("Shutting down scrape worker...")
+        scrape_scheduler.shutdown()
+        close_http_client()
+        close_connection()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -20,6 +20,18 @@ class Settings(BaseSettings):
     DB_NAME: str
     DB_PORT: int
     DATABASE_URL: Optional[PostgresDsn] = None
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Behind PgBouncer in transaction mode: let PgBouncer pool connections and
+    # disable asyncpg's prepared statement cache
+    DB_PGBOUNCER: bool = False
+    # Optional read replica for read-only endpoints; reads stay on the primary
+    # for READ_YOUR_WRITES_SECONDS after a user's own write
+    DATABASE_REPLICA_URL: Optional[PostgresDsn] = None
+    READ_YOUR_WRITES_SECONDS: int = 5
 
     # Email settings
     GMAIL_SENDER: str
@@ -27,12 +39,48 @@ class Settings(BaseSettings):
     SMTP_SERVER: str
     SMTP_PORT: int
 
+    # Notification ledger: delivery records are bulk inserted once this many are
+    # buffered or this many seconds have passed since the last write
+    NOTIFICATION_LEDGER_BATCH_SIZE: int = 500
+    NOTIFICATION_LEDGER_FLUSH_INTERVAL: float = 2.0
+    # How long a job's sent-set is kept in Redis to skip repeated deliveries
+    NOTIFICATION_SENT_TTL: int = 7 * 24 * 3600
+
     # Redis settings
     REDIS_SERVER: str
     REDIS_PORT: int
     REDIS_PASSWORD: SecretStr
     REDIS_POOL_SIZE: int
 
+    # Scraper settings
+    SCRAPER_MAX_CONCURRENCY: int = 5
+    SCRAPER_MAX_PAGES: int = 5
+    SCRAPER_FAST_PARSE: bool = True
+    SCRAPER_RATE_PER_SEC: float = 2.0
+    SCRAPER_RATE_BURST: int = 5
+    SCRAPER_MAX_RETRIES: int = 3
+    SCRAPER_BACKOFF_BASE: float = 0.5
+    SCRAPER_BACKOFF_MAX: float = 10.0
+    SCRAPER_BREAKER_THRESHOLD: int = 5
+    SCRAPER_BREAKER_RESET: float = 60.0
+    SCRAPER_RETRY_DELAY: float = 300.0
+    SCRAPER_RETRY_MAX_ATTEMPTS: int = 5
+    SCRAPER_SCHEDULER_ENABLED: bool = False
+    SCRAPER_SOURCES: str = "chickpt"
+    SCRAPER_SOURCE_TIME_BUDGET: float = 120.0
+    SCRAPER_MIN_INTERVAL: float = 30
+    SCRAPER_MAX_INTERVAL: float = 600
+    SCRAPER_ACTIVE_MAX_INTERVAL: float = 120
+    SCRAPER_ACTIVE_HOURS: str = "8-23"
+    SCRAPER_BACKOFF_FACTOR: float = 1.5
+    SCRAPER_ARCHIVE_DIR: Optional[str] = None
+    SCRAPER_ARCHIVE_REUSE_DETAILS: bool = True
+    URL_BLOOM_BITS: int = 2 ** 24
+    URL_BLOOM_HASHES: int = 7
+    SCRAPER_POOL_SIZE: int = 10
+    SCRAPER_CONNECT_TIMEOUT: float = 5.0
+    SCRAPER_READ_TIMEOUT: float = 15.0
+
     # JWT settings
     JWT_SECRET_KEY: str
     ALGORITHM: str
@@ -1,15 +1,16 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.security import verify_token
 from app.models.users import User
-from app.dependencies.database import get_db
+from app.dependencies.db_routing import get_read_db
 
 security = HTTPBearer()
 
 async def get_current_user(
     token = Depends(security),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ) -> int:
     payload = verify_token(token.credentials)
     if not payload:
@@ -19,5 +20,6 @@ async def get_current_user(
         )
     
     user_id = payload.get("sub")
-    user = db.query(User).filter(User.user_id == user_id).first()
+    result = await db.execute(select(User).where(User.user_id == user_id))
+    user = result.scalars().first()
     return user.user_id
\ No newline at end of file
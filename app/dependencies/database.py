@@ -1,18 +1,73 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
+from app.dependencies.db_pool import MeteredAsyncQueuePool, MeteredNullPool, MeteredQueuePool
 
 SQLALCHEMY_DATABASE_URL = str(settings.DATABASE_URL)
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+
+def pool_options(poolclass) -> dict:
+    if settings.DB_PGBOUNCER:
+        return {"poolclass": MeteredNullPool, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **pool_options(MeteredQueuePool))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The API serves requests through asyncpg so queries don't block the event loop;
+# the scraper, CLI tools and Alembic keep using the sync engine above
+def async_url(url: str) -> str:
+    return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+
+def create_async_pool_engine(url: str):
+    connect_args = {"statement_cache_size": 0, "prepared_statement_cache_size": 0} if settings.DB_PGBOUNCER else {}
+    return create_async_engine(async_url(url), connect_args=connect_args, **pool_options(MeteredAsyncQueuePool))
+
+class PrimarySession(Session):
+    pass
+
+@event.listens_for(PrimarySession, "after_commit")
+def remember_commit(session):
+    session.info["committed"] = True
+
+ASYNC_DATABASE_URL = async_url(SQLALCHEMY_DATABASE_URL)
+async_engine = create_async_pool_engine(SQLALCHEMY_DATABASE_URL)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    sync_session_class=PrimarySession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Without a replica configured, reads go to the primary
+replica_async_engine = (
+    create_async_pool_engine(str(settings.DATABASE_REPLICA_URL)) if settings.DATABASE_REPLICA_URL else None
+)
+ReplicaSessionLocal = (
+    async_sessionmaker(replica_async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+    if replica_async_engine else AsyncSessionLocal
+)
+
 Base = declarative_base()
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close() 
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,56 @@
+from typing import Optional
+from fastapi import Depends, HTTPException, Request
+from redis import Redis
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.security import verify_token
+from app.dependencies.database import AsyncSessionLocal, ReplicaSessionLocal
+from app.dependencies.redis import get_redis
+
+RECENT_WRITE_KEY = "db:recent_write:{user_id}"
+READ_PRIMARY_HEADER = "X-Read-Your-Writes"
+
+def request_user_id(request: Request) -> Optional[str]:
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return verify_token(token).get("sub")
+    except HTTPException:
+        return None
+
+def mark_recent_write(redis: Redis, user_id: str):
+    try:
+        redis.set(RECENT_WRITE_KEY.format(user_id=user_id), 1, ex=settings.READ_YOUR_WRITES_SECONDS)
+    except Exception as e:
+        logger.error(f"Error marking recent write: {e}")
+
+def has_recent_write(redis: Redis, user_id: str) -> bool:
+    try:
+        return bool(redis.exists(RECENT_WRITE_KEY.format(user_id=user_id)))
+    except Exception as e:
+        logger.error(f"Error checking recent write: {e}")
+        return True
+
+def read_session_factory(request: Request, redis: Redis):
+    if ReplicaSessionLocal is AsyncSessionLocal:
+        return AsyncSessionLocal
+    if request.headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true"):
+        return AsyncSessionLocal
+    user_id = request_user_id(request)
+    if user_id and has_recent_write(redis, user_id):
+        return AsyncSessionLocal
+    return ReplicaSessionLocal
+
+async def get_read_db(request: Request, redis: Redis = Depends(get_redis)):
+    async with read_session_factory(request, redis)() as db:
+        yield db
+
+async def get_write_db(request: Request, redis: Redis = Depends(get_redis)):
+    async with AsyncSessionLocal() as db:
+        yield db
+        # Keep this user's next reads on the primary until the replica has caught up
+        user_id = request_user_id(request)
+        if user_id and db.sync_session.info.get("committed"):
+            mark_recent_write(redis, user_id)
@@ -38,21 +38,22 @@ def update_latest_jobs_cache(new_job_data: dict, max_jobs: int = 10):
     except Exception as e:
         logger.error(f"Error updating cache: {str(e)}")
 
-def subscribe(channel: str, message_handler):
+def listen(channel: str, on_message, on_subscribe=None):
    while True:
        try:
            pubsub = redis_client.pubsub()
            pubsub.subscribe(channel)
-           logger.info(f"Successfully subscribed to channel: {channel}")
            
            for message in pubsub.listen():
-               if message['type'] == 'message':
+               if message['type'] == 'subscribe':
+                   logger.info(f"Successfully subscribed to channel: {channel}")
+                   # Messages published while not subscribed are gone, so callers
+                   # resync here, before any message of this subscription is handled
+                   if on_subscribe:
+                       on_subscribe()
+               elif message['type'] == 'message':
                    try:
-                       data = json.loads(message['data'])
-                       update_latest_jobs_cache(data)
-                       logger.info(f"receive new job: {data['title']}")
-                       
-                       asyncio.run(message_handler(data))
+                       on_message(json.loads(message['data']))
                    except Exception as e:
                        logger.error(f"Error processing message: {e}")
                        
@@ -61,5 +62,19 @@ def subscribe(channel: str, message_handler):
            logger.info("Attempting to reconnect in 5 seconds...")
            time.sleep(5)
 
+def subscribe(channel: str, message_handler, loop: asyncio.AbstractEventLoop = None):
+   def on_message(data: dict):
+       update_latest_jobs_cache(data)
+       logger.info(f"receive new job: {data['title']}")
+
+       # Handlers use the app's async DB engine, whose connections
+       # belong to the main event loop, so run them there
+       if loop:
+           asyncio.run_coroutine_threadsafe(message_handler(data), loop).result()
+       else:
+           asyncio.run(message_handler(data))
+
+   listen(channel, on_message)
+
 def close_connection():
     pool.close()
@@ -1,40 +1,67 @@
 from contextlib import asynccontextmanager
+from functools import partial
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import users, subscriptions, jobs, notifications, health
-from app.dependencies.database import get_db
-from app.dependencies.redis import get_redis, close_connection, subscribe
+from app.core.config import settings
+from app.dependencies.database import AsyncSessionLocal, SessionLocal
+from app.dependencies.redis import get_redis, close_connection, listen, subscribe
 from app.services.notification_service import NotificationService
+from app.services.subscription_index import SUBSCRIPTION_CHANGES_CHANNEL, get_subscription_index
+from app.services.http_client import close_http_client
+from app.services.scrape_scheduler import ScrapeScheduler
 from app.core.logger import logger
 import asyncio
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    db = next(get_db())
-    redis = get_redis()
+    db = AsyncSessionLocal()
+    redis = next(get_redis())
     notification_service = NotificationService(db, redis)
+
+    # The index is (re)loaded each time the listener's subscription is confirmed,
+    # so changes missed before it or during a reconnect are picked up
+    subscription_index = get_subscription_index()
+    index_task = asyncio.create_task(
+        asyncio.to_thread(
+            listen,
+            SUBSCRIPTION_CHANGES_CHANNEL,
+            subscription_index.apply,
+            partial(subscription_index.resync, AsyncSessionLocal, asyncio.get_running_loop())
+        )
+    )
     
     task = asyncio.create_task(
         asyncio.to_thread(
             subscribe,
             'new_job',
-            notification_service.process_job
+            notification_service.process_job,
+            asyncio.get_running_loop()
         )
     )
+
+    scrape_scheduler = None
+    if settings.SCRAPER_SCHEDULER_ENABLED:
+        scrape_scheduler = ScrapeScheduler(SessionLocal, redis)
+        scrape_scheduler.start()
     
     logger.info("Application startup complete")
     yield
     
     logger.info("Shutting down...")
-    task.cancel()
-    try:
-        await task
-    except asyncio.CancelledError:
-        pass
+    if scrape_scheduler:
+        scrape_scheduler.shutdown()
+    for t in (task, index_task):
+        t.cancel()
+        try:
+            await t
+        except asyncio.CancelledError:
+            pass
     
     logger.info("Closing resources...")
-    db.close()
+    await db.close()
     close_connection()
+    close_http_client()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from sqlalchemy.sql import func
 from app.dependencies.database import Base
 
@@ -15,3 +15,7 @@ class Job(Base):
     url = Column(String, unique=True, index=True)
     time = Column(String)
     created_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_jobs_created_at", created_at.desc()),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from app.dependencies.database import Base
 
@@ -8,4 +8,9 @@ class Notification(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.user_id"))
     job_id = Column(Integer, ForeignKey("jobs.id"))
-    sent_at = Column(DateTime, server_default=func.now())
\ No newline at end of file
+    sent_at = Column(DateTime, server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_notifications_user_id_sent_at", user_id, sent_at.desc(), postgresql_include=["job_id"]),
+        UniqueConstraint("user_id", "job_id", name="uq_notifications_user_id_job_id"),
+    )
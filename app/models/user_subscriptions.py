@@ -1,8 +1,13 @@
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index, UniqueConstraint
 from app.dependencies.database import Base
 class UserSubscription(Base):
     __tablename__ = "user_subscriptions"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey('users.user_id'), nullable=False, index=True)
-    item_id = Column(Integer, ForeignKey('subscription_items.item_id'), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey('users.user_id'), nullable=False)
+    item_id = Column(Integer, ForeignKey('subscription_items.item_id'), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "item_id", name="uq_user_subscriptions_user_id_item_id"),
+        Index("ix_user_subscriptions_item_id_user_id", item_id, user_id),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from app.dependencies.database import Base
 
@@ -13,6 +13,11 @@ class User(Base):
     discord_id = Column(String, nullable=True, default=None)
     telegram_id = Column(String, nullable=True, default=None)
     created_at = Column(DateTime, default=func.now())
+
+    __table_args__ = (
+        Index("ix_users_telegram_id", telegram_id, postgresql_where=telegram_id.isnot(None)),
+        Index("ix_users_discord_id", discord_id, postgresql_where=discord_id.isnot(None)),
+    )
     
     class Config:
         orm_mode = True
\ No newline at end of file
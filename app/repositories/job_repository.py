@@ -1,35 +1,103 @@
+import asyncio
+from concurrent.futures import Executor
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import Session
-from typing import List
+from typing import AsyncIterator, List, Optional, Set
+from redis import Redis
 from app.models.jobs import Job
+from app.core.logger import logger
 from app.services.scraper_service import JobDetail
+from app.services.url_dedupe_service import UrlDedupeService
 
 class JobRepository:
-    def __init__(self, db: Session):
+    # Keeps each statement well under Postgres' 65535 bind parameter limit
+    BULK_INSERT_BATCH_SIZE = 1000
+
+    def __init__(self, db: Session, redis: Optional[Redis] = None):
         self.db = db
+        self.url_dedupe = UrlDedupeService(db, redis) if redis is not None else None
 
-    def save_jobs(self, jobs: List[JobDetail]) -> bool:
-        new_jobs = []
-        for job in jobs:
-            existing_job = self.db.query(Job).filter(Job.url == job.url).first()
-            if existing_job:
-                continue
-            new_job = Job(
-                title=job.title,
-                employer=job.employer,
-                location=job.location,
-                salary=job.salary,
-                content=job.content,
-                url=job.url,
-                time=job.job_time,
-                created_at=job.created_at,
-            )
-            self.db.add(new_job)
-            self.db.flush()
+    def get_known_urls(self, urls: List[str]) -> Set[str]:
+        if not urls:
+            return set()
+        if self.url_dedupe:
+            return self.url_dedupe.get_known_urls(urls)
+        rows = self.db.query(Job.url).filter(Job.url.in_(urls)).all()
+        return {row[0] for row in rows}
+
+    def remember_urls(self, jobs: List[Job]):
+        if self.url_dedupe:
+            try:
+                self.url_dedupe.add_many(job.url for job in jobs)
+            except Exception as e:
+                logger.error(f"Error updating job url index: {e}")
+
+    def save_job(self, job: JobDetail) -> Optional[Job]:
+        # The same single-statement insert as save_jobs: a URL another writer (the
+        # Lambda) inserted first comes back with no row instead of an IntegrityError
+        try:
+            new_job = self.db.scalars(self.insert_ignoring_conflicts([job_row(job)])).first()
+            if new_job is None:
+                self.db.rollback()
+                return None
+            self.db.commit()
             self.db.refresh(new_job)
-            new_jobs.append(new_job)
+        except Exception:
+            self.db.rollback()
+            raise
+        self.remember_urls([new_job])
+        return new_job
+
+    async def save_job_stream(
+        self, jobs: AsyncIterator[JobDetail], executor: Optional[Executor] = None
+    ) -> AsyncIterator[Job]:
+        # Saves block on the database, so they run off the event loop
+        loop = asyncio.get_running_loop()
+        async for job in jobs:
+            new_job = await loop.run_in_executor(executor, self.save_job, job)
+            if new_job:
+                yield new_job
+
+    def insert_ignoring_conflicts(self, rows: List[dict]):
+        return postgresql.insert(Job).values(rows).on_conflict_do_nothing(index_elements=["url"]).returning(Job)
 
+    def save_jobs(self, jobs: List[JobDetail]) -> Optional[List[Job]]:
+        rows = {}
+        for job in jobs:
+            rows.setdefault(job.url, job_row(job))
+        rows = list(rows.values())
+
+        # One INSERT ... ON CONFLICT (url) DO NOTHING RETURNING per batch; rows that
+        # already exist are skipped by the database instead of a SELECT per job
+        inserted = {}
+        try:
+            for i in range(0, len(rows), self.BULK_INSERT_BATCH_SIZE):
+                stmt = self.insert_ignoring_conflicts(rows[i:i + self.BULK_INSERT_BATCH_SIZE])
+                for new_job in self.db.scalars(stmt):
+                    inserted[new_job.url] = new_job
+            if inserted:
+                self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        # RETURNING order is not guaranteed, so restore the input order
+        new_jobs = [inserted[row["url"]] for row in rows if row["url"] in inserted]
         if new_jobs:
-            self.db.commit()
+            self.remember_urls(new_jobs)
             return new_jobs
         else:
             return None
+
+
+def job_row(job: JobDetail) -> dict:
+    return {
+        "title": job.title,
+        "employer": job.employer,
+        "location": job.location,
+        "salary": job.salary,
+        "content": job.content,
+        "url": job.url,
+        "time": job.job_time,
+        "created_at": job.created_at,
+    }
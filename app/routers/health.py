@@ -1,5 +1,10 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Depends, status
 from fastapi.responses import JSONResponse
+from redis import Redis
+from app.dependencies.database import async_engine, engine, replica_async_engine
+from app.dependencies.db_pool import pool_status
+from app.dependencies.redis import get_redis
+from app.services.listing_cache_service import ListingCacheService
 
 router = APIRouter()
 
@@ -10,4 +15,18 @@ async def health_check():
     }
     status_code = status.HTTP_200_OK 
 
-    return JSONResponse(content=health_status, status_code=status_code)
\ No newline at end of file
+    return JSONResponse(content=health_status, status_code=status_code)
+
+@router.get("/health/scraper")
+async def scraper_stats(redis: Redis = Depends(get_redis)):
+    return {"listing_cache": ListingCacheService(redis).get_stats()}
+
+@router.get("/health/db")
+async def db_pool_stats():
+    stats = {
+        "async_pool": pool_status(async_engine.sync_engine),
+        "sync_pool": pool_status(engine),
+    }
+    if replica_async_engine:
+        stats["replica_pool"] = pool_status(replica_async_engine.sync_engine)
+    return stats
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends
 from typing import List
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from redis import Redis
-from app.dependencies.database import get_db
+from app.dependencies.db_routing import get_read_db
 from app.dependencies.redis import get_redis
 from app.dependencies.auth import get_current_user
 from app.schemas.job import JobResponse
@@ -10,7 +10,7 @@ from app.services.job_service import JobService
 
 router = APIRouter()
 
-def get_job_service(db: Session = Depends(get_db), redis: Redis = Depends(get_redis)) -> JobService:
+def get_job_service(db: AsyncSession = Depends(get_read_db), redis: Redis = Depends(get_redis)) -> JobService:
     return JobService(db, redis)
 
 @router.get("/api/jobs", response_model=List[JobResponse])
@@ -18,4 +18,4 @@ async def get_jobs(
     job_service: JobService = Depends(get_job_service),
     _: int = Depends(get_current_user)
 ):
-    return job_service.get_latest_ten_jobs() 
\ No newline at end of file
+    return await job_service.get_latest_ten_jobs() 
\ No newline at end of file
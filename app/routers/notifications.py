@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from app.dependencies.database import get_db
+from app.dependencies.db_routing import get_read_db
 from app.dependencies.redis import get_redis
 from app.services.notification_service import NotificationService
 from app.schemas.notification import NotificationHistoryResponse, NotificationTypeResponse
@@ -10,7 +10,7 @@ from app.dependencies.auth import get_current_user
 
 router = APIRouter()
 
-def get_notification_service(db: Session = Depends(get_db), redis = Depends(get_redis)) -> NotificationService:
+def get_notification_service(db: AsyncSession = Depends(get_read_db), redis = Depends(get_redis)) -> NotificationService:
     return NotificationService(db, redis)
 
 @router.get("/api/notifications/history", response_model=List[NotificationHistoryResponse], tags=["notifications"])
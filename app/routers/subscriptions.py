@@ -1,8 +1,8 @@
 #app/dependencies/subscripitons.py
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.dependencies.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.dependencies.db_routing import get_read_db, get_write_db
 from app.dependencies.redis import get_redis
 from app.services.subscription_service import SubscriptionService
 from app.services.keyword_ranking_service import KeywordRankingService
@@ -12,10 +12,13 @@ from typing import List
 
 router = APIRouter()
 
-def get_subscription_service(db: Session = Depends(get_db), redis = Depends(get_redis)) -> SubscriptionService:
+def get_subscription_service(db: AsyncSession = Depends(get_write_db), redis = Depends(get_redis)) -> SubscriptionService:
     return SubscriptionService(db, redis)
 
-def get_ranking_service(db: Session = Depends(get_db), redis = Depends(get_redis)) -> KeywordRankingService:
+def get_subscription_read_service(db: AsyncSession = Depends(get_read_db), redis = Depends(get_redis)) -> SubscriptionService:
+    return SubscriptionService(db, redis)
+
+def get_ranking_service(db: AsyncSession = Depends(get_read_db), redis = Depends(get_redis)) -> KeywordRankingService:
     return KeywordRankingService(db, redis)
 
 @router.post("/api/keywords/addKeyword", response_model=dict)
@@ -37,10 +40,10 @@ async def delete_keyword_subscription(
 
 @router.get("/api/keywords", response_model=List[SubscriptionResponse])
 async def get_keyword_subscriptions(
-    subscription_service: SubscriptionService = Depends(get_subscription_service),
+    subscription_service: SubscriptionService = Depends(get_subscription_read_service),
     current_user: int = Depends(get_current_user)
 ):
-    return subscription_service.get_user_subscriptions(current_user)
+    return await subscription_service.get_user_subscriptions(current_user)
 
 @router.get("/api/keywords/ranking", response_model=List[KeywordRankingResponse])
 async def get_keyword_ranking(
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from enum import Enum
-from typing import List
+from typing import List, Optional
 from datetime import datetime
     
 class NotificationPreference(BaseModel):
@@ -8,6 +8,13 @@ class NotificationPreference(BaseModel):
     notification_type: str
     description: str
 
+class NotificationRecipient(BaseModel):
+    user_id: int
+    notification_type: str
+    email: Optional[str] = None
+    discord_id: Optional[str] = None
+    telegram_id: Optional[str] = None
+
 class JobNotification(BaseModel):
     title: str
     url: str
@@ -0,0 +1,88 @@
+import gzip
+import json
+import os
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
+from app.core.config import settings
+from app.core.logger import logger
+
+class HtmlArchive:
+    INDEX_FILE = "index.jsonl"
+
+    def __init__(self, root: str):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, self.INDEX_FILE)
+        self.lock = threading.Lock()
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.latest: Dict[str, str] = {}
+        for entry in self.entries():
+            self.latest[entry["url"]] = entry["digest"]
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.html.gz")
+
+    def put(self, url: str, html: str, kind: str) -> str:
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+
+        with self.lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with gzip.open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+
+            if self.latest.get(url) != digest:
+                entry = {
+                    "url": url,
+                    "kind": kind,
+                    "digest": digest,
+                    "fetched_at": datetime.now().isoformat(),
+                }
+                with open(self.index_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                self.latest[url] = digest
+        return digest
+
+    def read(self, digest: str) -> str:
+        with gzip.open(self.object_path(digest), "rb") as f:
+            return f.read().decode("utf-8")
+
+    def get(self, url: str) -> Optional[str]:
+        digest = self.latest.get(url)
+        if not digest:
+            return None
+        try:
+            return self.read(digest)
+        except OSError as e:
+            logger.error(f"Error reading archived page {url}: {e}")
+            return None
+
+    def entries(self, kind: Optional[str] = None) -> Iterator[dict]:
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if kind is None or entry["kind"] == kind:
+                    yield entry
+
+    def pages(self, kind: str) -> Iterator[Tuple[str, str]]:
+        for entry in self.entries(kind):
+            yield entry["url"], self.read(entry["digest"])
+
+
+_archive: Optional[HtmlArchive] = None
+
+def get_html_archive() -> Optional[HtmlArchive]:
+    global _archive
+    if settings.SCRAPER_ARCHIVE_DIR and _archive is None:
+        _archive = HtmlArchive(settings.SCRAPER_ARCHIVE_DIR)
+    return _archive
@@ -0,0 +1,108 @@
+import time
+import requests
+import urllib3
+from typing import Optional
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.scraper_resilience import HostGuard, ScrapeError, backoff_delay
+
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+USER_AGENT = "Mozilla/5.0 (compatible; ChickptNotify/1.0)"
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+def parse_retry_after(response: requests.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+class ScraperHttpClient:
+    def __init__(
+        self,
+        pool_size: int = settings.SCRAPER_POOL_SIZE,
+        connect_timeout: float = settings.SCRAPER_CONNECT_TIMEOUT,
+        read_timeout: float = settings.SCRAPER_READ_TIMEOUT,
+        verify: bool = False,
+        max_retries: int = settings.SCRAPER_MAX_RETRIES,
+        backoff_base: float = settings.SCRAPER_BACKOFF_BASE,
+        backoff_max: float = settings.SCRAPER_BACKOFF_MAX,
+        guard: Optional[HostGuard] = None,
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.verify = verify
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.guard = guard or HostGuard()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(
+            {
+                "User-Agent": USER_AGENT,
+                "Accept-Encoding": ACCEPT_ENCODING,
+                "Connection": "keep-alive",
+            }
+        )
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        kwargs.setdefault("verify", self.verify)
+        host = urlsplit(url).netloc
+        breaker = self.guard.breaker(host)
+        bucket = self.guard.bucket(host)
+
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            breaker.before_request(host)
+            bucket.acquire()
+            retry_after = None
+            try:
+                response = self.session.get(url, **kwargs)
+            except requests.RequestException as e:
+                last_error = str(e)
+            else:
+                if response.status_code not in RETRYABLE_STATUSES:
+                    breaker.record_success()
+                    return response
+                last_error = f"HTTP {response.status_code}"
+                retry_after = parse_retry_after(response)
+
+            breaker.record_failure()
+            if attempt < self.max_retries:
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+                if retry_after is not None:
+                    delay = min(retry_after, self.backoff_max)
+                logger.warning(f"Request to {url} failed ({last_error}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+        raise ScrapeError(f"Giving up on {url} after {self.max_retries + 1} attempts: {last_error}")
+
+    def close(self):
+        self.session.close()
+
+
+_client: Optional[ScraperHttpClient] = None
+
+def get_http_client() -> ScraperHttpClient:
+    global _client
+    if _client is None:
+        _client = ScraperHttpClient()
+    return _client
+
+def close_http_client():
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
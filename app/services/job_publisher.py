@@ -0,0 +1,36 @@
+import asyncio
+import json
+from concurrent.futures import Executor
+from typing import AsyncIterator, Optional
+from redis import Redis
+from app.models.jobs import Job
+from app.core.logger import logger
+
+NEW_JOB_CHANNEL = "new_job"
+
+def job_to_message(job: Job) -> dict:
+    return {
+        "id": job.id,
+        "title": job.title,
+        "employer": job.employer,
+        "location": job.location,
+        "salary": job.salary,
+        "content": job.content,
+        "url": job.url,
+        "time": job.time,
+        "created_at": job.created_at.isoformat(),
+    }
+
+def publish_new_job(redis: Redis, job: Job):
+    try:
+        redis.publish(NEW_JOB_CHANNEL, json.dumps(job_to_message(job)))
+    except Exception as e:
+        logger.error(f"Redis publish error: {str(e)}")
+
+async def publish_job_stream(redis: Redis, jobs: AsyncIterator[Job], executor: Optional[Executor] = None) -> int:
+    loop = asyncio.get_running_loop()
+    published = 0
+    async for job in jobs:
+        await loop.run_in_executor(executor, publish_new_job, redis, job)
+        published += 1
+    return published
@@ -0,0 +1,163 @@
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+
+# Aho-Corasick automaton over lowercased subscription keywords. Adding a keyword
+# inserts its new nodes and relinks only the failure links they affect, so the
+# automaton is always ready to match; removing one only clears its output.
+class KeywordMatcher:
+
+    def __init__(self, keywords: Iterable[str] = ()):
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.reset()
+        for keyword in keywords:
+            self._insert(keyword)
+        self._build()
+
+    def reset(self):
+        self.children: List[dict] = [{}]
+        self.fail: List[int] = [0]
+        self.parent: List[int] = [0]
+        self.depth: List[int] = [0]
+        # Edge label into each node, used to find nodes to relink under the root
+        self.char: List[str] = [""]
+        self.output: List[Optional[str]] = [None]
+        # Reverse failure links: nodes whose failure link points at the key
+        self.fail_children: Dict[int, Set[int]] = {}
+        self.keywords: Set[str] = set()
+
+    def load(self, keywords: Iterable[str]):
+        with self.lock:
+            self.reset()
+            for keyword in keywords:
+                self._insert(keyword)
+            self._build()
+            self.loaded = True
+
+    def add(self, keyword: str):
+        with self.lock:
+            for node in self._insert(keyword):
+                self._link(node)
+
+    def remove(self, keyword: str):
+        keyword = keyword.lower()
+        with self.lock:
+            if keyword not in self.keywords:
+                return
+            node = 0
+            for char in keyword:
+                node = self.children[node][char]
+            self.output[node] = None
+            self.keywords.discard(keyword)
+
+    def match(self, text: str) -> Set[str]:
+        with self.lock:
+            children, fail, output = self.children, self.fail, self.output
+            matched = set()
+            node = 0
+            for char in text.lower():
+                while node and char not in children[node]:
+                    node = fail[node]
+                node = children[node].get(char, 0)
+                # Removed keywords keep their node, so the chain may pass through
+                # nodes with no output
+                hit = node
+                while hit:
+                    if output[hit] is not None:
+                        matched.add(output[hit])
+                    hit = fail[hit]
+            return matched
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword.lower() in self.keywords
+
+    def _insert(self, keyword: str) -> List[int]:
+        # Returns the nodes created for the keyword, shallowest first
+        keyword = keyword.lower()
+        if not keyword or keyword in self.keywords:
+            return []
+        created = []
+        node = 0
+        for char in keyword:
+            next_node = self.children[node].get(char)
+            if next_node is None:
+                next_node = len(self.children)
+                self.children.append({})
+                self.fail.append(0)
+                self.parent.append(node)
+                self.depth.append(self.depth[node] + 1)
+                self.char.append(char)
+                self.output.append(None)
+                self.children[node][char] = next_node
+                created.append(next_node)
+            node = next_node
+        self.output[node] = keyword
+        self.keywords.add(keyword)
+        return created
+
+    def _set_fail(self, node: int, link: int):
+        siblings = self.fail_children.get(self.fail[node])
+        if siblings is not None:
+            siblings.discard(node)
+        self.fail[node] = link
+        self.fail_children.setdefault(link, set()).add(node)
+
+    def _find_fail(self, parent: int, char: str, node: int) -> int:
+        children, fail = self.children, self.fail
+        if not parent:
+            return 0
+        link = fail[parent]
+        while link and char not in children[link]:
+            link = fail[link]
+        link = children[link].get(char, 0)
+        return link if link != node else 0
+
+    def _link(self, node: int):
+        # Called for each new node shallowest first, so every failure link above
+        # this depth is already final
+        children, fail, depth = self.children, self.fail, self.depth
+        char, parent = self.char[node], self.parent[node]
+        self._set_fail(node, self._find_fail(parent, char, node))
+
+        # Existing nodes ending in this node's string now fail to it when it is
+        # a longer suffix than their current link. Their parents all end in the
+        # parent's string, i.e. sit in its subtree of the failure-link tree.
+        if parent:
+            candidates = []
+            stack = [parent]
+            while stack:
+                suffix = stack.pop()
+                child = children[suffix].get(char)
+                if child is not None and child != node:
+                    candidates.append(child)
+                stack.extend(self.fail_children.get(suffix, ()))
+        else:
+            # Under the root that subtree is the whole trie, but only nodes that
+            # currently fail to the root can gain a depth-one link
+            candidates = [
+                child for child in self.fail_children.get(0, ())
+                if self.char[child] == char and child != node
+            ]
+        for child in candidates:
+            if depth[fail[child]] < depth[node]:
+                self._set_fail(child, node)
+
+    def _build(self):
+        children, fail = self.children, self.fail
+        self.fail_children = {}
+        queue = deque()
+        for child in children[0].values():
+            self._set_fail(child, 0)
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for char, child in children[node].items():
+                link = fail[node]
+                while link and char not in children[link]:
+                    link = fail[link]
+                self._set_fail(child, children[link].get(char, 0))
+                queue.append(child)
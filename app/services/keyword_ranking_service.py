@@ -1,5 +1,5 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, text
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from app.models.subscription_items import SubscriptionItem
 from app.models.user_subscriptions import UserSubscription
@@ -11,7 +11,7 @@ POPULAR_KEYWORDS_SORTED_SET = "popular_keywords_zset"
 CACHE_EXPIRATION = 3600
 
 class KeywordRankingService:
-    def __init__(self, db: Session, redis: Redis):
+    def __init__(self, db: AsyncSession, redis: Redis):
         self.db = db
         self.redis = redis
 
@@ -41,14 +41,15 @@ class KeywordRankingService:
             
             if not popular_keywords:
                 keywords_data = (
-                    self.db.query(
-                        SubscriptionItem.keyword,
-                        func.count(UserSubscription.user_id).label('subscriber_count')
+                    await self.db.execute(
+                        select(
+                            SubscriptionItem.keyword,
+                            func.count(UserSubscription.user_id).label('subscriber_count')
+                        )
+                        .join(UserSubscription, UserSubscription.item_id == SubscriptionItem.item_id)
+                        .group_by(SubscriptionItem.keyword)
                     )
-                    .join(UserSubscription, UserSubscription.item_id == SubscriptionItem.item_id)
-                    .group_by(SubscriptionItem.keyword)
-                    .all()
-                )
+                ).all()
                 
                 for keyword, count in keywords_data:
                     self.redis.zadd(
@@ -0,0 +1,97 @@
+import hashlib
+import json
+from typing import Dict, List
+from redis import Redis
+from app.core.logger import logger
+
+LISTING_CACHE_KEY = "scraper:listing:{url}"
+LISTING_STATS_KEY = "scraper:listing:stats"
+# Fingerprinted per listing item; the relative post times on the page change
+# every minute and would defeat the cache. Must match the Lambda's ListingCache.
+LISTING_FINGERPRINT_FIELDS = ("url", "title", "employer", "salary", "location")
+
+class ListingCacheService:
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    @staticmethod
+    def fingerprint(items: List[dict]) -> str:
+        rows = [[item[field] for field in LISTING_FINGERPRINT_FIELDS] for item in items]
+        return hashlib.sha256(json.dumps(rows, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        try:
+            cached = self.redis.hgetall(LISTING_CACHE_KEY.format(url=url))
+        except Exception as e:
+            logger.error(f"Error reading listing cache: {e}")
+            return {}
+
+        headers = {}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    def is_unchanged(self, url: str, fingerprint: str) -> bool:
+        try:
+            cached = self.redis.hget(LISTING_CACHE_KEY.format(url=url), "fingerprint")
+            return cached == fingerprint
+        except Exception as e:
+            logger.error(f"Error reading listing cache: {e}")
+            return False
+
+    def store(self, url: str, headers: Dict[str, str], fingerprint: str, size: int):
+        mapping = {"fingerprint": fingerprint, "size": size}
+        if headers.get("ETag"):
+            mapping["etag"] = headers["ETag"]
+        if headers.get("Last-Modified"):
+            mapping["last_modified"] = headers["Last-Modified"]
+        try:
+            key = LISTING_CACHE_KEY.format(url=url)
+            pipe = self.redis.pipeline()
+            pipe.delete(key)
+            pipe.hset(key, mapping=mapping)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Error storing listing cache: {e}")
+
+    def record_not_modified(self, url: str):
+        try:
+            size = self.redis.hget(LISTING_CACHE_KEY.format(url=url), "size") or 0
+            pipe = self.redis.pipeline()
+            pipe.hincrby(LISTING_STATS_KEY, "not_modified_hits", 1)
+            pipe.hincrby(LISTING_STATS_KEY, "bytes_saved", int(size))
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Error updating listing cache stats: {e}")
+
+    def record_fingerprint_hit(self):
+        self._incr("fingerprint_hits")
+
+    def record_miss(self, size: int):
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hincrby(LISTING_STATS_KEY, "misses", 1)
+            pipe.hincrby(LISTING_STATS_KEY, "bytes_downloaded", size)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Error updating listing cache stats: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = {
+            "not_modified_hits": 0,
+            "fingerprint_hits": 0,
+            "misses": 0,
+            "bytes_saved": 0,
+            "bytes_downloaded": 0,
+        }
+        for field, value in self.redis.hgetall(LISTING_STATS_KEY).items():
+            stats[field] = int(value)
+        return stats
+
+    def _incr(self, field: str):
+        try:
+            self.redis.hincrby(LISTING_STATS_KEY, field, 1)
+        except Exception as e:
+            logger.error(f"Error updating listing cache stats: {e}")
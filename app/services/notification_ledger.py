@@ -0,0 +1,74 @@
+import time
+from typing import List, Optional
+from redis import Redis
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.logger import logger
+from app.models.notifications import Notification
+
+SENT_KEY = "notifications:sent:{job_id}"
+
+class NotificationLedger:
+    def __init__(
+        self,
+        db: AsyncSession,
+        redis: Optional[Redis] = None,
+        batch_size: int = settings.NOTIFICATION_LEDGER_BATCH_SIZE,
+        flush_interval: float = settings.NOTIFICATION_LEDGER_FLUSH_INTERVAL,
+        sent_ttl: int = settings.NOTIFICATION_SENT_TTL,
+    ):
+        self.db = db
+        self.redis = redis
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sent_ttl = sent_ttl
+        self.pending: List[dict] = []
+        self.flushed_at = time.monotonic()
+
+    def claim(self, user_id: int, job_id: int) -> bool:
+        # SADD is atomic, so of several consumers handling the same job only one
+        # gets to send to each user; the rest skip it without touching the database
+        if self.redis is None:
+            return True
+        key = SENT_KEY.format(job_id=job_id)
+        try:
+            pipe = self.redis.pipeline()
+            pipe.sadd(key, user_id)
+            pipe.expire(key, self.sent_ttl)
+            added, _ = pipe.execute()
+        except Exception as e:
+            # Without Redis the unique constraint still keeps the ledger to one row per delivery
+            logger.error(f"Error checking sent notifications: {e}")
+            return True
+        return bool(added)
+
+    def release(self, user_id: int, job_id: int):
+        # A failed send gives up its claim so a retry can deliver it
+        if self.redis is None:
+            return
+        try:
+            self.redis.srem(SENT_KEY.format(job_id=job_id), user_id)
+        except Exception as e:
+            logger.error(f"Error releasing sent notification: {e}")
+
+    async def record(self, user_id: int, job_id: int):
+        self.pending.append({"user_id": user_id, "job_id": job_id})
+        if len(self.pending) >= self.batch_size or time.monotonic() - self.flushed_at >= self.flush_interval:
+            await self.flush()
+
+    async def flush(self):
+        self.flushed_at = time.monotonic()
+        if not self.pending:
+            return
+        rows, self.pending = self.pending, []
+        try:
+            stmt = postgresql.insert(Notification).on_conflict_do_nothing(index_elements=["user_id", "job_id"])
+            await self.db.execute(stmt, rows)
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            # Keep the records of sends that already happened for the next flush
+            self.pending = rows + self.pending
+            raise
+        logger.info(f"Recorded {len(rows)} notifications")
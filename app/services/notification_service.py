@@ -1,6 +1,9 @@
 from typing import List
 from redis import Redis
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.services.notification_ledger import NotificationLedger
+from app.services.subscription_index import SubscriptionIndex, get_subscription_index
 from app.services.subscription_service import SubscriptionService
 from app.services.user_service import UserService
 from app.schemas.notification import NotificationHistoryResponse
@@ -14,72 +17,78 @@ from app.schemas.notification import NotificationTypeResponse
 from app.core.logger import logger
 
 class NotificationService:
-    def __init__(self, db: Session, redis: Redis):
+    def __init__(self, db: AsyncSession, redis: Redis):
         self.db = db
         self.subscription_service = SubscriptionService(db, redis)
-        self.user_service = UserService(db)
+        self.user_service = UserService(db, redis)
+        self.ledger = NotificationLedger(db, redis)
         self.strategies = {
-            'Email': EmailNotification(db),
+            'Email': EmailNotification(),
             'Discord': DiscordNotification(),
             'Telegram': TelegramNotification()
         }
     
-    def match_keyword(self, title: str, keyword: str) -> bool:
-        return keyword.lower() in title.lower()
+    async def get_subscription_index(self) -> SubscriptionIndex:
+        # Normally loaded at startup; load here for callers outside the app lifespan
+        index = get_subscription_index()
+        if not index.loaded:
+            await index.load(self.db)
+        return index
 
     async def process_job(self, job_data: dict):
         try:
-            all_subscriptions = await self.subscription_service.get_all_subscriptions()
-            matched_keywords = set()
-            for sub in all_subscriptions:
-                if self.match_keyword(job_data['title'], sub.keyword):
-                    matched_keywords.add(sub.keyword)
+            index = await self.get_subscription_index()
+            matched_keywords = index.match(job_data['title'])
             if not matched_keywords:
                 return
             
-            job = self.db.query(Job).filter(Job.url == job_data['url']).first()
+            result = await self.db.execute(select(Job).where(Job.url == job_data['url']))
+            job = result.scalars().first()
             if not job:
                 return
 
-            notified_users = set()
-            
+            subscribers = set()
             for keyword in matched_keywords:
-                subscribers = await self.subscription_service.get_keyword_subscribers(keyword)
-                
-                for user_id in subscribers:
-                    if user_id in notified_users:
-                        continue
-                    
-                    preference = await self.user_service.get_user_notification_preferences(user_id)
-                    if preference.notification_type in self.strategies:
-                        await self.strategies[preference.notification_type].send(
-                            user_id, 
-                            job, 
-                        )
-                        
-                        db_notification = Notification(
-                            user_id=user_id,
-                            job_id=job.id
-                        )
-                        self.db.add(db_notification)
-                        self.db.commit()
-                    
+                subscribers |= index.get_subscribers(keyword)
+
+            recipients = await self.user_service.get_notification_recipients(subscribers)
+            notified_users = set()
+
+            try:
+                for user_id, recipient in sorted(recipients.items()):
+                    if recipient.notification_type in self.strategies:
+                        if not self.ledger.claim(user_id, job.id):
+                            continue
+                        try:
+                            await self.strategies[recipient.notification_type].send(
+                                recipient,
+                                job,
+                            )
+                        except Exception:
+                            self.ledger.release(user_id, job.id)
+                            raise
+                        await self.ledger.record(user_id, job.id)
+
                     notified_users.add(user_id)
+            finally:
+                # Every send that went out gets its row, even when a later one fails
+                await self.ledger.flush()
             
             logger.info(f"notified_users: {notified_users}")
         except Exception as e:
+            await self.db.rollback()
             logger.error(f"Error processing job: {e}")
 
     async def get_user_notification_history(self, user_id: int) -> List[NotificationHistoryResponse]:
-        notifications = self.db.query(
+        notifications = (await self.db.execute(select(
             Notification, Job
         ).join(
             Job, Job.id == Notification.job_id
-        ).filter(
+        ).where(
             Notification.user_id == user_id
         ).order_by(
             Notification.sent_at.desc()
-        ).all()
+        ))).all()
         
         notifications_list = []
         for notification, job in notifications:
@@ -98,7 +107,8 @@ class NotificationService:
         await self.process_job(job_data) 
 
     async def get_notification_types(self) -> List[NotificationTypeResponse]:
-        notification_types = self.db.query(NotificationType).all()
+        result = await self.db.execute(select(NotificationType))
+        notification_types = result.scalars().all()
         result = []
         
         for notification_type in notification_types:
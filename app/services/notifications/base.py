@@ -1,8 +1,9 @@
 from abc import ABC, abstractmethod
 from typing import List
 from app.models.jobs import Job
+from app.schemas.notification import NotificationRecipient
 
 class NotificationStrategy(ABC):
     @abstractmethod
-    async def send(self, user_id: int, job: Job):
+    async def send(self, recipient: NotificationRecipient, job: Job):
         pass
\ No newline at end of file
@@ -1,7 +1,8 @@
 from .base import NotificationStrategy
 from app.models.jobs import Job
+from app.schemas.notification import NotificationRecipient
 
 class DiscordNotification(NotificationStrategy):
-    async def send(self, user_id: int, job: Job):
+    async def send(self, recipient: NotificationRecipient, job: Job):
        #TODO
         pass
\ No newline at end of file
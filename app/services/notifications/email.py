@@ -2,28 +2,24 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
-from app.models.users import User
 from .base import NotificationStrategy
 from app.core.config import settings
 from app.models.jobs import Job
+from app.schemas.notification import NotificationRecipient
 
 class EmailNotification(NotificationStrategy):
-    def __init__(self, db: Session):
-        self.db = db
+    def __init__(self):
         self.smtp_server = settings.SMTP_SERVER
         self.smtp_port = settings.SMTP_PORT
         self.sender_email = settings.GMAIL_SENDER
         self.password = settings.GMAIL_APP_PASSWORD.get_secret_value()
 
-    async def send(self, user_id: int, job: Job):
+    async def send(self, recipient: NotificationRecipient, job: Job):
         try:
-            user = self.db.query(User).filter(User.user_id == user_id).first()
-
             msg = MIMEMultipart('alternative')
             msg['Subject'] = f'有新任務啦: {job.title}'
             msg['From'] = self.sender_email
-            msg['To'] = user.email
+            msg['To'] = recipient.email
 
             html_content = f"""
             <html>
@@ -0,0 +1,62 @@
+import json
+import time
+from typing import List
+from redis import Redis
+from app.core.config import settings
+from app.core.logger import logger
+
+RETRY_QUEUE_KEY = "scraper:retry_queue"
+RETRY_ITEMS_KEY = "scraper:retry_items"
+
+class RetryQueueService:
+    def __init__(
+        self,
+        redis: Redis,
+        delay: float = settings.SCRAPER_RETRY_DELAY,
+        max_attempts: int = settings.SCRAPER_RETRY_MAX_ATTEMPTS,
+    ):
+        self.redis = redis
+        self.delay = delay
+        self.max_attempts = max_attempts
+
+    def push(self, item: dict):
+        attempts = item.get("attempts", 0) + 1
+        if attempts > self.max_attempts:
+            logger.error(f"Dropping {item['url']} after {self.max_attempts} failed detail fetches")
+            self.remove(item["url"])
+            return
+
+        payload = dict(item, attempts=attempts)
+        pipe = self.redis.pipeline()
+        pipe.hset(RETRY_ITEMS_KEY, item["url"], json.dumps(payload, ensure_ascii=False))
+        pipe.zadd(RETRY_QUEUE_KEY, {item["url"]: time.time() + self.delay * attempts})
+        pipe.execute()
+        logger.info(f"Queued {item['url']} for retry (attempt {attempts})")
+
+    def defer(self, items: List[dict]):
+        # Items a walk was cut off before finishing; due right away and not
+        # counted as a failed attempt
+        if not items:
+            return
+        pipe = self.redis.pipeline()
+        for item in items:
+            pipe.hset(RETRY_ITEMS_KEY, item["url"], json.dumps(item, ensure_ascii=False))
+            pipe.zadd(RETRY_QUEUE_KEY, {item["url"]: time.time()})
+        pipe.execute()
+        logger.info(f"Deferred {len(items)} unfinished jobs to the retry queue")
+
+    def due(self, limit: int = 50) -> List[dict]:
+        urls = self.redis.zrangebyscore(RETRY_QUEUE_KEY, 0, time.time(), start=0, num=limit)
+        if not urls:
+            return []
+        payloads = self.redis.hmget(RETRY_ITEMS_KEY, urls)
+        return [json.loads(payload) for payload in payloads if payload]
+
+    def remove(self, url: str):
+        pipe = self.redis.pipeline()
+        pipe.zrem(RETRY_QUEUE_KEY, url)
+        pipe.hdel(RETRY_ITEMS_KEY, url)
+        pipe.execute()
+
+    def size(self) -> int:
+        return self.redis.zcard(RETRY_QUEUE_KEY)
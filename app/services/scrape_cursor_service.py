@@ -0,0 +1,41 @@
+import json
+from typing import List, Optional, Set
+from redis import Redis
+from app.core.logger import logger
+
+# Same keys as the Lambda's cursor, so either scraper can finish a walk the other left
+SCRAPE_CURSOR_KEY = "scraper:cursor"
+SCRAPE_CURSOR_SAVED_KEY = "scraper:cursor:saved"
+
+# Where an unfinished listing walk stopped, plus the URLs it handed off, so the
+# next walk resumes there instead of stopping at the jobs it already saved
+class ScrapeCursorService:
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    def load(self) -> Optional[dict]:
+        try:
+            cursor = self.redis.get(SCRAPE_CURSOR_KEY)
+            if not cursor:
+                return None
+            return dict(json.loads(cursor), saved=set(self.redis.smembers(SCRAPE_CURSOR_SAVED_KEY)))
+        except Exception as e:
+            logger.error(f"Error reading scrape cursor: {e}")
+            return None
+
+    def save(self, page: int, url: str, saved_urls: List[str]):
+        try:
+            pipe = self.redis.pipeline()
+            pipe.set(SCRAPE_CURSOR_KEY, json.dumps({"page": page, "url": url}))
+            if saved_urls:
+                pipe.sadd(SCRAPE_CURSOR_SAVED_KEY, *saved_urls)
+            pipe.execute()
+            logger.info(f"Listing walk stopped early, resuming at page {page} after {url}")
+        except Exception as e:
+            logger.error(f"Error saving scrape cursor: {e}")
+
+    def clear(self):
+        try:
+            self.redis.delete(SCRAPE_CURSOR_KEY, SCRAPE_CURSOR_SAVED_KEY)
+        except Exception as e:
+            logger.error(f"Error clearing scrape cursor: {e}")
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+from typing import AsyncIterator, Callable, List, Optional, Set
+from redis import Redis
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.scraper_service import JobDetail
+from app.services.scrapers.base import ScraperSource
+
+_DONE = object()
+
+async def stream_sources(
+    sources: List[ScraperSource],
+    is_known: Callable[[List[str]], Set[str]],
+    redis: Optional[Redis] = None,
+    time_budget: float = settings.SCRAPER_SOURCE_TIME_BUDGET,
+) -> AsyncIterator[JobDetail]:
+    queue: asyncio.Queue = asyncio.Queue()
+    # Sources check known URLs from worker threads; is_known may be backed by a
+    # single DB session, so those checks run one at a time
+    lock = threading.Lock()
+
+    def locked_is_known(urls: List[str]) -> Set[str]:
+        with lock:
+            return is_known(urls)
+
+    async def consume(source: ScraperSource):
+        async for job in source.stream(locked_is_known, redis):
+            await queue.put(job.model_copy(update={"source": source.name}))
+
+    async def run(source: ScraperSource):
+        budget = source.time_budget or time_budget
+        try:
+            await asyncio.wait_for(consume(source), budget)
+        except asyncio.TimeoutError:
+            logger.warning(f"Scraper source {source.name} exceeded its {budget:.0f}s budget")
+        except Exception as e:
+            logger.error(f"Error running scraper source {source.name}: {str(e)}")
+        finally:
+            await queue.put(_DONE)
+
+    tasks = [asyncio.create_task(run(source)) for source in sources]
+    # URL -> first source that produced it; a posting cross-listed or retried
+    # within one run is only saved and published once
+    seen_urls = {}
+    remaining = len(tasks)
+    try:
+        while remaining:
+            job = await queue.get()
+            if job is _DONE:
+                remaining -= 1
+                continue
+            if job.url in seen_urls:
+                if seen_urls[job.url] != job.source:
+                    logger.info(f"Skipping {job.url} from {job.source}, already scraped from {seen_urls[job.url]}")
+                continue
+            seen_urls[job.url] = job.source
+            yield job
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,116 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable, Optional, Tuple
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from redis import Redis
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.logger import logger
+from app.repositories.job_repository import JobRepository
+from app.services.job_publisher import publish_job_stream
+from app.services.scrape_runner import stream_sources
+from app.services.scraper_service import JobDetail
+from app.services.scrapers.registry import get_sources
+
+def parse_active_hours(value: str) -> Tuple[int, int]:
+    start, end = value.split("-", 1)
+    return int(start), int(end)
+
+class AdaptivePollingPolicy:
+    def __init__(
+        self,
+        min_interval: float = settings.SCRAPER_MIN_INTERVAL,
+        max_interval: float = settings.SCRAPER_MAX_INTERVAL,
+        active_max_interval: float = settings.SCRAPER_ACTIVE_MAX_INTERVAL,
+        active_hours: Tuple[int, int] = parse_active_hours(settings.SCRAPER_ACTIVE_HOURS),
+        backoff_factor: float = settings.SCRAPER_BACKOFF_FACTOR,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.active_max_interval = active_max_interval
+        self.active_hours = active_hours
+        self.backoff_factor = backoff_factor
+        self.empty_ticks = 0
+
+    def is_active(self, now: datetime) -> bool:
+        start, end = self.active_hours
+        if start <= end:
+            return start <= now.hour < end
+        return now.hour >= start or now.hour < end
+
+    def record(self, new_jobs: int):
+        self.empty_ticks = 0 if new_jobs else self.empty_ticks + 1
+
+    def next_interval(self, now: datetime) -> float:
+        cap = self.active_max_interval if self.is_active(now) else self.max_interval
+        return min(self.min_interval * self.backoff_factor ** self.empty_ticks, cap)
+
+class ScrapeScheduler:
+    JOB_ID = "scrape_sources"
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        redis: Redis,
+        policy: Optional[AdaptivePollingPolicy] = None,
+    ):
+        self.session_factory = session_factory
+        self.redis = redis
+        self.policy = policy or AdaptivePollingPolicy()
+        self.scheduler = AsyncIOScheduler()
+
+    async def scraped_jobs(self, lookup_repo: JobRepository) -> AsyncIterator[JobDetail]:
+        async for job in stream_sources(get_sources(), lookup_repo.get_known_urls, self.redis):
+            yield job
+
+    async def tick(self) -> int:
+        # Sources check known URLs from worker threads, so they get a session of
+        # their own; the saves below never share a session with them
+        db = self.session_factory()
+        lookup_db = self.session_factory()
+        # Saves and publishes block, so they run on one worker thread instead of the
+        # API's event loop; a single worker also keeps the save session on one thread
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scrape-save")
+        try:
+            job_repo = JobRepository(db, self.redis)
+            jobs = self.scraped_jobs(JobRepository(lookup_db, self.redis))
+            return await publish_job_stream(self.redis, job_repo.save_job_stream(jobs, executor), executor)
+        finally:
+            await asyncio.get_running_loop().run_in_executor(executor, db.close)
+            executor.shutdown(wait=False)
+            await asyncio.to_thread(lookup_db.close)
+
+    async def run_tick(self):
+        try:
+            new_jobs = await self.tick()
+        except Exception as e:
+            logger.error(f"Error running scrape tick: {e}")
+            new_jobs = 0
+
+        self.policy.record(new_jobs)
+        interval = self.policy.next_interval(datetime.now())
+        logger.info(f"Scrape tick found {new_jobs} new jobs, next run in {interval:.0f}s")
+        self.schedule(interval)
+
+    def schedule(self, delay: float):
+        self.scheduler.add_job(
+            self.run_tick,
+            "date",
+            run_date=datetime.now() + timedelta(seconds=delay),
+            id=self.JOB_ID,
+            replace_existing=True,
+            # Each tick schedules the next one, so a run that fires late because
+            # the loop was busy must still run rather than be dropped as missed
+            misfire_grace_time=None,
+            coalesce=True,
+        )
+
+    def start(self):
+        self.scheduler.start()
+        self.schedule(0)
+        logger.info("Scrape scheduler started")
+
+    def shutdown(self):
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
@@ -1,12 +1,30 @@
 import re
-import requests
+import asyncio
 from datetime import datetime
-from typing import List, Tuple, Optional
-from bs4 import BeautifulSoup
+from typing import AsyncIterator, Callable, Iterator, List, Optional, Set, Tuple, Union
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 from pydantic import BaseModel
+from requests import Response
+from app.core.config import settings
 from app.core.logger import logger
-import urllib3 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from app.services.http_client import get_http_client
+from app.services.html_archive import HtmlArchive, get_html_archive
+from app.services.listing_cache_service import ListingCacheService
+from app.services.retry_queue_service import RetryQueueService
+from app.services.scrape_cursor_service import ScrapeCursorService
+from app.services.scraper_resilience import ScrapeError
+
+CHICKPT_CASES_URL = "https://www.chickpt.com.tw/cases"
+
+try:
+    import lxml  # noqa: F401
+    FAST_TREE_BUILDER = "lxml"
+except ImportError:
+    FAST_TREE_BUILDER = "html.parser"
+
+# The fast path only builds the subtrees the parsers read
+JOB_LIST_STRAINER = SoupStrainer("ul", id="job-list")
+JOB_DETAIL_STRAINER = SoupStrainer(["ul", "section"], class_=["content-list", "job-work_time"])
 
 class JobDetail(BaseModel):
     id: Optional[int] = None
@@ -18,6 +36,7 @@ class JobDetail(BaseModel):
     url: str
     job_time: Optional[str]
     created_at: datetime
+    source: str = "chickpt"
 
 
 def parse_work_time(soup: BeautifulSoup) -> Optional[str]:
@@ -29,71 +48,399 @@ def parse_work_time(soup: BeautifulSoup) -> Optional[str]:
     return None
 
 
+def make_soup(
+    html: str, parse_only: SoupStrainer, fast: bool = settings.SCRAPER_FAST_PARSE
+) -> BeautifulSoup:
+    if fast:
+        return BeautifulSoup(html, FAST_TREE_BUILDER, parse_only=parse_only)
+    return BeautifulSoup(html, "html.parser")
+
+
+def parse_job_detail(
+    html: str, fast: bool = settings.SCRAPER_FAST_PARSE
+) -> Tuple[str, Optional[str]]:
+    soup = make_soup(html, JOB_DETAIL_STRAINER, fast)
+
+    job_contents = soup.find("ul", class_="content-list")
+    contents_text = []
+    if job_contents:
+        for li in job_contents.find_all("li", class_="text l-line-light pre-dot"):
+            text = li.text.strip()
+            if ":" in text:
+                key, value = text.split(":", 1)
+                contents_text.append(f"{key.strip()}: {value.strip()}")
+            else:
+                contents_text.append(text)
+    job_content = "\n".join(contents_text)
+    job_time = parse_work_time(soup)
+
+    return job_content, job_time
+
+
 def get_job_details(job_url: str) -> Tuple[Optional[str], Optional[str]]:
     try:
-        response = requests.get(job_url, verify=False)
+        archive = get_html_archive()
+        if archive and settings.SCRAPER_ARCHIVE_REUSE_DETAILS:
+            html = archive.get(job_url)
+            if html is not None:
+                return parse_job_detail(html)
+
+        response = get_http_client().get(job_url)
         response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        job_contents = soup.find("ul", class_="content-list")
-        contents_text = []
-        if job_contents:
-            for li in job_contents.find_all("li", class_="text l-line-light pre-dot"):
-                text = li.text.strip()
-                if ":" in text:
-                    key, value = text.split(":", 1)
-                    contents_text.append(f"{key.strip()}: {value.strip()}")
-                else:
-                    contents_text.append(text)
-        job_content = "\n".join(contents_text)
-        job_time = parse_work_time(soup)
-
-        return job_content, job_time
+        if archive:
+            archive.put(job_url, response.text, "detail")
+        return parse_job_detail(response.text)
+    except ScrapeError:
+        raise
     except Exception as e:
-        logger.error(f"Error fetching job details: {str(e)}")
-        return None, None
+        raise ScrapeError(f"Error fetching job details for {job_url}: {str(e)}") from e
 
 
-async def scrape_chickpt(limit: int) -> List[JobDetail]:
-    url = "https://www.chickpt.com.tw/cases"
-    try:
-        response = requests.get(url, verify=False)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-        job_list = soup.find("ul", id="job-list", class_="job-list show")
-        jobs = job_list.find_all("li")
-
-        data = []
-        for job in jobs[:limit]:
-            job_item = job.find("div", class_="is-blk")
-            job_time = job.find(
-                "div", class_="job-info-date is-flex flex-start flex-align-center"
+def find_job_list(html: str, fast: bool = settings.SCRAPER_FAST_PARSE) -> Tag:
+    soup = make_soup(html, JOB_LIST_STRAINER, fast)
+    return soup.find("ul", id="job-list", class_="job-list show")
+
+
+def parse_job_list(
+    html: str, limit: Optional[int] = None, fast: bool = settings.SCRAPER_FAST_PARSE
+) -> List[dict]:
+    return parse_job_items(find_job_list(html, fast), limit)
+
+
+def parse_job_items(job_list: Tag, limit: Optional[int] = None) -> List[dict]:
+    jobs = job_list.find_all("li")
+
+    items = []
+    for job in jobs[:limit]:
+        job_item = job.find("div", class_="is-blk")
+        job_time = job.find(
+            "div", class_="job-info-date is-flex flex-start flex-align-center"
+        )
+        job_link = job.find("a", class_="job-list-item")
+
+        if job_item and job_time and job_link:
+            job_detail = job_item.find("p", class_="job_detail")
+            items.append(
+                {
+                    "url": job_link['href'],
+                    "title": job_item.find("h2", class_="job-info-title").text.strip(),
+                    "employer": job_item.find("p", class_="mobile-job-company").text.strip(),
+                    "salary": job_detail.find("span", class_="salary").text.strip(),
+                    "location": job_detail.find("span", class_="place").text.strip(),
+                }
             )
-            job_link = job.find("a", class_="job-list-item")
-
-            if job_item and job_time and job_link:
-                job_url = job_link['href']
-                title = job_item.find("h2", class_="job-info-title").text.strip()
-                employer = job_item.find("p", class_="mobile-job-company").text.strip()
-                job_detail = job_item.find("p", class_="job_detail")
-                salary = job_detail.find("span", class_="salary").text.strip()
-                location = job_detail.find("span", class_="place").text.strip()
-
-                job_content, job_time = get_job_details(job_url)
-
-                data.append(
-                    JobDetail(
-                        title=title,
-                        employer=employer,
-                        location=location,
-                        salary=salary,
-                        content=job_content,
-                        url=job_url,
-                        job_time=job_time,
-                        created_at=datetime.now(),
-                    )
-                )
+    return items
+
+
+async def fetch_job_details(
+    job_urls: List[str], max_concurrency: int
+) -> List[Union[Tuple[Optional[str], Optional[str]], Exception]]:
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(job_url: str):
+        async with semaphore:
+            return await asyncio.to_thread(get_job_details, job_url)
+
+    return await asyncio.gather(
+        *(fetch(job_url) for job_url in job_urls), return_exceptions=True
+    )
+
+
+def listing_page_url(page: int) -> str:
+    return CHICKPT_CASES_URL if page == 1 else f"{CHICKPT_CASES_URL}?page={page}"
+
+
+def fetch_job_list(
+    url: str, listing_cache: Optional[ListingCacheService] = None
+) -> Tuple[Optional[Tag], Response]:
+    headers = listing_cache.conditional_headers(url) if listing_cache else {}
+    response = get_http_client().get(url, headers=headers)
+    if listing_cache and response.status_code == 304:
+        listing_cache.record_not_modified(url)
+        logger.info("Listing page not modified, skipping scrape")
+        return None, response
+    response.raise_for_status()
+
+    archive = get_html_archive()
+    if archive:
+        archive.put(url, response.text, "listing")
+
+    job_list = find_job_list(response.text)
+    if listing_cache:
+        if listing_cache.is_unchanged(url, listing_cache.fingerprint(parse_job_items(job_list))):
+            listing_cache.record_fingerprint_hit()
+            logger.info("Listing page unchanged, skipping scrape")
+            return None, response
+        listing_cache.record_miss(len(response.content))
+    return job_list, response
+
+
+def remember_job_list(
+    listing_cache: ListingCacheService, url: str, response: Response, job_list: Tag
+):
+    listing_cache.store(
+        url,
+        response.headers,
+        listing_cache.fingerprint(parse_job_items(job_list)),
+        len(response.content),
+    )
+
+
+def build_job_details(
+    items: List[dict],
+    details: List[Union[Tuple[Optional[str], Optional[str]], Exception]],
+    retry_queue: Optional[RetryQueueService] = None,
+) -> List[JobDetail]:
+    data = []
+    for item, detail in zip(items, details):
+        if isinstance(detail, Exception):
+            logger.error(f"Error fetching job details: {str(detail)}")
+            if retry_queue:
+                retry_queue.push(item)
+            continue
+        job_content, job_time = detail
+        data.append(
+            JobDetail(
+                title=item["title"],
+                employer=item["employer"],
+                location=item["location"],
+                salary=item["salary"],
+                content=job_content,
+                url=item["url"],
+                job_time=job_time,
+                created_at=datetime.now(),
+            )
+        )
+    return data
+
+
+async def scrape_chickpt(
+    limit: Optional[int] = None,
+    max_concurrency: int = settings.SCRAPER_MAX_CONCURRENCY,
+    listing_cache: Optional[ListingCacheService] = None,
+    retry_queue: Optional[RetryQueueService] = None,
+) -> List[JobDetail]:
+    try:
+        job_list, response = fetch_job_list(CHICKPT_CASES_URL, listing_cache)
+        if job_list is None:
+            return []
+
+        items = parse_job_items(job_list, limit)
+        details = await fetch_job_details(
+            [item["url"] for item in items], max_concurrency
+        )
+        data = build_job_details(items, details, retry_queue)
+
+        if listing_cache:
+            remember_job_list(listing_cache, CHICKPT_CASES_URL, response, job_list)
         logger.info(f"Successfully scraped {len(data)} jobs")
         return data
     except Exception as e:
         logger.error(f"Error scraping chickpt: {str(e)}")
+        return []
+
+
+async def scrape_new_chickpt(
+    is_known: Callable[[List[str]], Set[str]],
+    max_pages: int = settings.SCRAPER_MAX_PAGES,
+    max_concurrency: int = settings.SCRAPER_MAX_CONCURRENCY,
+    listing_cache: Optional[ListingCacheService] = None,
+    retry_queue: Optional[RetryQueueService] = None,
+) -> List[JobDetail]:
+    try:
+        new_items = []
+        seen_urls = set()
+        first_page = None
+        reached_known = False
+
+        for page in range(1, max_pages + 1):
+            url = listing_page_url(page)
+            job_list, response = fetch_job_list(url, listing_cache if page == 1 else None)
+            if job_list is None:
+                break
+            if page == 1:
+                first_page = (response, job_list)
+
+            items = [item for item in parse_job_items(job_list) if item["url"] not in seen_urls]
+            if not items:
+                break
+
+            known_urls = is_known([item["url"] for item in items])
+            for item in items:
+                if item["url"] in known_urls:
+                    reached_known = True
+                    break
+                seen_urls.add(item["url"])
+                new_items.append(item)
+            if reached_known:
+                break
+        else:
+            logger.warning(f"No known job found within {max_pages} listing pages")
+
+        details = await fetch_job_details(
+            [item["url"] for item in new_items], max_concurrency
+        )
+        data = build_job_details(new_items, details, retry_queue)
+
+        if listing_cache and first_page:
+            remember_job_list(listing_cache, CHICKPT_CASES_URL, *first_page)
+        logger.info(f"Successfully scraped {len(data)} new jobs")
+        return data
+    except Exception as e:
+        logger.error(f"Error scraping chickpt: {str(e)}")
+        return []
+
+
+async def stream_chickpt(
+    is_known: Optional[Callable[[List[str]], Set[str]]] = None,
+    max_pages: int = settings.SCRAPER_MAX_PAGES,
+    max_concurrency: int = settings.SCRAPER_MAX_CONCURRENCY,
+    retry_queue: Optional[RetryQueueService] = None,
+    listing_cache: Optional[ListingCacheService] = None,
+    scrape_cursor: Optional[ScrapeCursorService] = None,
+) -> AsyncIterator[JobDetail]:
+    async def fetch(item: dict) -> Optional[JobDetail]:
+        try:
+            details = await asyncio.to_thread(get_job_details, item["url"])
+        except ScrapeError as e:
+            details = e
+        jobs = build_job_details([item], [details], retry_queue)
+        return jobs[0] if jobs else None
+
+    cursor = await asyncio.to_thread(scrape_cursor.load) if scrape_cursor else None
+    # Deletions above the cursor can move it up a page, so resume one page early;
+    # the page limit still counts from the cursor's page
+    last_page = (cursor["page"] if cursor else 1) + max_pages - 1
+    start_page = max(1, cursor["page"] - 1) if cursor else 1
+    resume_after = cursor["url"] if cursor else None
+    walk_saved = cursor["saved"] if cursor else set()
+    if cursor:
+        logger.info(f"Resuming listing walk at page {cursor['page']} after {cursor['url']}")
+        # A resumed walk has to go on even when the first page is unchanged
+        listing_cache = None
+
+    # Fetch task -> listing item
+    pending = {}
+    # Items handed to a fetch whose job has not been yielded yet; if the walk is
+    # cut short they go to the retry queue rather than being skipped for good
+    unfinished = {}
+    submitted = []
+    # Last listing position the walk got past, for the cursor
+    position = None
+    finished = False
+    seen_urls = set()
+    first_page = None
+    try:
+        for page in range(start_page, last_page + 1):
+            try:
+                job_list, response = await asyncio.to_thread(
+                    fetch_job_list, listing_page_url(page), listing_cache if page == 1 else None
+                )
+            except Exception as e:
+                logger.error(f"Error fetching listing page {page}: {str(e)}")
+                break
+            if job_list is None:
+                finished = True
+                break
+            if page == 1:
+                first_page = (response, job_list)
+
+            items = [item for item in parse_job_items(job_list) if item["url"] not in seen_urls]
+            if not items:
+                finished = True
+                break
+
+            urls = [item["url"] for item in items]
+            if resume_after in urls:
+                items = items[urls.index(resume_after) + 1:]
+                urls = urls[urls.index(resume_after) + 1:]
+                position = (page, resume_after)
+                resume_after = None
+
+            known_urls = set()
+            if is_known:
+                known_urls = await asyncio.to_thread(is_known, urls)
+
+            # Until the cursor URL is passed, jobs the unfinished walk already
+            # handed off are skipped; any other known job ends the walk
+            reached_known = False
+            for item in items:
+                if item["url"] in known_urls:
+                    if resume_after and item["url"] in walk_saved:
+                        position = (page, item["url"])
+                        continue
+                    reached_known = True
+                    break
+                seen_urls.add(item["url"])
+                if len(pending) >= max_concurrency:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        unfinished.pop(pending.pop(task)["url"], None)
+                        if task.result():
+                            yield task.result()
+                pending[asyncio.create_task(fetch(item))] = item
+                unfinished[item["url"]] = item
+                submitted.append(item["url"])
+                position = (page, item["url"])
+            if reached_known:
+                finished = True
+                break
+
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                unfinished.pop(pending.pop(task)["url"], None)
+                if task.result():
+                    yield task.result()
+
+        # Only a fully streamed walk marks the first page as seen
+        if finished and listing_cache and first_page:
+            remember_job_list(listing_cache, CHICKPT_CASES_URL, *first_page)
+    except Exception as e:
+        logger.error(f"Error streaming chickpt: {str(e)}")
+    finally:
+        for task in pending:
+            task.cancel()
+        # Cut off by the time budget or a failed fetch: runs synchronously so it
+        # also completes while being cancelled
+        if retry_queue and unfinished:
+            retry_queue.defer(list(unfinished.values()))
+        if scrape_cursor:
+            if finished:
+                scrape_cursor.clear()
+            elif position:
+                # A failed listing page, the page limit or a cut during the walk
+                scrape_cursor.save(*position, submitted)
+
+
+async def stream_retry_queue(
+    retry_queue: RetryQueueService,
+    max_concurrency: int = settings.SCRAPER_MAX_CONCURRENCY,
+) -> AsyncIterator[JobDetail]:
+    items = await asyncio.to_thread(retry_queue.due)
+    if not items:
+        return
+
+    details = await fetch_job_details([item["url"] for item in items], max_concurrency)
+    for item, detail in zip(items, details):
+        jobs = build_job_details([item], [detail], retry_queue)
+        if jobs:
+            retry_queue.remove(item["url"])
+            yield jobs[0]
+
+
+def reparse_archive(archive: HtmlArchive) -> Iterator[JobDetail]:
+    seen_urls = set()
+    for listing_url, html in archive.pages("listing"):
+        job_list = find_job_list(html)
+        if job_list is None:
+            logger.warning(f"No job list found in archived listing {listing_url}")
+            continue
+
+        for item in parse_job_items(job_list):
+            if item["url"] in seen_urls:
+                continue
+            seen_urls.add(item["url"])
+            detail_html = archive.get(item["url"])
+            details = parse_job_detail(detail_html) if detail_html is not None else (None, None)
+            yield build_job_details([item], [details])[0]
@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+from typing import AsyncIterator, Callable, List, Optional, Set
+from redis import Redis
+from app.services.scraper_service import JobDetail
+
+class ScraperSource(ABC):
+    name: str
+    # Seconds the runner lets this source stream before cutting it off; None uses the default budget
+    time_budget: Optional[float] = None
+
+    @abstractmethod
+    def stream(
+        self,
+        is_known: Callable[[List[str]], Set[str]],
+        redis: Optional[Redis] = None,
+    ) -> AsyncIterator[JobDetail]:
+        pass
@@ -0,0 +1,26 @@
+from typing import AsyncIterator, Callable, List, Optional, Set
+from redis import Redis
+from app.services.listing_cache_service import ListingCacheService
+from app.services.retry_queue_service import RetryQueueService
+from app.services.scrape_cursor_service import ScrapeCursorService
+from app.services.scraper_service import JobDetail, stream_chickpt, stream_retry_queue
+from .base import ScraperSource
+
+class ChickptSource(ScraperSource):
+    name = "chickpt"
+
+    async def stream(
+        self,
+        is_known: Callable[[List[str]], Set[str]],
+        redis: Optional[Redis] = None,
+    ) -> AsyncIterator[JobDetail]:
+        retry_queue = RetryQueueService(redis) if redis is not None else None
+        listing_cache = ListingCacheService(redis) if redis is not None else None
+        scrape_cursor = ScrapeCursorService(redis) if redis is not None else None
+        if retry_queue:
+            async for job in stream_retry_queue(retry_queue):
+                yield job
+        async for job in stream_chickpt(
+            is_known, retry_queue=retry_queue, listing_cache=listing_cache, scrape_cursor=scrape_cursor
+        ):
+            yield job
@@ -0,0 +1,24 @@
+from typing import Dict, List, Optional
+from app.core.config import settings
+from app.core.logger import logger
+from .base import ScraperSource
+from .chickpt import ChickptSource
+
+SOURCES: Dict[str, ScraperSource] = {}
+
+def register_source(source: ScraperSource) -> ScraperSource:
+    SOURCES[source.name] = source
+    return source
+
+def get_sources(names: Optional[List[str]] = None) -> List[ScraperSource]:
+    if names is None:
+        names = [name.strip() for name in settings.SCRAPER_SOURCES.split(",") if name.strip()]
+    sources = []
+    for name in names:
+        if name not in SOURCES:
+            logger.warning(f"Unknown scraper source {name}, skipping")
+            continue
+        sources.append(SOURCES[name])
+    return sources
+
+register_source(ChickptSource())
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Set
+from redis import Redis
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.logger import logger
+from app.models.subscription_items import SubscriptionItem
+from app.models.user_subscriptions import UserSubscription
+from app.services.keyword_matcher import KeywordMatcher
+
+SUBSCRIPTION_CHANGES_CHANNEL = "subscription_changes"
+
+# keyword -> subscriber ids, kept in memory so fan-out needs no queries. Loaded
+# whenever the change listener (re)subscribes and kept current by the change
+# events every process publishes.
+class SubscriptionIndex:
+    def __init__(self):
+        self.subscribers: Dict[str, Set[int]] = {}
+        self.user_keywords: Dict[int, Set[str]] = {}
+        self.matcher = KeywordMatcher()
+        self.lock = threading.Lock()
+        self.loaded = False
+        # Events seen while a load is running, replayed on top of its snapshot
+        self.pending: Optional[List[dict]] = None
+
+    async def load(self, db: AsyncSession):
+        with self.lock:
+            self.pending = []
+        try:
+            result = await db.execute(
+                select(SubscriptionItem.keyword, UserSubscription.user_id)
+                .join(UserSubscription, UserSubscription.item_id == SubscriptionItem.item_id)
+            )
+            subscribers = defaultdict(set)
+            user_keywords = defaultdict(set)
+            for keyword, user_id in result.all():
+                subscribers[keyword].add(user_id)
+                user_keywords[user_id].add(keyword)
+        except Exception:
+            with self.lock:
+                self.pending = None
+            raise
+
+        with self.lock:
+            self.subscribers = dict(subscribers)
+            self.user_keywords = dict(user_keywords)
+            self.matcher.load(self.subscribers)
+            for event in self.pending:
+                self._apply(event)
+            self.pending = None
+            self.loaded = True
+        logger.info(f"Subscription index loaded: {len(self.subscribers)} keywords, {len(self.user_keywords)} users")
+
+    def resync(self, session_factory: Callable[[], AsyncSession], loop: asyncio.AbstractEventLoop):
+        # Runs on the listener thread once its subscription is confirmed; events
+        # that arrive during the load wait on the socket and are applied after it
+        async def reload():
+            async with session_factory() as db:
+                await self.load(db)
+
+        asyncio.run_coroutine_threadsafe(reload(), loop).result()
+
+    def apply(self, event: dict):
+        with self.lock:
+            if self.pending is not None:
+                self.pending.append(event)
+            self._apply(event)
+
+    def match(self, title: str) -> Set[str]:
+        return self.matcher.match(title)
+
+    def get_subscribers(self, keyword: str) -> Set[int]:
+        with self.lock:
+            return set(self.subscribers.get(keyword, ()))
+
+    def _apply(self, event: dict):
+        action = event["action"]
+        user_id = event["user_id"]
+        if action == "subscribe":
+            self._subscribe(event["keyword"], user_id)
+        elif action == "unsubscribe":
+            self._unsubscribe(event["keyword"], user_id)
+        elif action == "delete_user":
+            for keyword in list(self.user_keywords.get(user_id, ())):
+                self._unsubscribe(keyword, user_id)
+        else:
+            logger.error(f"Unknown subscription change: {action}")
+
+    def _subscribe(self, keyword: str, user_id: int):
+        users = self.subscribers.setdefault(keyword, set())
+        if not users:
+            self.matcher.add(keyword)
+        users.add(user_id)
+        self.user_keywords.setdefault(user_id, set()).add(keyword)
+
+    def _unsubscribe(self, keyword: str, user_id: int):
+        users = self.subscribers.get(keyword)
+        if users is not None:
+            users.discard(user_id)
+            if not users:
+                del self.subscribers[keyword]
+                self.matcher.remove(keyword)
+        keywords = self.user_keywords.get(user_id)
+        if keywords is not None:
+            keywords.discard(keyword)
+            if not keywords:
+                del self.user_keywords[user_id]
+
+
+_index: Optional[SubscriptionIndex] = None
+
+def get_subscription_index() -> SubscriptionIndex:
+    global _index
+    if _index is None:
+        _index = SubscriptionIndex()
+    return _index
+
+def publish_subscription_change(redis: Optional[Redis], action: str, user_id: int, keyword: Optional[str] = None):
+    event = {"action": action, "user_id": user_id}
+    if keyword is not None:
+        event["keyword"] = keyword
+    # Apply locally right away; other processes pick it up from the channel. The
+    # echo this process receives replays the same changes in order, so it is harmless
+    get_subscription_index().apply(event)
+    if redis is None:
+        return
+    try:
+        redis.publish(SUBSCRIPTION_CHANGES_CHANNEL, json.dumps(event))
+    except Exception as e:
+        logger.error(f"Error publishing subscription change: {e}")
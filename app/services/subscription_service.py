@@ -1,34 +1,39 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from app.models.subscription_items import SubscriptionItem
 from app.models.user_subscriptions import UserSubscription
 from typing import List
 from app.services.keyword_ranking_service import KeywordRankingService
+from app.services.subscription_index import publish_subscription_change
 from redis import Redis
 
 class SubscriptionService:
-    def __init__(self, db: Session, redis: Redis):
+    def __init__(self, db: AsyncSession, redis: Redis):
         self.db = db
+        self.redis = redis
         self.ranking_service = KeywordRankingService(db, redis)
 
     async def create_subscription(self, user_id: int, keyword: str):
         try:
             lowercased_keyword = keyword.lower()
             
-            subscription_item = self.db.query(SubscriptionItem).filter(
+            result = await self.db.execute(select(SubscriptionItem).where(
                 SubscriptionItem.keyword == lowercased_keyword
-            ).first()
+            ))
+            subscription_item = result.scalars().first()
             
             if not subscription_item:
                 subscription_item = SubscriptionItem(keyword=lowercased_keyword)
                 self.db.add(subscription_item)
-                self.db.commit()
-                self.db.refresh(subscription_item)
+                await self.db.commit()
+                await self.db.refresh(subscription_item)
             
-            existing_subscription = self.db.query(UserSubscription).filter(
+            result = await self.db.execute(select(UserSubscription).where(
                 UserSubscription.user_id == user_id,
                 UserSubscription.item_id == subscription_item.item_id
-            ).first()
+            ))
+            existing_subscription = result.scalars().first()
             
             if existing_subscription:
                 return {"message": "Already subscribed to this keyword"}
@@ -38,31 +43,33 @@ class SubscriptionService:
                 item_id=subscription_item.item_id
             )
             self.db.add(user_subscription)
-            self.db.commit()
+            await self.db.commit()
+            publish_subscription_change(self.redis, "subscribe", user_id, lowercased_keyword)
             await self.ranking_service.update_keyword_score(lowercased_keyword)
             return {"message": "Subscription created successfully"}
             
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=str(e)
             )
 
-    def get_user_subscriptions(self, user_id: int):
-        subscriptions = self.db.query(SubscriptionItem).join(
-            UserSubscription, UserSubscription.item_id == SubscriptionItem.item_id).filter(
+    async def get_user_subscriptions(self, user_id: int):
+        result = await self.db.execute(select(SubscriptionItem).join(
+            UserSubscription, UserSubscription.item_id == SubscriptionItem.item_id).where(
             UserSubscription.user_id == user_id
-        ).all()
+        ))
 
-        return subscriptions
+        return result.scalars().all()
 
     async def delete_subscription(self, user_id: int, keyword_id: int) -> dict:
         try:
-            subscription = self.db.query(UserSubscription).filter(
+            result = await self.db.execute(select(UserSubscription).where(
                 UserSubscription.user_id == user_id,
                 UserSubscription.item_id == keyword_id
-            ).first()
+            ))
+            subscription = result.scalars().first()
             
             if not subscription:
                 raise HTTPException(
@@ -70,20 +77,21 @@ class SubscriptionService:
                     detail="Subscription not found"
                 )
 
-            keyword = self.db.query(SubscriptionItem.keyword).filter(
+            keyword = await self.db.scalar(select(SubscriptionItem.keyword).where(
                 SubscriptionItem.item_id == keyword_id
-            ).scalar()
+            ))
             
-            self.db.delete(subscription)
-            self.db.commit()
+            await self.db.delete(subscription)
+            await self.db.commit()
 
             if keyword:
+                publish_subscription_change(self.redis, "unsubscribe", user_id, keyword)
                 await self.ranking_service.decrease_keyword_score(keyword)
             
             return {"message": "Subscription deleted successfully"}
             
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=str(e)
@@ -91,8 +99,8 @@ class SubscriptionService:
 
     async def get_all_subscriptions(self):
         try:
-            subscriptions = self.db.query(SubscriptionItem).all()
-            return subscriptions
+            result = await self.db.execute(select(SubscriptionItem))
+            return result.scalars().all()
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -101,13 +109,12 @@ class SubscriptionService:
 
     async def get_keyword_subscribers(self, keyword: str) -> List[int]:
         try:
-            subscribers = (
-                self.db.query(UserSubscription.user_id)
+            result = await self.db.execute(
+                select(UserSubscription.user_id)
                 .join(SubscriptionItem, UserSubscription.item_id == SubscriptionItem.item_id)
-                .filter(SubscriptionItem.keyword == keyword)
-                .all()
+                .where(SubscriptionItem.keyword == keyword)
             )
-            return [sub[0] for sub in subscribers]
+            return list(result.scalars().all())
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
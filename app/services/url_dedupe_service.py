@@ -0,0 +1,75 @@
+import hashlib
+from typing import Iterable, List, Set
+from redis import Redis
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.logger import logger
+from app.models.jobs import Job
+
+URL_BLOOM_KEY = "job_url_bloom"
+URL_BLOOM_LOADED_KEY = "job_url_bloom:loaded"
+
+class UrlDedupeService:
+    LOAD_BATCH_SIZE = 1000
+
+    def __init__(
+        self,
+        db: Session,
+        redis: Redis,
+        bits: int = settings.URL_BLOOM_BITS,
+        hashes: int = settings.URL_BLOOM_HASHES,
+    ):
+        self.db = db
+        self.redis = redis
+        self.bits = bits
+        self.hashes = hashes
+
+    def positions(self, url: str) -> List[int]:
+        digest = hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def ensure_loaded(self):
+        if self.redis.exists(URL_BLOOM_KEY, URL_BLOOM_LOADED_KEY) == 2:
+            return
+
+        logger.info("Loading job url bloom filter from database")
+        self.redis.setbit(URL_BLOOM_KEY, self.bits - 1, 0)
+        batch = []
+        for (url,) in self.db.query(Job.url).yield_per(self.LOAD_BATCH_SIZE):
+            batch.append(url)
+            if len(batch) >= self.LOAD_BATCH_SIZE:
+                self.add_many(batch)
+                batch = []
+        self.add_many(batch)
+        self.redis.set(URL_BLOOM_LOADED_KEY, "1")
+
+    def add_many(self, urls: Iterable[str]):
+        pipe = self.redis.pipeline(transaction=False)
+        for url in urls:
+            for position in self.positions(url):
+                pipe.setbit(URL_BLOOM_KEY, position, 1)
+        pipe.execute()
+
+    def might_contain_many(self, urls: List[str]) -> List[bool]:
+        if not urls:
+            return []
+        pipe = self.redis.pipeline(transaction=False)
+        for url in urls:
+            for position in self.positions(url):
+                pipe.getbit(URL_BLOOM_KEY, position)
+        bits = pipe.execute()
+        return [
+            all(bits[index * self.hashes:(index + 1) * self.hashes])
+            for index in range(len(urls))
+        ]
+
+    def get_known_urls(self, urls: List[str]) -> Set[str]:
+        self.ensure_loaded()
+        candidates = [url for url, maybe in zip(urls, self.might_contain_many(urls)) if maybe]
+        if not candidates:
+            return set()
+        # Bloom hits can be false positives, so confirm them in one query
+        rows = self.db.query(Job.url).filter(Job.url.in_(candidates)).all()
+        return {row[0] for row in rows}
@@ -1,4 +1,7 @@
-from sqlalchemy.orm import Session
+from typing import Dict, Iterable, Optional
+from redis import Redis
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from app.models.users import User
 from app.models.user_subscriptions import UserSubscription
@@ -6,14 +9,23 @@ from app.models.notifications import Notification
 from app.models.notification_types import NotificationType
 from app.core.security import verify_password, create_jwt_token, get_password_hash
 from app.schemas.auth import UserRegister, UserUpdate, UserLogin
-from app.schemas.notification import NotificationPreference
+from app.schemas.notification import NotificationPreference, NotificationRecipient
+from app.services.subscription_index import publish_subscription_change
 
 class UserService:
-    def __init__(self, db: Session):
+    # Keeps the IN list of a recipient lookup to a reasonable size
+    RECIPIENT_BATCH_SIZE = 1000
+
+    def __init__(self, db: AsyncSession, redis: Optional[Redis] = None):
         self.db = db
+        self.redis = redis
+
+    async def get_user(self, *conditions) -> User:
+        result = await self.db.execute(select(User).where(*conditions))
+        return result.scalars().first()
 
-    def register_user(self, user_data: UserRegister):
-        if self.db.query(User).filter(User.username == user_data.username).first():
+    async def register_user(self, user_data: UserRegister):
+        if await self.get_user(User.username == user_data.username):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="username is already used"
@@ -29,18 +41,18 @@ class UserService:
         )
         try:
             self.db.add(db_user)
-            self.db.commit()
-            self.db.refresh(db_user)
+            await self.db.commit()
+            await self.db.refresh(db_user)
             return {"message": "register success"}
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=str(e)
             )
 
-    def login_user(self, user_data: UserLogin):
-        user = self.db.query(User).filter(User.username == user_data.username).first()
+    async def login_user(self, user_data: UserLogin):
+        user = await self.get_user(User.username == user_data.username)
         if not user or not verify_password(user_data.password, user.password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -53,8 +65,8 @@ class UserService:
             "access_token": access_token
         }
 
-    def update_user(self, user_data: UserUpdate, current_user_id: int):
-        user = self.db.query(User).filter(User.user_id == current_user_id).first()
+    async def update_user(self, user_data: UserUpdate, current_user_id: int):
+        user = await self.get_user(User.user_id == current_user_id)
 
         if user_data.password:
             if not user_data.old_password:
@@ -69,10 +81,10 @@ class UserService:
                 )
 
         if user_data.telegram_id:
-            existing_telegram = self.db.query(User).filter(
+            existing_telegram = await self.get_user(
                 User.telegram_id == user_data.telegram_id,
                 User.user_id != current_user_id
-            ).first()
+            )
             if existing_telegram:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -80,10 +92,10 @@ class UserService:
                 )
 
         if user_data.discord_id:
-            existing_discord = self.db.query(User).filter(
+            existing_discord = await self.get_user(
                 User.discord_id == user_data.discord_id,
                 User.user_id != current_user_id
-            ).first()
+            )
             if existing_discord:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
@@ -102,35 +114,63 @@ class UserService:
             if user_data.notification_type_id:
                 user.notification_type_id = user_data.notification_type_id
 
-            self.db.commit()
-            self.db.refresh(user)
+            await self.db.commit()
+            await self.db.refresh(user)
             return {"message": "update success"}
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=str(e)
             )
 
     async def get_user_notification_preferences(self, user_id: int) -> NotificationPreference:
-        user = self.db.query(User).filter(User.user_id == user_id).first()
+        user = await self.get_user(User.user_id == user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="User not found"
             )
         
-        notification_type = self.db.query(NotificationType).filter(
+        result = await self.db.execute(select(NotificationType).where(
             NotificationType.id == user.notification_type_id
-        ).first()
+        ))
+        notification_type = result.scalars().first()
         return NotificationPreference(
             user_id=user_id,
             notification_type=notification_type.type,
             description=notification_type.description or ""
         )
 
+    async def get_notification_recipients(self, user_ids: Iterable[int]) -> Dict[int, NotificationRecipient]:
+        # Channel and contact details for every user in one joined query per batch,
+        # so the notification strategies never have to look a user up themselves
+        user_ids = sorted(set(user_ids))
+        recipients = {}
+        for i in range(0, len(user_ids), self.RECIPIENT_BATCH_SIZE):
+            result = await self.db.execute(select(
+                User.user_id,
+                NotificationType.type,
+                User.email,
+                User.discord_id,
+                User.telegram_id
+            ).join(
+                NotificationType, NotificationType.id == User.notification_type_id
+            ).where(
+                User.user_id.in_(user_ids[i:i + self.RECIPIENT_BATCH_SIZE])
+            ))
+            for user_id, notification_type, email, discord_id, telegram_id in result.all():
+                recipients[user_id] = NotificationRecipient(
+                    user_id=user_id,
+                    notification_type=notification_type,
+                    email=email,
+                    discord_id=discord_id,
+                    telegram_id=telegram_id
+                )
+        return recipients
+
     async def delete_user(self, user_id: int) -> dict:
-        user = self.db.query(User).filter(User.user_id == user_id).first()
+        user = await self.get_user(User.user_id == user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -138,24 +178,25 @@ class UserService:
             )
 
         try:
-            self.db.query(UserSubscription).filter(
+            await self.db.execute(delete(UserSubscription).where(
                 UserSubscription.user_id == user_id
-            ).delete()
-            self.db.query(Notification).filter(
+            ))
+            await self.db.execute(delete(Notification).where(
                 Notification.user_id == user_id
-            ).delete()
-            self.db.delete(user)
-            self.db.commit()
+            ))
+            await self.db.delete(user)
+            await self.db.commit()
+            publish_subscription_change(self.redis, "delete_user", user_id)
             
             return {"message": "User and all related data deleted successfully"}
             
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=str(e)
             )
 
     async def get_user_profile(self, user_id: int):
-        user = self.db.query(User).filter(User.user_id == user_id).first()
+        user = await self.get_user(User.user_id == user_id)
         return user
@@ -1,19 +1,27 @@
-import urllib3
+from __future__ import annotations
+
+import importlib.util
 import os
-import redis
 import json
 import re
-import requests
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional, Tuple
-from bs4 import BeautifulSoup
-from pydantic import BaseModel
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text
-from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
 from dotenv import load_dotenv
 
+# bs4, requests, redis and sqlalchemy are imported where they are first used so a
+# cold start only pays for them once the handler actually needs them
+if TYPE_CHECKING:
+    import requests
+    from bs4 import BeautifulSoup
+    from sqlalchemy.orm import Session
+
 load_dotenv()
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 DB_USER = os.environ['DB_USER']
 DB_PASSWORD = os.environ['DB_PASSWORD']
@@ -27,23 +35,68 @@ REDIS_SERVER = os.environ['REDIS_SERVER']
 REDIS_PORT = os.environ['REDIS_PORT']
 REDIS_PASSWORD = os.environ['REDIS_PASSWORD']
 
+CHICKPT_CASES_URL = "https://www.chickpt.com.tw/cases"
+SCRAPER_MAX_CONCURRENCY = int(os.environ.get('SCRAPER_MAX_CONCURRENCY', 5))
+SCRAPER_MAX_PAGES = int(os.environ.get('SCRAPER_MAX_PAGES', 5))
+SCRAPE_LIMIT = int(os.environ['SCRAPE_LIMIT']) if os.environ.get('SCRAPE_LIMIT') else None
+SCRAPER_POOL_SIZE = int(os.environ.get('SCRAPER_POOL_SIZE', 10))
+SCRAPER_MAX_RETRIES = int(os.environ.get('SCRAPER_MAX_RETRIES', 3))
+SCRAPER_BACKOFF_BASE = float(os.environ.get('SCRAPER_BACKOFF_BASE', 0.5))
+SCRAPER_RATE_PER_SEC = float(os.environ.get('SCRAPER_RATE_PER_SEC', 2.0))
+SCRAPER_RATE_BURST = int(os.environ.get('SCRAPER_RATE_BURST', 5))
+SCRAPER_BREAKER_THRESHOLD = int(os.environ.get('SCRAPER_BREAKER_THRESHOLD', 5))
+SCRAPER_BREAKER_RESET = float(os.environ.get('SCRAPER_BREAKER_RESET', 60))
+RETRYABLE_STATUSES = [429, 500, 502, 503, 504]
+SCRAPER_RETRY_DELAY = float(os.environ.get('SCRAPER_RETRY_DELAY', 300))
+SCRAPER_RETRY_MAX_ATTEMPTS = int(os.environ.get('SCRAPER_RETRY_MAX_ATTEMPTS', 5))
+SCRAPER_BUDGET_MAX_PAGES = int(os.environ.get('SCRAPER_BUDGET_MAX_PAGES', 50))
+SCRAPER_TIME_MARGIN_MS = int(os.environ.get('SCRAPER_TIME_MARGIN_MS', 20000))
+SCRAPE_CURSOR_KEY = "scraper:cursor"
+SCRAPE_CURSOR_SAVED_KEY = "scraper:cursor:saved"
+BULK_INSERT_BATCH_SIZE = 1000
+RETRY_QUEUE_KEY = "scraper:retry_queue"
+RETRY_ITEMS_KEY = "scraper:retry_items"
+URL_BLOOM_BITS = int(os.environ.get('URL_BLOOM_BITS', 2 ** 24))
+URL_BLOOM_HASHES = int(os.environ.get('URL_BLOOM_HASHES', 7))
+URL_BLOOM_KEY = "job_url_bloom"
+URL_BLOOM_LOADED_KEY = "job_url_bloom:loaded"
+LISTING_CACHE_KEY = "scraper:listing:{url}"
+LISTING_STATS_KEY = "scraper:listing:stats"
+LISTING_FINGERPRINT_FIELDS = ("url", "title", "employer", "salary", "location")
+SCRAPER_TIMEOUT = (
+    float(os.environ.get('SCRAPER_CONNECT_TIMEOUT', 5)),
+    float(os.environ.get('SCRAPER_READ_TIMEOUT', 15))
+)
 
-Base = declarative_base()
+ACCEPT_ENCODING = "gzip, deflate, br" if importlib.util.find_spec("brotli") else "gzip, deflate"
 
-class Job(Base):
-    __tablename__ = "jobs"
-    
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String(255), nullable=False)
-    employer = Column(String(255), nullable=False)
-    location = Column(String(255))
-    salary = Column(String(255))
-    content = Column(Text)
-    url = Column(String(255), unique=True)
-    time = Column(String(255))
-    created_at = Column(DateTime, default=datetime.now)
-
-class JobDetail(BaseModel):
+
+Job = None
+
+def get_job_model():
+    global Job
+    if Job is None:
+        from sqlalchemy import Column, Integer, String, DateTime, Text
+        from sqlalchemy.orm import declarative_base
+
+        Base = declarative_base()
+
+        class Job(Base):
+            __tablename__ = "jobs"
+
+            id = Column(Integer, primary_key=True, index=True)
+            title = Column(String(255), nullable=False)
+            employer = Column(String(255), nullable=False)
+            location = Column(String(255))
+            salary = Column(String(255))
+            content = Column(Text)
+            url = Column(String(255), unique=True)
+            time = Column(String(255))
+            created_at = Column(DateTime, default=datetime.now)
+    return Job
+
+@dataclass
+class JobDetail:
     title: str
     employer: str
     location: str
@@ -55,6 +108,8 @@ class JobDetail(BaseModel):
 
 class RedisClient:
     def __init__(self):
+        import redis
+
         self.redis_client = redis.Redis(
             host=REDIS_SERVER,
             port=REDIS_PORT,
@@ -73,6 +128,260 @@ class RedisClient:
         
     def publish(self, channel: str, message: str):
         return self.redis_client.publish(channel, message)
+    
+    # Sends every message in a single round trip
+    def publish_many(self, channel: str, messages: List[str]) -> List[int]:
+        if not messages:
+            return []
+        pipe = self.redis_client.pipeline(transaction=False)
+        for message in messages:
+            pipe.publish(channel, message)
+        return pipe.execute()
+
+class UrlBloomFilter:
+    LOAD_BATCH_SIZE = 1000
+    
+    def __init__(self, redis_client: RedisClient, bits: int = URL_BLOOM_BITS, hashes: int = URL_BLOOM_HASHES):
+        self.redis_client = redis_client.redis_client
+        self.bits = bits
+        self.hashes = hashes
+    
+    def positions(self, url: str) -> List[int]:
+        digest = hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+    
+    def ensure_loaded(self, db: Session):
+        if self.redis_client.exists(URL_BLOOM_KEY, URL_BLOOM_LOADED_KEY) == 2:
+            return
+        print("Loading job url bloom filter from database")
+        self.redis_client.setbit(URL_BLOOM_KEY, self.bits - 1, 0)
+        batch = []
+        Job = get_job_model()
+        for (url,) in db.query(Job.url).yield_per(self.LOAD_BATCH_SIZE):
+            batch.append(url)
+            if len(batch) >= self.LOAD_BATCH_SIZE:
+                self.add_many(batch)
+                batch = []
+        self.add_many(batch)
+        self.redis_client.set(URL_BLOOM_LOADED_KEY, "1")
+    
+    def add_many(self, urls: List[str]):
+        pipe = self.redis_client.pipeline(transaction=False)
+        for url in urls:
+            for position in self.positions(url):
+                pipe.setbit(URL_BLOOM_KEY, position, 1)
+        pipe.execute()
+    
+    def might_contain_many(self, urls: List[str]) -> List[bool]:
+        if not urls:
+            return []
+        pipe = self.redis_client.pipeline(transaction=False)
+        for url in urls:
+            for position in self.positions(url):
+                pipe.getbit(URL_BLOOM_KEY, position)
+        bits = pipe.execute()
+        return [all(bits[i * self.hashes:(i + 1) * self.hashes]) for i in range(len(urls))]
+
+# Same keys as the API's ListingCacheService, so /health/scraper also reports Lambda runs
+class ListingCache:
+    def __init__(self, redis_client: RedisClient):
+        self.redis_client = redis_client.redis_client
+    
+    # Same fingerprint as the API's ListingCacheService, which writes the same keys
+    @staticmethod
+    def fingerprint(items: List[dict]) -> str:
+        rows = [[item[field] for field in LISTING_FINGERPRINT_FIELDS] for item in items]
+        return hashlib.sha256(json.dumps(rows, ensure_ascii=False).encode("utf-8")).hexdigest()
+    
+    def conditional_headers(self, url: str) -> dict:
+        try:
+            cached = self.redis_client.hgetall(LISTING_CACHE_KEY.format(url=url))
+        except Exception as e:
+            print(f"Error reading listing cache: {str(e)}")
+            return {}
+        headers = {}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+    
+    def is_unchanged(self, url: str, fingerprint: str) -> bool:
+        try:
+            return self.redis_client.hget(LISTING_CACHE_KEY.format(url=url), "fingerprint") == fingerprint
+        except Exception as e:
+            print(f"Error reading listing cache: {str(e)}")
+            return False
+    
+    def store(self, url: str, response: requests.Response, fingerprint: str):
+        mapping = {"fingerprint": fingerprint, "size": len(response.content)}
+        if response.headers.get("ETag"):
+            mapping["etag"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            mapping["last_modified"] = response.headers["Last-Modified"]
+        try:
+            key = LISTING_CACHE_KEY.format(url=url)
+            pipe = self.redis_client.pipeline()
+            pipe.delete(key)
+            pipe.hset(key, mapping=mapping)
+            pipe.execute()
+        except Exception as e:
+            print(f"Error storing listing cache: {str(e)}")
+    
+    def record(self, url: str, hit: str, size: int = 0):
+        try:
+            if hit == "not_modified_hits":
+                size = int(self.redis_client.hget(LISTING_CACHE_KEY.format(url=url), "size") or 0)
+            pipe = self.redis_client.pipeline()
+            pipe.hincrby(LISTING_STATS_KEY, hit, 1)
+            if size:
+                pipe.hincrby(LISTING_STATS_KEY, "bytes_downloaded" if hit == "misses" else "bytes_saved", size)
+            pipe.execute()
+        except Exception as e:
+            print(f"Error updating listing cache stats: {str(e)}")
+
+def fetch_listing(
+    url: str,
+    listing_cache: Optional[ListingCache] = None,
+    limit: Optional[int] = None
+) -> Tuple[Optional[List[dict]], requests.Response]:
+    # Returns no items when the cache shows the listing has not changed
+    headers = listing_cache.conditional_headers(url) if listing_cache else {}
+    response = http_get(url, headers=headers)
+    if listing_cache and response.status_code == 304:
+        listing_cache.record(url, "not_modified_hits")
+        print("Listing page not modified, skipping scrape")
+        return None, response
+    response.raise_for_status()
+    items = parse_job_list(response.text, limit)
+    if listing_cache:
+        if listing_cache.is_unchanged(url, listing_cache.fingerprint(items)):
+            listing_cache.record(url, "fingerprint_hits")
+            print("Listing page unchanged, skipping scrape")
+            return None, response
+        listing_cache.record(url, "misses", len(response.content))
+    return items, response
+
+# Module scope keeps the session (and its open connections) alive across warm invocations
+http_session = None
+
+def get_http_session() -> requests.Session:
+    global http_session
+    if http_session is None:
+        import requests
+        import urllib3
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        http_session = requests.Session()
+        retry = Retry(
+            total=SCRAPER_MAX_RETRIES,
+            backoff_factor=SCRAPER_BACKOFF_BASE,
+            backoff_jitter=SCRAPER_BACKOFF_BASE,
+            status_forcelist=RETRYABLE_STATUSES,
+            allowed_methods=["GET"],
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=SCRAPER_POOL_SIZE, pool_block=True, max_retries=retry)
+        http_session.mount("https://", adapter)
+        http_session.mount("http://", adapter)
+        http_session.headers.update({
+            "User-Agent": "Mozilla/5.0 (compatible; ChickptNotify/1.0)",
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "Connection": "keep-alive"
+        })
+    return http_session
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class CircuitOpenError(Exception):
+    pass
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.lock = threading.Lock()
+
+    def before_request(self, host: str):
+        # Once the reset timeout has passed, requests go through again (half-open);
+        # one more failure reopens the circuit
+        if self.opened_at is not None and time.monotonic() - self.opened_at < self.reset_timeout:
+            raise CircuitOpenError(f"Circuit open for {host}, pausing requests")
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+# One bucket and breaker per host, shared by the detail-page threads and kept
+# across warm invocations, so a failing site stays paused between scheduled runs
+host_buckets: Dict[str, TokenBucket] = {}
+host_breakers: Dict[str, CircuitBreaker] = {}
+host_guard_lock = threading.Lock()
+
+def host_bucket(url: str) -> TokenBucket:
+    host = urlsplit(url).netloc
+    with host_guard_lock:
+        if host not in host_buckets:
+            host_buckets[host] = TokenBucket(SCRAPER_RATE_PER_SEC, SCRAPER_RATE_BURST)
+        return host_buckets[host]
+
+def host_breaker(url: str) -> CircuitBreaker:
+    host = urlsplit(url).netloc
+    with host_guard_lock:
+        if host not in host_breakers:
+            host_breakers[host] = CircuitBreaker(SCRAPER_BREAKER_THRESHOLD, SCRAPER_BREAKER_RESET)
+        return host_breakers[host]
+
+def http_get(url: str, **kwargs) -> requests.Response:
+    kwargs.setdefault("timeout", SCRAPER_TIMEOUT)
+    kwargs.setdefault("verify", False)
+    breaker = host_breaker(url)
+    breaker.before_request(urlsplit(url).netloc)
+    host_bucket(url).acquire()
+    # The session has already retried by now, so one failure here is a whole
+    # retry sequence that failed
+    try:
+        response = get_http_session().get(url, **kwargs)
+    except Exception:
+        breaker.record_failure()
+        raise
+    if response.status_code in RETRYABLE_STATUSES:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
 
 def parse_work_time(soup: BeautifulSoup) -> Optional[str]:
     work_time_section = soup.find("section", class_="job-work_time")
@@ -82,9 +391,11 @@ def parse_work_time(soup: BeautifulSoup) -> Optional[str]:
         return work_date_match.group(1) if work_date_match else None
     return None
 
-def get_job_details(job_url: str) -> Tuple[Optional[str], Optional[str]]:
+def get_job_details(job_url: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+    from bs4 import BeautifulSoup
+
     try:
-        response = requests.get(job_url, verify=False)
+        response = http_get(job_url)
         response.raise_for_status()
         soup = BeautifulSoup(response.text, "html.parser")
         
@@ -104,113 +415,387 @@ def get_job_details(job_url: str) -> Tuple[Optional[str], Optional[str]]:
         return job_content, job_time
     except Exception as e:
         print(f"Error fetching job details: {str(e)}")
-        return None, None
+        return None
+
+def parse_job_list(html: str, limit: Optional[int] = None) -> List[dict]:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    job_list = soup.find("ul", id="job-list", class_="job-list show")
+    jobs = job_list.find_all("li")
+    
+    items = []
+    for job in jobs[:limit]:
+        job_item = job.find("div", class_="is-blk")
+        job_time = job.find("div", class_="job-info-date is-flex flex-start flex-align-center")
+        job_link = job.find("a", class_="job-list-item")
+        
+        if job_item and job_time and job_link:
+            job_detail = job_item.find("p", class_="job_detail")
+            items.append({
+                "url": job_link['href'],
+                "title": job_item.find("h2", class_="job-info-title").text.strip(),
+                "employer": job_item.find("p", class_="mobile-job-company").text.strip(),
+                "salary": job_detail.find("span", class_="salary").text.strip(),
+                "location": job_detail.find("span", class_="place").text.strip()
+            })
+    return items
+
+def listing_page_url(page: int) -> str:
+    return CHICKPT_CASES_URL if page == 1 else f"{CHICKPT_CASES_URL}?page={page}"
+
+def fetch_job_details(job_urls: List[str], max_concurrency: int) -> List[Optional[Tuple[Optional[str], Optional[str]]]]:
+    if not job_urls:
+        return []
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        return list(executor.map(get_job_details, job_urls))
+
+def queue_retry(redis_client: RedisClient, item: dict):
+    attempts = item.get("attempts", 0) + 1
+    pipe = redis_client.redis_client.pipeline()
+    if attempts > SCRAPER_RETRY_MAX_ATTEMPTS:
+        print(f"Dropping {item['url']} after {SCRAPER_RETRY_MAX_ATTEMPTS} failed detail fetches")
+        pipe.zrem(RETRY_QUEUE_KEY, item["url"])
+        pipe.hdel(RETRY_ITEMS_KEY, item["url"])
+    else:
+        pipe.hset(RETRY_ITEMS_KEY, item["url"], json.dumps(dict(item, attempts=attempts), ensure_ascii=False))
+        pipe.zadd(RETRY_QUEUE_KEY, {item["url"]: time.time() + SCRAPER_RETRY_DELAY * attempts})
+    pipe.execute()
+
+def due_retries(redis_client: RedisClient, limit: int = 50) -> List[dict]:
+    urls = redis_client.redis_client.zrangebyscore(RETRY_QUEUE_KEY, 0, time.time(), start=0, num=limit)
+    if not urls:
+        return []
+    payloads = redis_client.redis_client.hmget(RETRY_ITEMS_KEY, urls)
+    return [json.loads(payload) for payload in payloads if payload]
+
+def build_job_details(
+    items: List[dict],
+    details: List[Optional[Tuple[Optional[str], Optional[str]]]],
+    redis_client: Optional[RedisClient] = None
+) -> List[JobDetail]:
+    data = []
+    for item, detail in zip(items, details):
+        # Jobs whose detail page failed are retried later rather than saved incomplete
+        if detail is None:
+            if redis_client:
+                queue_retry(redis_client, item)
+            continue
+        job_content, job_time = detail
+        data.append(JobDetail(
+            title=item["title"],
+            employer=item["employer"],
+            location=item["location"],
+            salary=item["salary"],
+            content=job_content,
+            url=item["url"],
+            job_time=job_time,
+            created_at=datetime.now()
+        ))
+    return data
 
-def scrape_chickpt(limit: int = 1) -> List[JobDetail]:
-    url = "https://www.chickpt.com.tw/cases"
+def scrape_chickpt(
+    limit: Optional[int] = 1,
+    max_concurrency: int = SCRAPER_MAX_CONCURRENCY,
+    redis_client: Optional[RedisClient] = None
+) -> List[JobDetail]:
     try:
-        response = requests.get(url, verify=False)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, "html.parser")
-        job_list = soup.find("ul", id="job-list", class_="job-list show")
-        jobs = job_list.find_all("li")
+        listing_cache = ListingCache(redis_client) if redis_client else None
+        items, response = fetch_listing(CHICKPT_CASES_URL, listing_cache, limit)
+        if items is None:
+            return []
+        details = fetch_job_details([item["url"] for item in items], max_concurrency)
+        
+        jobs = build_job_details(items, details, redis_client)
+        if listing_cache:
+            listing_cache.store(CHICKPT_CASES_URL, response, listing_cache.fingerprint(items))
+        return jobs
+    except Exception as e:
+        print(f"Error scraping chickpt: {str(e)}")
+        return []
+
+def scrape_new_chickpt(
+    is_known: Callable[[List[str]], Set[str]],
+    max_pages: int = SCRAPER_MAX_PAGES,
+    max_concurrency: int = SCRAPER_MAX_CONCURRENCY,
+    redis_client: Optional[RedisClient] = None
+) -> List[JobDetail]:
+    try:
+        listing_cache = ListingCache(redis_client) if redis_client else None
+        new_items = []
+        seen_urls = set()
+        first_page = None
+        reached_known = False
         
-        data = []
-        for job in jobs[:limit]:
-            job_item = job.find("div", class_="is-blk")
-            job_time = job.find("div", class_="job-info-date is-flex flex-start flex-align-center")
-            job_link = job.find("a", class_="job-list-item")
+        for page in range(1, max_pages + 1):
+            items, response = fetch_listing(listing_page_url(page), listing_cache if page == 1 else None)
+            if items is None:
+                break
+            if page == 1:
+                first_page = (response, listing_cache.fingerprint(items) if listing_cache else None)
+            items = [item for item in items if item["url"] not in seen_urls]
+            if not items:
+                break
             
-            if job_item and job_time and job_link:
-                job_url = job_link['href']
-                title = job_item.find("h2", class_="job-info-title").text.strip()
-                employer = job_item.find("p", class_="mobile-job-company").text.strip()
-                job_detail = job_item.find("p", class_="job_detail")
-                salary = job_detail.find("span", class_="salary").text.strip()
-                location = job_detail.find("span", class_="place").text.strip()
-                
-                job_content, job_time = get_job_details(job_url)
-                
-                data.append(JobDetail(
-                    title=title,
-                    employer=employer,
-                    location=location,
-                    salary=salary,
-                    content=job_content,
-                    url=job_url,
-                    job_time=job_time,
-                    created_at=datetime.now()
-                ))
-        return data
+            known_urls = is_known([item["url"] for item in items])
+            for item in items:
+                if item["url"] in known_urls:
+                    reached_known = True
+                    break
+                seen_urls.add(item["url"])
+                new_items.append(item)
+            if reached_known:
+                break
+        else:
+            print(f"No known job found within {max_pages} listing pages")
+        
+        details = fetch_job_details([item["url"] for item in new_items], max_concurrency)
+        jobs = build_job_details(new_items, details, redis_client)
+        if listing_cache and first_page:
+            listing_cache.store(CHICKPT_CASES_URL, *first_page)
+        return jobs
     except Exception as e:
         print(f"Error scraping chickpt: {str(e)}")
         return []
 
-def save_jobs(db: Session, jobs: List[JobDetail]) -> bool:
+def scrape_retries(redis_client: RedisClient, max_concurrency: int = SCRAPER_MAX_CONCURRENCY) -> List[JobDetail]:
     try:
-        redis_client = RedisClient()
-        new_jobs=[]
-        for job in jobs:
-            if redis_client.exists(f"job_url:{job.url}"):
-                continue
-            existing_job = db.query(Job).filter(Job.url == job.url).first()
-            if existing_job:
-                redis_client.set(f"job_url:{job.url}", "1", ex=86400)
-                continue
-            new_job = Job(
-                title=job.title,
-                employer=job.employer,
-                location=job.location,
-                salary=job.salary,
-                content=job.content,
-                url=job.url,
-                time=job.job_time,
-                created_at=job.created_at
-            )
-            db.add(new_job)
-            db.flush()
-            db.refresh(new_job)
-            new_jobs.append(new_job)
-            redis_client.set(f"job_url:{job.url}", "1", ex=86400)
-        print(f"new_jobs: {new_jobs}")
-        if new_jobs:
-            db.commit()
-            publish_new_jobs(new_jobs, redis_client)
-            return True
-        return False
+        items = due_retries(redis_client)
+        details = fetch_job_details([item["url"] for item in items], max_concurrency)
+        jobs = build_job_details(items, details, redis_client)
+        if jobs:
+            pipe = redis_client.redis_client.pipeline()
+            pipe.zrem(RETRY_QUEUE_KEY, *[job.url for job in jobs])
+            pipe.hdel(RETRY_ITEMS_KEY, *[job.url for job in jobs])
+            pipe.execute()
+        return jobs
+    except Exception as e:
+        print(f"Error retrying failed jobs: {str(e)}")
+        return []
+
+def load_cursor(redis_client: RedisClient) -> Optional[dict]:
+    cursor = redis_client.get(SCRAPE_CURSOR_KEY)
+    return json.loads(cursor) if cursor else None
+
+# URLs the unfinished walk has saved, so a resumed walk can tell them apart from
+# jobs that were already known before it started
+def load_walk_saved(redis_client: RedisClient) -> Set[str]:
+    return set(redis_client.redis_client.smembers(SCRAPE_CURSOR_SAVED_KEY))
+
+def save_cursor(redis_client: RedisClient, page: int, url: str, saved_urls: List[str] = ()):
+    pipe = redis_client.redis_client.pipeline()
+    pipe.set(SCRAPE_CURSOR_KEY, json.dumps({"page": page, "url": url}))
+    if saved_urls:
+        pipe.sadd(SCRAPE_CURSOR_SAVED_KEY, *saved_urls)
+    pipe.execute()
+
+def clear_cursor(redis_client: RedisClient):
+    redis_client.redis_client.delete(SCRAPE_CURSOR_KEY, SCRAPE_CURSOR_SAVED_KEY)
+
+def scrape_within_budget(
+    db: Session,
+    redis_client: RedisClient,
+    time_left: Callable[[], int],
+    margin_ms: int = SCRAPER_TIME_MARGIN_MS,
+    max_pages: int = SCRAPER_BUDGET_MAX_PAGES,
+    chunk_size: int = SCRAPER_MAX_CONCURRENCY
+) -> Tuple[int, bool]:
+    # Walks listing pages from the saved cursor and saves chunk by chunk until the
+    # walk reaches known jobs or only the safety margin of the invocation is left
+    cursor = load_cursor(redis_client)
+    # Deletions above the cursor can move it up a page, so resume one page early
+    start_page = max(1, cursor["page"] - 1) if cursor else 1
+    resume_after = cursor["url"] if cursor else None
+    walk_saved = load_walk_saved(redis_client) if cursor else set()
+    if cursor:
+        print(f"Resuming listing walk at page {cursor['page']} after {cursor['url']}")
+
+    # A fresh walk checks the first page against the listing cache; a resumed
+    # walk has to go on regardless
+    listing_cache = None if cursor else ListingCache(redis_client)
+    first_page = None
+    scraped = 0
+    seen_urls = set()
+    for page in range(start_page, max_pages + 1):
+        if time_left() < margin_ms:
+            print(f"Stopping with {time_left()} ms left before listing page {page}")
+            return scraped, False
+        items, response = fetch_listing(listing_page_url(page), listing_cache if page == 1 else None)
+        if items is None:
+            break
+        if listing_cache and page == 1:
+            first_page = (response, listing_cache.fingerprint(items))
+        items = [item for item in items if item["url"] not in seen_urls]
+        if not items:
+            break
+
+        urls = [item["url"] for item in items]
+        if resume_after in urls:
+            items = items[urls.index(resume_after) + 1:]
+            urls = urls[urls.index(resume_after) + 1:]
+            resume_after = None
+
+        known_urls = get_known_urls(db, redis_client, urls)
+        # New postings can push the cursor URL further down; until it is passed,
+        # jobs this walk already saved are skipped. Any other known job means the
+        # walk reached older history, which also ends it when the cursor job was
+        # taken down and never shows up.
+        new_items = []
+        reached_known = False
+        for item in items:
+            if item["url"] in known_urls:
+                if resume_after and item["url"] in walk_saved:
+                    continue
+                reached_known = True
+                break
+            new_items.append(item)
+
+        for i in range(0, len(new_items), chunk_size):
+            if time_left() < margin_ms:
+                print(f"Stopping with {time_left()} ms left, cursor at page {page}")
+                return scraped, False
+            chunk = new_items[i:i + chunk_size]
+            seen_urls.update(item["url"] for item in chunk)
+            details = fetch_job_details([item["url"] for item in chunk], chunk_size)
+            jobs = build_job_details(chunk, details, redis_client)
+            if jobs:
+                try:
+                    scraped += len(insert_jobs(db, jobs, redis_client))
+                except Exception as e:
+                    # Keep the cursor before this chunk so the next invocation retries it
+                    db.rollback()
+                    print(f"Error saving jobs, stopping walk at page {page}: {str(e)}")
+                    return scraped, False
+            save_cursor(redis_client, page, chunk[-1]["url"], [job.url for job in jobs])
+
+        if reached_known:
+            break
+    else:
+        print(f"No known job found within {max_pages} listing pages")
+
+    if first_page:
+        listing_cache.store(CHICKPT_CASES_URL, *first_page)
+    clear_cursor(redis_client)
+    return scraped, True
+
+def get_known_urls(db: Session, redis_client: RedisClient, urls: List[str]) -> Set[str]:
+    if not urls:
+        return set()
+    bloom = UrlBloomFilter(redis_client)
+    bloom.ensure_loaded(db)
+    candidates = [url for url, maybe in zip(urls, bloom.might_contain_many(urls)) if maybe]
+    if not candidates:
+        return set()
+    Job = get_job_model()
+    rows = db.query(Job.url).filter(Job.url.in_(candidates)).all()
+    return {row[0] for row in rows}
+
+def insert_ignoring_conflicts(rows: List[dict]):
+    from sqlalchemy.dialects import postgresql
+
+    Job = get_job_model()
+    return postgresql.insert(Job).values(rows).on_conflict_do_nothing(index_elements=["url"]).returning(Job)
+
+def insert_jobs(db: Session, jobs: List[JobDetail], redis_client: RedisClient) -> list:
+    rows = {}
+    for job in jobs:
+        rows.setdefault(job.url, {
+            "title": job.title,
+            "employer": job.employer,
+            "location": job.location,
+            "salary": job.salary,
+            "content": job.content,
+            "url": job.url,
+            "time": job.job_time,
+            "created_at": job.created_at
+        })
+    rows = list(rows.values())
+    inserted = {}
+    for i in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+        for new_job in db.scalars(insert_ignoring_conflicts(rows[i:i + BULK_INSERT_BATCH_SIZE])):
+            inserted[new_job.url] = new_job
+    new_jobs = [inserted[row["url"]] for row in rows if row["url"] in inserted]
+    print(f"new_jobs: {new_jobs}")
+    if new_jobs:
+        db.commit()
+        UrlBloomFilter(redis_client).add_many([job.url for job in new_jobs])
+        publish_new_jobs(new_jobs, redis_client)
+    return new_jobs
+
+def save_jobs(db: Session, jobs: List[JobDetail], redis_client: Optional[RedisClient] = None) -> bool:
+    try:
+        return bool(insert_jobs(db, jobs, redis_client or get_redis_client()))
     except Exception as e:
         db.rollback()
         print(f"Error saving jobs: {str(e)}")
         return False
 
-def publish_new_jobs(jobs: List[Job], redis_client: RedisClient):
+def job_to_message(job) -> str:
+    return json.dumps({
+        'id': job.id,
+        "title": job.title,
+        "employer": job.employer,
+        "location": job.location,
+        "salary": job.salary,
+        "content": job.content,
+        "url": job.url,
+        "time": job.time,
+        "created_at": job.created_at.isoformat()
+    })
+
+def publish_new_jobs(jobs: list, redis_client: RedisClient):
     try:
-        for job in jobs:
-            job_data = {
-                'id': job.id,
-                "title": job.title,
-                "employer": job.employer,
-                "location": job.location,
-                "salary": job.salary,
-                "content": job.content,
-                "url": job.url,
-                "time": job.time,
-                "created_at": job.created_at.isoformat()
-            }
-            redis_client.publish('new_job', json.dumps(job_data))
+        redis_client.publish_many('new_job', [job_to_message(job) for job in jobs])
     except Exception as e:
         print(f"Redis publish error: {str(e)}")
 
 
-engine = create_engine(DATABASE_URL)
-Base.metadata.create_all(bind=engine)
+# Created on first use and kept at module scope so warm invocations reuse the
+# engine's connection pool and the Redis connection; the schema is managed by Alembic
+engine = None
+SessionLocal = None
+redis_client_instance = None
+
+def get_session_factory():
+    global engine, SessionLocal
+    if SessionLocal is None:
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        engine = create_engine(DATABASE_URL, pool_size=1, max_overflow=0, pool_pre_ping=True)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    return SessionLocal
+
+def get_redis_client() -> RedisClient:
+    global redis_client_instance
+    if redis_client_instance is None:
+        redis_client_instance = RedisClient()
+    return redis_client_instance
 
 def lambda_handler(event, context):
+    db = None
     try:
-        db = SessionLocal()
-        jobs = scrape_chickpt(limit=3)
+        db = get_session_factory()()
+        redis_client = get_redis_client()
+        jobs = scrape_retries(redis_client)
+        if not SCRAPE_LIMIT and hasattr(context, "get_remaining_time_in_millis"):
+            if jobs:
+                save_jobs(db, jobs, redis_client)
+            scraped, finished = scrape_within_budget(db, redis_client, context.get_remaining_time_in_millis)
+            return {
+                'statusCode': 200,
+                'body': json.dumps({
+                    "status": "completed" if finished else "partial",
+                    "message": f"Scraped {len(jobs) + scraped} jobs"
+                })
+            }
+        if SCRAPE_LIMIT:
+            jobs += scrape_chickpt(limit=SCRAPE_LIMIT, redis_client=redis_client)
+        else:
+            jobs += scrape_new_chickpt(
+                lambda urls: get_known_urls(db, redis_client, urls),
+                redis_client=redis_client
+            )
         
         if not jobs:
             return {
@@ -218,7 +803,7 @@ def lambda_handler(event, context):
                 'body': json.dumps({"status": "completed", "message": "No jobs scraped"})
             }
             
-        if save_jobs(db, jobs):
+        if save_jobs(db, jobs, redis_client):
             return {
                 'statusCode': 200,
                 'body': json.dumps({
@@ -240,4 +825,5 @@ def lambda_handler(event, context):
             'body': json.dumps({'error': str(e)})
         }
     finally:
-        db.close()
\ No newline at end of file
+        if db is not None:
+            db.close()
\ No newline at end of file
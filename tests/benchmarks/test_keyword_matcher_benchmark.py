@@ -0,0 +1,94 @@
+import os
+import random
+import string
+import time
+import pytest
+from app.services.keyword_matcher import KeywordMatcher
+
+KEYWORD_COUNT = int(os.environ.get("KEYWORD_BENCHMARK_COUNT", "100000"))
+TITLE_COUNT = 50
+# The automaton must match titles at least this many times faster than the per-keyword scan
+MIN_SPEEDUP = float(os.environ.get("KEYWORD_BENCHMARK_MIN_SPEEDUP", "20"))
+# Adding a keyword must cost at most this fraction of a full build
+MAX_UPDATE_RATIO = float(os.environ.get("KEYWORD_BENCHMARK_MAX_UPDATE_RATIO", "0.05"))
+UPDATE_COUNT = 20
+CHARS = "咖啡廳外送員服務生店員家教行政助理門市工讀" + string.ascii_lowercase
+
+def make_keywords(count: int, rng: random.Random) -> list:
+    keywords = set()
+    while len(keywords) < count:
+        keywords.add("".join(rng.choices(CHARS, k=rng.randint(2, 6))))
+    return list(keywords)
+
+def make_titles(keywords: list, rng: random.Random) -> list:
+    return [
+        "".join(rng.choices(CHARS, k=10)) + rng.choice(keywords) + "".join(rng.choices(CHARS, k=10))
+        for _ in range(TITLE_COUNT)
+    ]
+
+def naive_match(title: str, keywords: list) -> set:
+    title = title.lower()
+    return {keyword for keyword in keywords if keyword.lower() in title}
+
+def run(keyword_count: int = KEYWORD_COUNT) -> dict:
+    rng = random.Random(42)
+    keywords = make_keywords(keyword_count, rng)
+    titles = make_titles(keywords, rng)
+
+    start = time.perf_counter()
+    matcher = KeywordMatcher()
+    matcher.load(keywords)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    naive = [naive_match(title, keywords) for title in titles]
+    naive_ms = (time.perf_counter() - start) * 1000 / len(titles)
+
+    start = time.perf_counter()
+    matched = [matcher.match(title) for title in titles]
+    matcher_ms = (time.perf_counter() - start) * 1000 / len(titles)
+
+    # Worst add + match over keywords drawn from the same alphabet, so each one
+    # relinks existing nodes instead of hanging a fresh branch off the root
+    known = set(keywords)
+    added = [keyword for keyword in make_keywords(UPDATE_COUNT * 2, rng) if keyword not in known][:UPDATE_COUNT]
+    update_ms = 0.0
+    for keyword in added:
+        start = time.perf_counter()
+        matcher.add(keyword)
+        updated = matcher.match(titles[0] + keyword)
+        update_ms = max(update_ms, (time.perf_counter() - start) * 1000)
+        assert keyword in updated
+
+    return {
+        "naive": naive,
+        "matched": matched,
+        "build_ms": build_ms,
+        "naive_ms": naive_ms,
+        "matcher_ms": matcher_ms,
+        "update_ms": update_ms,
+    }
+
+def report(result: dict) -> str:
+    return (
+        f"{KEYWORD_COUNT} keywords: build {result['build_ms']:.0f} ms, "
+        f"per title naive {result['naive_ms']:.2f} ms vs automaton {result['matcher_ms']:.3f} ms "
+        f"({result['naive_ms'] / result['matcher_ms']:.0f}x), worst add + match {result['update_ms']:.2f} ms"
+    )
+
+@pytest.fixture(scope="module")
+def result():
+    return run()
+
+def test_matcher_matches_naive_scan(result):
+    assert result["matched"] == result["naive"]
+
+def test_matcher_beats_per_keyword_scan(result):
+    print(report(result))
+    assert result["naive_ms"] >= result["matcher_ms"] * MIN_SPEEDUP
+
+def test_add_does_not_rebuild_the_automaton(result):
+    assert result["update_ms"] <= result["build_ms"] * MAX_UPDATE_RATIO
+
+if __name__ == "__main__":
+    print(report(run()))
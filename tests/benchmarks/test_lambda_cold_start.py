@@ -0,0 +1,147 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import pytest
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "lambda_baseline.json")
+# Absolute latencies depend on the machine, so the baseline comparison only runs
+# when BENCHMARK_BASELINE is set, on the machine that recorded it
+COMPARE_BASELINE = bool(os.environ.get("BENCHMARK_BASELINE"))
+# Fail only when a measurement is slower than its baseline by more than this factor
+TOLERANCE = float(os.environ.get("BENCHMARK_TOLERANCE", "0.5"))
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+HEAVY_MODULES = ["bs4", "sqlalchemy", "pydantic", "redis", "requests"]
+# The deferred imports are paid by the first invocation, so the module import must
+# stay at most this fraction of it
+MAX_IMPORT_RATIO = float(os.environ.get("LAMBDA_BENCHMARK_MAX_IMPORT_RATIO", "0.2"))
+RUNS = 5
+
+JOBS_TABLE = """
+CREATE TABLE jobs (
+    id INTEGER PRIMARY KEY,
+    title VARCHAR(255) NOT NULL,
+    employer VARCHAR(255) NOT NULL,
+    location VARCHAR(255),
+    salary VARCHAR(255),
+    content TEXT,
+    url VARCHAR(255) UNIQUE,
+    time VARCHAR(255),
+    created_at DATETIME
+)
+"""
+
+def measure_cold_start(db_path: str) -> dict:
+    # Runs in a fresh interpreter so the import is a real cold import
+    import time
+    from unittest.mock import patch
+
+    start = time.perf_counter()
+    import lambda_function
+    import_ms = (time.perf_counter() - start) * 1000
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+
+    import fakeredis
+    from tests.helpers import sqlite_insert_ignoring_conflicts, stub_response
+
+    def listing_or_detail(url: str, **kwargs):
+        # Every listing page serves the same fixture; the scraper stops once it sees no new URLs
+        return stub_response(url.split("?", 1)[0], **kwargs)
+
+    lambda_function.DATABASE_URL = f"sqlite:///{db_path}"
+    with patch("redis.Redis", fakeredis.FakeRedis), \
+         patch.object(lambda_function, "http_get", side_effect=listing_or_detail), \
+         patch.object(lambda_function, "insert_ignoring_conflicts",
+                      lambda rows: sqlite_insert_ignoring_conflicts(lambda_function.get_job_model(), rows)):
+        start = time.perf_counter()
+        result = lambda_function.lambda_handler({}, None)
+        first_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        lambda_function.lambda_handler({}, None)
+        warm_ms = (time.perf_counter() - start) * 1000
+
+    return {
+        "import_ms": import_ms,
+        "first_invocation_ms": first_ms,
+        "warm_invocation_ms": warm_ms,
+        "status_code": result["statusCode"],
+        "message": json.loads(result["body"]).get("message"),
+        "loaded_at_import": loaded,
+    }
+
+def run_cold_start(tmp_dir: str) -> dict:
+    db_path = os.path.join(tmp_dir, "jobs.db")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(JOBS_TABLE)
+
+    output = subprocess.run(
+        [sys.executable, "-m", "tests.benchmarks.test_lambda_cold_start", "--measure", db_path],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def median_cold_start(tmp_dir: str) -> dict:
+    runs = [run_cold_start(tmp_dir) for _ in range(RUNS)]
+    result = dict(runs[-1])
+    for key in ("import_ms", "first_invocation_ms", "warm_invocation_ms"):
+        result[key] = sorted(run[key] for run in runs)[RUNS // 2]
+    return result
+
+def load_baseline() -> dict:
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+@pytest.fixture(scope="module")
+def cold_start(tmp_path_factory):
+    return median_cold_start(str(tmp_path_factory.mktemp("lambda")))
+
+def test_import_does_not_load_heavy_modules(cold_start):
+    assert cold_start["loaded_at_import"] == []
+
+def test_first_invocation_succeeds(cold_start):
+    assert cold_start["status_code"] == 200
+    assert cold_start["message"].startswith("Saved")
+
+def test_import_is_a_small_part_of_the_first_invocation(cold_start):
+    print(f"import {cold_start['import_ms']:.1f} ms, first invocation {cold_start['first_invocation_ms']:.1f} ms")
+    assert cold_start["import_ms"] <= cold_start["first_invocation_ms"] * MAX_IMPORT_RATIO
+
+def test_warm_invocation_reuses_the_first_ones_setup(cold_start):
+    assert cold_start["warm_invocation_ms"] < cold_start["first_invocation_ms"]
+
+@pytest.mark.skipif(not COMPARE_BASELINE, reason="BENCHMARK_BASELINE is not set")
+@pytest.mark.parametrize("name", ["import_ms", "first_invocation_ms"])
+def test_cold_start_latency_against_baseline(cold_start, name):
+    baseline = load_baseline()[name]
+
+    print(f"{name}: {cold_start[name]:.1f} ms (baseline {baseline:.1f}, warm {cold_start['warm_invocation_ms']:.1f})")
+    assert cold_start[name] <= baseline / TOLERANCE
+
+def update_baseline():
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        result = median_cold_start(tmp_dir)
+    baseline = {key: round(result[key], 1) for key in ("import_ms", "first_invocation_ms", "warm_invocation_ms")}
+    print(baseline)
+    with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+        f.write("\n")
+
+if __name__ == "__main__":
+    if "--measure" in sys.argv:
+        print(json.dumps(measure_cold_start(sys.argv[sys.argv.index("--measure") + 1])))
+    elif "--update-baseline" in sys.argv:
+        update_baseline()
+    else:
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            print(median_cold_start(tmp_dir))
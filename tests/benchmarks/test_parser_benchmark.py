@@ -0,0 +1,105 @@
+import asyncio
+import json
+import os
+import sys
+import time
+import pytest
+from unittest.mock import patch
+from app.services.scraper_service import (
+    scrape_chickpt,
+    get_job_details,
+    parse_job_list,
+    parse_job_detail,
+)
+from tests.helpers import DETAIL_HTML, LISTING_HTML, stub_response
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "parser_baseline.json")
+# Absolute rates depend on the machine, so the baseline comparison only runs when
+# BENCHMARK_BASELINE is set, on the machine that recorded it
+COMPARE_BASELINE = bool(os.environ.get("BENCHMARK_BASELINE"))
+# Fail only when a benchmark drops below this fraction of its baseline rate
+TOLERANCE = float(os.environ.get("BENCHMARK_TOLERANCE", "0.5"))
+# The fast parser must beat html.parser by at least this factor on the same run
+MIN_FAST_SPEEDUP = float(os.environ.get("PARSER_BENCHMARK_MIN_SPEEDUP", "1.1"))
+SPEEDUP_ROUNDS = 3
+MIN_DURATION = 0.5
+
+def rate(func, pages_per_call: int) -> float:
+    # Warm up imports and parser caches outside the timed loop
+    func()
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_DURATION:
+            return calls * pages_per_call / elapsed
+
+def run_scrape():
+    asyncio.run(scrape_chickpt(limit=None, max_concurrency=5))
+
+LISTING_JOBS = len(parse_job_list(LISTING_HTML))
+
+# name -> (callable, pages per call, jobs per call)
+BENCHMARKS = {
+    "listing_parse_fast": (lambda: parse_job_list(LISTING_HTML, fast=True), 1, LISTING_JOBS),
+    "listing_parse_html_parser": (lambda: parse_job_list(LISTING_HTML, fast=False), 1, LISTING_JOBS),
+    "detail_parse_fast": (lambda: [parse_job_detail(html, fast=True) for html in DETAIL_HTML], len(DETAIL_HTML), len(DETAIL_HTML)),
+    "detail_parse_html_parser": (lambda: [parse_job_detail(html, fast=False) for html in DETAIL_HTML], len(DETAIL_HTML), len(DETAIL_HTML)),
+    "get_job_details": (lambda: get_job_details("https://www.chickpt.com.tw/cases/201500"), 1, 1),
+    "scrape_chickpt": (run_scrape, LISTING_JOBS + 1, LISTING_JOBS),
+}
+
+def run_benchmark(name: str) -> float:
+    func, pages, _ = BENCHMARKS[name]
+    with patch('app.services.scraper_service.get_http_client') as mock_client, \
+         patch('app.services.scraper_service.get_html_archive', return_value=None):
+        mock_client.return_value.get.side_effect = stub_response
+        return rate(func, pages)
+
+def load_baseline() -> dict:
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+@pytest.mark.parametrize("page", ["listing", "detail"])
+def test_fast_parser_beats_html_parser(page):
+    # Alternate the two and keep each one's best round so load spikes hit both
+    fast = html_parser = 0.0
+    for _ in range(SPEEDUP_ROUNDS):
+        fast = max(fast, run_benchmark(f"{page}_parse_fast"))
+        html_parser = max(html_parser, run_benchmark(f"{page}_parse_html_parser"))
+
+    print(f"{page}: fast {fast:.1f} pages/sec vs html.parser {html_parser:.1f} ({fast / html_parser:.1f}x)")
+    assert fast >= html_parser * MIN_FAST_SPEEDUP
+
+@pytest.mark.skipif(not COMPARE_BASELINE, reason="BENCHMARK_BASELINE is not set")
+@pytest.mark.parametrize("name", sorted(BENCHMARKS))
+def test_parser_throughput_against_baseline(name):
+    pages_per_sec = run_benchmark(name)
+    baseline = load_baseline()[name]["pages_per_sec"]
+
+    print(f"{name}: {pages_per_sec:.1f} pages/sec, {1000 / pages_per_sec:.3f} ms/page (baseline {baseline:.1f})")
+    assert pages_per_sec >= baseline * TOLERANCE
+
+def update_baseline():
+    results = {}
+    for name in sorted(BENCHMARKS):
+        _, pages, jobs = BENCHMARKS[name]
+        pages_per_sec = run_benchmark(name)
+        results[name] = {
+            "pages_per_sec": round(pages_per_sec, 1),
+            "ms_per_page": round(1000 / pages_per_sec, 3),
+            "ms_per_job": round(1000 * pages / (pages_per_sec * jobs), 3),
+        }
+        print(f"{name}: {results[name]}")
+    with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+
+if __name__ == "__main__":
+    if "--update-baseline" in sys.argv:
+        update_baseline()
+    else:
+        for name in sorted(BENCHMARKS):
+            print(f"{name}: {run_benchmark(name):.1f} pages/sec")
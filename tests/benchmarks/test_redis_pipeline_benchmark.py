@@ -0,0 +1,113 @@
+import os
+import time
+import fakeredis
+import pytest
+import redis
+from datetime import datetime
+from types import SimpleNamespace
+import lambda_function
+
+# Simulated network round trip for the in-process stand-in; set REDIS_BENCHMARK_URL
+# to measure against a real Redis instead
+ROUND_TRIP = float(os.environ.get("REDIS_BENCHMARK_RTT", "0.0005"))
+JOB_COUNTS = [10, 100, 500]
+# Batched ingest must be at least this many times faster than per-job commands
+MIN_SPEEDUP = float(os.environ.get("REDIS_BENCHMARK_MIN_SPEEDUP", "3"))
+# fakeredis copies the whole bitmap on every SETBIT, so the stand-in uses a small
+# filter to keep the timing about round trips
+BLOOM_BITS = lambda_function.URL_BLOOM_BITS if os.environ.get("REDIS_BENCHMARK_URL") else 2 ** 16
+
+class RoundTripConnection(fakeredis.FakeConnection):
+    def send_packed_command(self, command, check_health=True):
+        time.sleep(ROUND_TRIP)
+        return super().send_packed_command(command, check_health)
+
+def make_client() -> lambda_function.RedisClient:
+    client = lambda_function.RedisClient.__new__(lambda_function.RedisClient)
+    if os.environ.get("REDIS_BENCHMARK_URL"):
+        client.redis_client = redis.Redis.from_url(os.environ["REDIS_BENCHMARK_URL"], decode_responses=True)
+    else:
+        pool = redis.ConnectionPool(
+            connection_class=RoundTripConnection,
+            server=fakeredis.FakeServer(),
+            decode_responses=True,
+        )
+        client.redis_client = redis.Redis(connection_pool=pool)
+    return client
+
+def make_jobs(count: int) -> list:
+    return [
+        SimpleNamespace(
+            id=i,
+            title=f"job {i}",
+            employer="employer",
+            location="台北市",
+            salary="時薪 200",
+            content="content",
+            url=f"https://www.chickpt.com.tw/cases/{i}",
+            time="2025/01/10",
+            created_at=datetime.now(),
+        )
+        for i in range(count)
+    ]
+
+# The scrape's Redis path: probe the URL Bloom filter, add the new URLs, publish
+# the new jobs. The per-job variant pays a round trip for every bit and message.
+def ingest_per_job(client: lambda_function.RedisClient, jobs: list):
+    bloom = lambda_function.UrlBloomFilter(client, bits=BLOOM_BITS)
+    for job in jobs:
+        positions = bloom.positions(job.url)
+        if all(client.redis_client.getbit(lambda_function.URL_BLOOM_KEY, position) for position in positions):
+            continue
+        for position in positions:
+            client.redis_client.setbit(lambda_function.URL_BLOOM_KEY, position, 1)
+        client.publish("new_job", lambda_function.job_to_message(job))
+
+def ingest_batched(client: lambda_function.RedisClient, jobs: list):
+    bloom = lambda_function.UrlBloomFilter(client, bits=BLOOM_BITS)
+    urls = [job.url for job in jobs]
+    new_jobs = [job for job, maybe in zip(jobs, bloom.might_contain_many(urls)) if not maybe]
+    bloom.add_many([job.url for job in new_jobs])
+    lambda_function.publish_new_jobs(new_jobs, client)
+
+def measure(ingest, count: int) -> float:
+    client = make_client()
+    client.redis_client.flushdb()
+    jobs = make_jobs(count)
+    start = time.perf_counter()
+    ingest(client, jobs)
+    elapsed = time.perf_counter() - start
+    client.redis_client.flushdb()
+    return elapsed * 1000
+
+@pytest.mark.parametrize("count", JOB_COUNTS)
+def test_batched_ingest_beats_per_job_round_trips(count):
+    per_job_ms = measure(ingest_per_job, count)
+    batched_ms = measure(ingest_batched, count)
+
+    print(f"{count} jobs: per-job {per_job_ms:.1f} ms, batched {batched_ms:.1f} ms ({per_job_ms / batched_ms:.1f}x)")
+    assert per_job_ms >= batched_ms * MIN_SPEEDUP
+
+def test_batched_ingest_matches_per_job_results():
+    client = make_client()
+    client.redis_client.flushdb()
+    jobs = make_jobs(5)
+    bloom = lambda_function.UrlBloomFilter(client, bits=BLOOM_BITS)
+    bloom.add_many([jobs[2].url])
+    pubsub = client.redis_client.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe("new_job")
+
+    ingest_batched(client, jobs)
+
+    assert bloom.might_contain_many([job.url for job in jobs]) == [True] * 5
+    messages = [pubsub.get_message(timeout=0.1) for _ in range(6)]
+    published = [message for message in messages if message]
+    assert len(published) == 4
+    assert jobs[2].url not in "".join(message["data"] for message in published)
+    client.redis_client.flushdb()
+
+if __name__ == "__main__":
+    for count in JOB_COUNTS:
+        per_job_ms = measure(ingest_per_job, count)
+        batched_ms = measure(ingest_batched, count)
+        print(f"{count} jobs: per-job {per_job_ms:.1f} ms, batched {batched_ms:.1f} ms")
@@ -0,0 +1,17 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models.jobs import Job
+from app.repositories.job_repository import JobRepository
+from tests.helpers import sqlite_insert_ignoring_conflicts
+
+@pytest.fixture
+def sqlite_db(monkeypatch):
+    monkeypatch.setattr(JobRepository, "insert_ignoring_conflicts", lambda self, rows: sqlite_insert_ignoring_conflicts(Job, rows))
+    # One shared connection, since save_job_stream saves from a worker thread
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Job.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
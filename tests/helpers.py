@@ -0,0 +1,91 @@
+import os
+from datetime import datetime
+from unittest.mock import Mock
+from sqlalchemy.dialects import sqlite
+from app.services.scraper_service import CHICKPT_CASES_URL, JobDetail
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "chickpt")
+
+def read_fixture(name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+DETAIL_FIXTURES = sorted(name for name in os.listdir(FIXTURES_DIR) if name.startswith("job_"))
+
+LISTING_HTML = read_fixture("cases.html")
+DETAIL_HTML = [read_fixture(name) for name in DETAIL_FIXTURES]
+
+def stub_response(url: str, **kwargs) -> Mock:
+    response = Mock()
+    response.status_code = 200
+    response.headers = {}
+    response.raise_for_status.return_value = None
+    if url == CHICKPT_CASES_URL:
+        response.text = LISTING_HTML
+    else:
+        response.text = DETAIL_HTML[int(url.rsplit("/", 1)[1]) % len(DETAIL_HTML)]
+    response.content = response.text.encode("utf-8")
+    return response
+
+def listing_item(index: int) -> str:
+    return f"""
+    <li>
+        <a class="job-list-item" href="https://www.chickpt.com.tw/cases/{index}">
+            <div class="is-blk">
+                <h2 class="job-info-title">job {index}</h2>
+                <p class="mobile-job-company">employer {index}</p>
+                <p class="job_detail">
+                    <span class="salary">時薪 200</span>
+                    <span class="place">台北市</span>
+                </p>
+            </div>
+            <div class="job-info-date is-flex flex-start flex-align-center">今天</div>
+        </a>
+    </li>
+    """
+
+def listing_page(count: int) -> str:
+    items = "".join(listing_item(i) for i in range(count))
+    return f'<html><body><ul id="job-list" class="job-list show">{items}</ul></body></html>'
+
+def detail_page(index: int) -> str:
+    return f"""
+    <html><body>
+        <ul class="content-list">
+            <li class="text l-line-light pre-dot">內容 : job {index}</li>
+        </ul>
+        <section class="job-work_time">
+            <p class="text l-line-light">工作日期：2025/01/{index + 10:02d}</p>
+        </section>
+    </body></html>
+    """
+
+def paged_fake_get(pages: dict):
+    def fake_get(url, **kwargs):
+        response = Mock(status_code=200, headers={})
+        response.raise_for_status.return_value = None
+        if "/cases/" in url:
+            response.text = detail_page(int(url.rsplit("/", 1)[1]))
+        else:
+            page = int(url.split("page=")[1]) if "page=" in url else 1
+            items = "".join(listing_item(i) for i in pages.get(page, []))
+            response.text = f'<html><body><ul id="job-list" class="job-list show">{items}</ul></body></html>'
+        response.content = response.text.encode("utf-8")
+        return response
+    return fake_get
+
+def make_job_detail(index: int) -> JobDetail:
+    return JobDetail(
+        title=f"job {index}",
+        employer="employer",
+        location="台北市",
+        salary="時薪 200",
+        content="content",
+        url=f"https://job/{index}",
+        job_time="2025/01/10",
+        created_at=datetime.now(),
+    )
+
+# Production inserts are PostgreSQL-only; SQLite has the same ON CONFLICT form
+def sqlite_insert_ignoring_conflicts(model, rows: list):
+    return sqlite.insert(model).values(rows).on_conflict_do_nothing(index_elements=["url"]).returning(model)
@@ -1,13 +1,15 @@
 import asyncio
 from datetime import datetime
-from app.dependencies.database import get_db
+from sqlalchemy import select
+from app.dependencies.database import AsyncSessionLocal
 from app.models.jobs import Job
 from app.services.notifications.email import EmailNotification
+from app.services.user_service import UserService
 from app.models.users import User
 from app.core.logger import logger
 
 async def test_email_notification():
-    db = next(get_db())
+    db = AsyncSessionLocal()
     
     try:
         test_job = Job(
@@ -20,10 +22,11 @@ async def test_email_notification():
             time="2025-01-10",
             created_at=datetime.now()
         )
-        test_user = db.query(User).filter(User.username == 'testuser').first()          
-        email_notification = EmailNotification(db)
+        test_user = (await db.execute(select(User).where(User.username == 'testuser'))).scalars().first()          
+        recipients = await UserService(db).get_notification_recipients([test_user.user_id])
+        email_notification = EmailNotification()
         await email_notification.send(
-            user_id=test_user.user_id,
+            recipient=recipients[test_user.user_id],
             job=test_job,
         )
         
@@ -32,7 +35,7 @@ async def test_email_notification():
     except Exception as e:
         logger.error(f"error: {str(e)}")
     finally:
-        db.close()
+        await db.close()
 
 if __name__ == "__main__":
     asyncio.run(test_email_notification())
@@ -3,8 +3,9 @@ from sqlalchemy.orm import sessionmaker
 import os
 import json
 from dotenv import load_dotenv
-from app.services.scraper_service import scrape_chickpt
+from app.services.scraper_service import scrape_new_chickpt
 from app.repositories.job_repository import JobRepository
+from app.services.listing_cache_service import ListingCacheService
 from app.dependencies.redis import redis_client
 from app.core.logger import logger
 
@@ -47,13 +48,16 @@ async def main():
     db = SessionLocal()
     
     try:
-        jobs = await scrape_chickpt(limit=2)
+        job_repo = JobRepository(db, redis_client)
+        jobs = await scrape_new_chickpt(
+            job_repo.get_known_urls,
+            listing_cache=ListingCacheService(redis_client),
+        )
         
         if not jobs:
             logger.info("No jobs found")
             return
 
-        job_repo = JobRepository(db)
         saved_jobs = job_repo.save_jobs(jobs)
         if saved_jobs:
             logger.info(f"Successfully saved {len(jobs)} new jobs")
@@ -0,0 +1,55 @@
+import sqlite3
+import threading
+import pytest
+from sqlalchemy import create_engine, exc, text
+from app.dependencies.db_pool import MeteredQueuePool, pool_status
+
+def make_engine(pool_size=1, max_overflow=1, pool_timeout=0.2):
+    return create_engine(
+        "sqlite://",
+        creator=lambda: sqlite3.connect(":memory:", check_same_thread=False),
+        poolclass=MeteredQueuePool,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=pool_timeout,
+    )
+
+def test_pool_status_reports_checked_out_connections():
+    engine = make_engine()
+
+    with engine.connect() as conn:
+        conn.execute(text("select 1"))
+        status = pool_status(engine)
+
+    assert status["pool"] == "MeteredQueuePool"
+    assert status["checked_out"] == 1
+    assert status["checkouts"] == 1
+    assert pool_status(engine)["checked_out"] == 0
+
+def test_overflow_events_and_timeouts_are_counted():
+    engine = make_engine(pool_size=1, max_overflow=1)
+
+    first = engine.connect()
+    second = engine.connect()
+    assert pool_status(engine)["overflow"] == 1
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    first.close()
+    second.close()
+
+    status = pool_status(engine)
+    assert status["overflow_events"] == 1
+    assert status["timeouts"] == 1
+    assert status["wait_ms_max"] >= 200
+
+def test_wait_time_includes_queueing_for_a_connection():
+    engine = make_engine(pool_size=1, max_overflow=0, pool_timeout=2)
+    held = engine.connect()
+    released = threading.Timer(0.1, held.close)
+    released.start()
+
+    with engine.connect():
+        pass
+    released.join()
+
+    assert pool_status(engine)["wait_ms_max"] >= 90
@@ -0,0 +1,68 @@
+import fakeredis
+import pytest
+from unittest.mock import MagicMock, Mock, patch
+from app.core.security import create_jwt_token
+from app.dependencies import db_routing
+from app.dependencies.db_routing import get_write_db, has_recent_write, mark_recent_write, read_session_factory
+
+PRIMARY = Mock(name="primary")
+REPLICA = Mock(name="replica")
+
+def make_request(user_id=None, headers=None):
+    request = Mock()
+    request.headers = dict(headers or {})
+    if user_id is not None:
+        request.headers["Authorization"] = f"Bearer {create_jwt_token(subject=user_id)}"
+    return request
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+@pytest.fixture(autouse=True)
+def replica_configured():
+    with patch.object(db_routing, "AsyncSessionLocal", PRIMARY), \
+         patch.object(db_routing, "ReplicaSessionLocal", REPLICA):
+        yield
+
+def test_reads_go_to_replica_by_default(redis):
+    assert read_session_factory(make_request(user_id=1), redis) is REPLICA
+    assert read_session_factory(make_request(), redis) is REPLICA
+
+def test_recent_write_keeps_user_reads_on_primary(redis):
+    mark_recent_write(redis, "1")
+
+    assert read_session_factory(make_request(user_id=1), redis) is PRIMARY
+    assert read_session_factory(make_request(user_id=2), redis) is REPLICA
+
+def test_header_forces_primary_read(redis):
+    request = make_request(headers={"X-Read-Your-Writes": "true"})
+
+    assert read_session_factory(request, redis) is PRIMARY
+
+def test_without_replica_reads_use_primary(redis):
+    with patch.object(db_routing, "ReplicaSessionLocal", PRIMARY):
+        assert read_session_factory(make_request(user_id=1), redis) is PRIMARY
+
+def test_invalid_token_is_treated_as_anonymous(redis):
+    request = make_request(headers={"Authorization": "Bearer not-a-token"})
+
+    assert read_session_factory(request, redis) is REPLICA
+
+def write_session(committed: bool):
+    db = MagicMock()
+    db.sync_session.info = {"committed": True} if committed else {}
+    session = MagicMock()
+    session.__aenter__.return_value = db
+    return Mock(return_value=session)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("committed", [True, False])
+async def test_write_db_marks_user_only_after_commit(redis, committed):
+    with patch.object(db_routing, "AsyncSessionLocal", write_session(committed)):
+        dependency = get_write_db(make_request(user_id=7), redis)
+        await dependency.__anext__()
+        with pytest.raises(StopAsyncIteration):
+            await dependency.__anext__()
+
+    assert has_recent_write(redis, "7") is committed
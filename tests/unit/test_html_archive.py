@@ -0,0 +1,55 @@
+import fakeredis
+import json
+from unittest.mock import patch
+from app.cli import reparse_archive as cli
+from app.repositories.job_repository import JobRepository
+from app.services.html_archive import HtmlArchive
+from app.services.url_dedupe_service import UrlDedupeService
+from app.services.scraper_service import reparse_archive, CHICKPT_CASES_URL
+from tests.helpers import make_job_detail, read_fixture
+
+def test_put_is_content_addressed(tmp_path):
+    archive = HtmlArchive(str(tmp_path))
+
+    first = archive.put("https://a", "<html>same</html>", "detail")
+    second = archive.put("https://b", "<html>same</html>", "detail")
+
+    assert first == second
+    assert len(list((tmp_path / "objects").rglob("*.html.gz"))) == 1
+    assert HtmlArchive(str(tmp_path)).get("https://b") == "<html>same</html>"
+
+def test_reparse_archive_needs_no_network(tmp_path):
+    archive = HtmlArchive(str(tmp_path))
+    archive.put(CHICKPT_CASES_URL, read_fixture("cases.html"), "listing")
+    archive.put("https://www.chickpt.com.tw/cases/201500", read_fixture("job_201500.html"), "detail")
+
+    with patch('app.services.scraper_service.get_http_client') as mock_client:
+        jobs = list(reparse_archive(archive))
+
+    mock_client.assert_not_called()
+    assert len(jobs) == 20
+    assert jobs[0].job_time == "2025/01/18~2025/01/19"
+    assert jobs[1].content is None
+
+def test_cli_prints_jobs_as_json_lines(tmp_path, capsys):
+    archive = HtmlArchive(str(tmp_path))
+    archive.put(CHICKPT_CASES_URL, read_fixture("cases.html"), "listing")
+
+    assert cli.main(["--archive-dir", str(tmp_path)]) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 20
+    assert json.loads(lines[0])["url"] == "https://www.chickpt.com.tw/cases/201500"
+
+def test_saved_backfill_urls_enter_the_bloom_filter(sqlite_db):
+    redis = fakeredis.FakeRedis(decode_responses=True)
+    existing = make_job_detail(1)
+    JobRepository(sqlite_db).save_jobs([existing])
+    jobs = [make_job_detail(i) for i in range(3)]
+
+    with patch('app.dependencies.database.SessionLocal', return_value=sqlite_db), \
+         patch('app.dependencies.redis.redis_client', redis):
+        assert cli.save_in_batches(iter(jobs), batch_size=2) == 2
+
+    dedupe = UrlDedupeService(sqlite_db, redis)
+    assert dedupe.might_contain_many([job.url for job in jobs]) == [True, True, True]
@@ -0,0 +1,18 @@
+from app.services.http_client import ScraperHttpClient, get_http_client, close_http_client
+
+def test_client_reuses_one_session_with_sized_pool():
+    client = ScraperHttpClient(pool_size=7, connect_timeout=1, read_timeout=2)
+    adapter = client.session.get_adapter("https://www.chickpt.com.tw/cases")
+
+    assert adapter._pool_maxsize == 7
+    assert client.timeout == (1, 2)
+    assert "gzip" in client.session.headers["Accept-Encoding"]
+    client.close()
+
+def test_get_http_client_is_shared_until_closed():
+    client = get_http_client()
+    assert get_http_client() is client
+
+    close_http_client()
+    assert get_http_client() is not client
+    close_http_client()
@@ -0,0 +1,88 @@
+from datetime import datetime
+import json
+import fakeredis
+import pytest
+from unittest.mock import Mock
+from sqlalchemy import event
+from app.models.jobs import Job
+from app.repositories.job_repository import JobRepository
+from app.services.job_publisher import publish_job_stream
+from tests.helpers import make_job_detail
+
+def test_get_known_urls_confirms_bloom_hits_in_database():
+    redis = fakeredis.FakeRedis(decode_responses=True)
+    mock_db = Mock()
+    mock_db.query.return_value.yield_per.return_value = [("https://a",), ("https://b",)]
+    mock_db.query.return_value.filter.return_value.all.return_value = [("https://a",)]
+
+    known = JobRepository(mock_db, redis).get_known_urls(["https://a", "https://c"])
+
+    assert known == {"https://a"}
+    candidates = mock_db.query.return_value.filter.call_args.args[0].right.value
+    assert candidates == ["https://a"]
+
+def test_get_known_urls_skips_database_when_bloom_misses():
+    redis = fakeredis.FakeRedis(decode_responses=True)
+    mock_db = Mock()
+    mock_db.query.return_value.yield_per.return_value = []
+
+    assert JobRepository(mock_db, redis).get_known_urls(["https://new"]) == set()
+    mock_db.query.return_value.filter.assert_not_called()
+
+async def job_stream(jobs):
+    for job in jobs:
+        yield job
+
+@pytest.mark.asyncio
+async def test_save_job_stream_yields_only_new_jobs(sqlite_db):
+    # Inserted by another writer, e.g. the Lambda, while the stream runs
+    JobRepository(sqlite_db).save_jobs([make_job_detail(1)])
+    jobs = [make_job_detail(i) for i in range(3)]
+
+    saved = [job async for job in JobRepository(sqlite_db).save_job_stream(job_stream(jobs))]
+
+    assert [job.url for job in saved] == ["https://job/0", "https://job/2"]
+    assert all(job.id is not None for job in saved)
+    assert sqlite_db.query(Job).count() == 3
+
+@pytest.mark.asyncio
+async def test_publish_job_stream_publishes_each_job():
+    redis = Mock()
+    jobs = [Job(id=i, title=f"job {i}", url=f"https://job/{i}", created_at=datetime.now()) for i in range(2)]
+
+    published = await publish_job_stream(redis, job_stream(jobs))
+
+    assert published == 2
+    channel, message = redis.publish.call_args_list[1].args
+    assert channel == "new_job"
+    assert json.loads(message)["title"] == "job 1"
+
+def test_save_jobs_inserts_only_new_jobs_in_order(sqlite_db):
+    repo = JobRepository(sqlite_db)
+    repo.save_jobs([make_job_detail(i) for i in (2, 4)])
+
+    saved = repo.save_jobs([make_job_detail(i) for i in (5, 4, 3, 5, 2, 1)])
+
+    assert [job.url for job in saved] == ["https://job/5", "https://job/3", "https://job/1"]
+    assert all(job.id is not None for job in saved)
+    assert sqlite_db.query(Job).count() == 5
+
+def test_save_jobs_returns_none_when_nothing_is_new(sqlite_db):
+    repo = JobRepository(sqlite_db)
+    repo.save_jobs([make_job_detail(1)])
+
+    assert repo.save_jobs([make_job_detail(1)]) is None
+    assert repo.save_jobs([]) is None
+
+def test_save_jobs_uses_one_statement_per_batch(sqlite_db):
+    repo = JobRepository(sqlite_db)
+    repo.BULK_INSERT_BATCH_SIZE = 2
+    statements = []
+    event.listen(sqlite_db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    saved = repo.save_jobs([make_job_detail(i) for i in range(5)])
+
+    assert len(saved) == 5
+    inserts = [sql for sql in statements if sql.startswith("INSERT")]
+    assert len(inserts) == 3
+    assert all("ON CONFLICT (url) DO NOTHING RETURNING" in sql for sql in inserts)
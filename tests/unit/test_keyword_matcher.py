@@ -0,0 +1,40 @@
+from app.services.keyword_matcher import KeywordMatcher
+
+def naive_match(title: str, keywords) -> set:
+    return {keyword for keyword in keywords if keyword in title.lower()}
+
+def test_finds_every_keyword_in_one_pass():
+    keywords = ["he", "she", "his", "hers", "咖啡", "咖啡廳", "外送"]
+    matcher = KeywordMatcher(keywords)
+
+    for title in ["ushers", "SHE said", "咖啡廳兼職", "外送員 / 咖啡", "nothing"]:
+        assert matcher.match(title) == naive_match(title, keywords)
+
+def test_add_and_remove_update_matches():
+    matcher = KeywordMatcher(["咖啡"])
+    assert matcher.match("咖啡廳外場") == {"咖啡"}
+
+    matcher.add("外場")
+    matcher.add("啡廳")
+    assert matcher.match("咖啡廳外場") == {"咖啡", "啡廳", "外場"}
+
+    matcher.remove("咖啡")
+    assert matcher.match("咖啡廳外場") == {"啡廳", "外場"}
+    assert "咖啡" not in matcher and len(matcher) == 2
+
+    matcher.add("咖啡")
+    assert matcher.match("咖啡廳外場") == {"咖啡", "啡廳", "外場"}
+
+def test_load_replaces_keywords():
+    matcher = KeywordMatcher(["old"])
+    matcher.load(["new"])
+
+    assert matcher.loaded
+    assert matcher.match("old and new") == {"new"}
+
+def test_add_relinks_existing_nodes_to_the_new_suffix():
+    matcher = KeywordMatcher(["咖啡廳外場", "廳"])
+
+    matcher.add("啡廳")
+    matcher.add("啡廳外")
+    assert matcher.match("咖啡廳外送") == {"廳", "啡廳", "啡廳外"}
@@ -0,0 +1,167 @@
+import fakeredis
+import pytest
+from unittest.mock import Mock, patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import lambda_function
+from lambda_function import SCRAPE_CURSOR_KEY, get_job_model, scrape_within_budget
+from tests.helpers import paged_fake_get, sqlite_insert_ignoring_conflicts
+
+PAGES = {1: [9, 8, 7, 6], 2: [5, 4, 3]}
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(lambda_function, "insert_ignoring_conflicts", lambda rows: sqlite_insert_ignoring_conflicts(get_job_model(), rows))
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    get_job_model().metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+@pytest.fixture
+def redis_client():
+    client = lambda_function.RedisClient.__new__(lambda_function.RedisClient)
+    client.redis_client = fakeredis.FakeRedis(decode_responses=True)
+    return client
+
+def clock(calls_with_time: int):
+    state = {"calls": 0}
+
+    def time_left():
+        state["calls"] += 1
+        return 60000 if state["calls"] <= calls_with_time else 1000
+    return time_left
+
+def saved_titles(db):
+    Job = get_job_model()
+    return sorted(row[0] for row in db.query(Job.title).all())
+
+def test_walk_stops_at_margin_and_resumes_from_cursor(db, redis_client):
+    with patch.object(lambda_function, "http_get", side_effect=paged_fake_get(PAGES)):
+        # One listing check and one chunk fit in the first invocation
+        scraped, finished = scrape_within_budget(db, redis_client, clock(2), chunk_size=2)
+
+        assert (scraped, finished) == (2, False)
+        assert lambda_function.load_cursor(redis_client) == {
+            "page": 1,
+            "url": "https://www.chickpt.com.tw/cases/8",
+        }
+
+        scraped, finished = scrape_within_budget(db, redis_client, clock(100), chunk_size=2)
+
+    assert (scraped, finished) == (5, True)
+    assert not redis_client.exists(SCRAPE_CURSOR_KEY)
+    assert saved_titles(db) == sorted(f"job {i}" for i in range(3, 10))
+
+def test_cursor_survives_new_postings_shifting_the_listing(db, redis_client):
+    with patch.object(lambda_function, "http_get", side_effect=paged_fake_get({1: [9, 8, 7, 6], 2: [5]})):
+        scrape_within_budget(db, redis_client, clock(2), chunk_size=2)
+    shifted = {1: [11, 10, 9], 2: [8, 7, 6], 3: [5, 4], 4: [3]}
+
+    with patch.object(lambda_function, "http_get", side_effect=paged_fake_get(shifted)):
+        scraped, finished = scrape_within_budget(db, redis_client, clock(100), chunk_size=2)
+
+    # The cursor URL moved to page 2, so page 1 is rescanned without stopping at job 9
+    assert (scraped, finished) == (7, True)
+    assert saved_titles(db) == sorted(f"job {i}" for i in range(3, 12))
+
+def test_resumed_walk_stops_at_older_history_when_the_cursor_job_disappears(db, redis_client):
+    with patch.object(lambda_function, "http_get", side_effect=paged_fake_get({1: [20]})):
+        scrape_within_budget(db, redis_client, clock(100))
+    listing = {1: [28, 27, 26, 25], 2: [24, 23, 22, 21], 3: [20, 19, 18, 17]}
+    with patch.object(lambda_function, "http_get", side_effect=paged_fake_get(listing)):
+        scrape_within_budget(db, redis_client, clock(2), chunk_size=2)
+    assert lambda_function.load_cursor(redis_client)["url"] == "https://www.chickpt.com.tw/cases/27"
+
+    # Job 27 was taken down, so the cursor URL never shows up again
+    listing = {1: [28, 26, 25, 24], 2: [23, 22, 21, 20], 3: [19, 18, 17]}
+    with patch.object(lambda_function, "http_get", side_effect=paged_fake_get(listing)):
+        scraped, finished = scrape_within_budget(db, redis_client, clock(100), chunk_size=2)
+
+    assert (scraped, finished) == (6, True)
+    assert saved_titles(db) == sorted(f"job {i}" for i in range(20, 29))
+    assert not redis_client.redis_client.exists(lambda_function.SCRAPE_CURSOR_SAVED_KEY)
+
+def test_failed_save_keeps_the_cursor_for_the_next_walk(db, redis_client):
+    insert_jobs = lambda_function.insert_jobs
+    calls = {"count": 0}
+
+    def failing_second_chunk(*args):
+        calls["count"] += 1
+        if calls["count"] == 2:
+            raise Exception("database unavailable")
+        return insert_jobs(*args)
+
+    listing = {1: [9, 8, 7, 6], 2: [5, 4]}
+    with patch.object(lambda_function, "http_get", side_effect=paged_fake_get(listing)), \
+         patch.object(lambda_function, "insert_jobs", side_effect=failing_second_chunk):
+        scraped, finished = scrape_within_budget(db, redis_client, clock(100), chunk_size=2)
+
+    assert (scraped, finished) == (2, False)
+    assert lambda_function.load_cursor(redis_client) == {
+        "page": 1,
+        "url": "https://www.chickpt.com.tw/cases/8",
+    }
+
+    with patch.object(lambda_function, "http_get", side_effect=paged_fake_get(listing)):
+        scraped, finished = scrape_within_budget(db, redis_client, clock(100), chunk_size=2)
+
+    assert (scraped, finished) == (4, True)
+    assert saved_titles(db) == sorted(f"job {i}" for i in range(4, 10))
+
+def test_unchanged_listing_skips_the_walk(db, redis_client):
+    listing = {1: [9, 8, 7], 2: [6]}
+    with patch.object(lambda_function, "http_get", side_effect=paged_fake_get(listing)) as http_get:
+        assert scrape_within_budget(db, redis_client, clock(100), chunk_size=2) == (4, True)
+        http_get.reset_mock()
+        assert scrape_within_budget(db, redis_client, clock(100), chunk_size=2) == (0, True)
+
+    assert [call.args[0] for call in http_get.call_args_list] == [lambda_function.CHICKPT_CASES_URL]
+    stats = redis_client.redis_client.hgetall(lambda_function.LISTING_STATS_KEY)
+    assert stats["misses"] == "1" and stats["fingerprint_hits"] == "1"
+
+def test_requests_to_one_host_wait_for_the_token_bucket():
+    now = {"value": 0.0}
+    waits = []
+
+    def sleep(seconds):
+        waits.append(seconds)
+        now["value"] += seconds
+
+    with patch.object(lambda_function.time, "monotonic", side_effect=lambda: now["value"]), \
+            patch.object(lambda_function.time, "sleep", side_effect=sleep), \
+            patch.object(lambda_function, "SCRAPER_RATE_PER_SEC", 2.0), \
+            patch.object(lambda_function, "SCRAPER_RATE_BURST", 2), \
+            patch.dict(lambda_function.host_buckets, clear=True), \
+            patch.object(lambda_function, "get_http_session") as get_http_session:
+        for case in range(3):
+            lambda_function.http_get(f"https://www.chickpt.com.tw/cases/{case}")
+        lambda_function.http_get("https://example.com/")
+
+    assert waits == [0.5]
+    assert get_http_session.return_value.get.call_count == 4
+
+def test_breaker_pauses_a_failing_host_across_invocations():
+    now = {"value": 0.0}
+    session = Mock()
+    session.get.return_value = Mock(status_code=503)
+    url = "https://www.chickpt.com.tw/cases"
+
+    with patch.object(lambda_function.time, "monotonic", side_effect=lambda: now["value"]), \
+            patch.object(lambda_function, "SCRAPER_BREAKER_THRESHOLD", 2), \
+            patch.object(lambda_function, "SCRAPER_BREAKER_RESET", 60), \
+            patch.dict(lambda_function.host_buckets, clear=True), \
+            patch.dict(lambda_function.host_breakers, clear=True), \
+            patch.object(lambda_function, "get_http_session", return_value=session):
+        lambda_function.http_get(url)
+        lambda_function.http_get(url)
+        # The next scheduled invocation reuses the module and stays paused
+        with pytest.raises(lambda_function.CircuitOpenError):
+            lambda_function.http_get(url)
+        assert session.get.call_count == 2
+
+        now["value"] = 61
+        session.get.return_value = Mock(status_code=200)
+        assert lambda_function.http_get(url).status_code == 200
+        assert lambda_function.host_breaker(url).opened_at is None
@@ -0,0 +1,82 @@
+import fakeredis
+import pytest
+from unittest.mock import Mock, patch
+from app.services.listing_cache_service import ListingCacheService
+from app.services.scraper_service import scrape_chickpt, find_job_list, parse_job_items, CHICKPT_CASES_URL
+from app.services.scrapers.chickpt import ChickptSource
+from tests.helpers import detail_page, listing_page, paged_fake_get, read_fixture
+
+@pytest.fixture
+def listing_cache():
+    return ListingCacheService(fakeredis.FakeRedis(decode_responses=True))
+
+def make_response(text: str, status_code: int = 200, headers: dict = None) -> Mock:
+    response = Mock()
+    response.status_code = status_code
+    response.text = text
+    response.content = text.encode("utf-8")
+    response.headers = headers or {}
+    response.raise_for_status.return_value = None
+    return response
+
+def fake_get(url, **kwargs):
+    if url == CHICKPT_CASES_URL:
+        return make_response(listing_page(2), headers={"ETag": '"v1"'})
+    return make_response(detail_page(int(url.rsplit("/", 1)[1])))
+
+@pytest.mark.asyncio
+async def test_unchanged_listing_skips_detail_fetching(listing_cache):
+    with patch('app.services.scraper_service.get_http_client') as mock_client:
+        mock_client.return_value.get.side_effect = fake_get
+        first = await scrape_chickpt(limit=None, listing_cache=listing_cache)
+        second = await scrape_chickpt(limit=None, listing_cache=listing_cache)
+
+    assert len(first) == 2
+    assert second == []
+    assert mock_client.return_value.get.call_count == 4
+    _, kwargs = mock_client.return_value.get.call_args_list[-1]
+    assert kwargs["headers"] == {"If-None-Match": '"v1"'}
+
+    stats = listing_cache.get_stats()
+    assert stats["misses"] == 1
+    assert stats["fingerprint_hits"] == 1
+
+@pytest.mark.asyncio
+async def test_not_modified_response_counts_saved_bytes(listing_cache):
+    listing_cache.store(CHICKPT_CASES_URL, {"ETag": '"v1"'}, "abc", 1234)
+
+    with patch('app.services.scraper_service.get_http_client') as mock_client:
+        mock_client.return_value.get.return_value = make_response("", status_code=304)
+        jobs = await scrape_chickpt(limit=None, listing_cache=listing_cache)
+
+    assert jobs == []
+    stats = listing_cache.get_stats()
+    assert stats["not_modified_hits"] == 1
+    assert stats["bytes_saved"] == 1234
+
+@pytest.mark.asyncio
+async def test_chickpt_source_uses_the_listing_cache():
+    redis = fakeredis.FakeRedis(decode_responses=True)
+    source = ChickptSource()
+    fake_get = paged_fake_get({1: [9, 8]})
+
+    with patch('app.services.scraper_service.get_http_client') as mock_client:
+        mock_client.return_value.get.side_effect = fake_get
+        first = [job async for job in source.stream(lambda urls: set(), redis)]
+        second = [job async for job in source.stream(lambda urls: set(), redis)]
+
+    assert len(first) == 2
+    assert second == []
+    stats = ListingCacheService(redis).get_stats()
+    assert stats["misses"] == 1
+    assert stats["fingerprint_hits"] == 1
+
+def test_api_and_lambda_share_a_fingerprint_that_ignores_post_times():
+    import lambda_function
+
+    html = read_fixture("cases.html")
+    aged = html.replace("剛剛", "3 分鐘前").replace("5 分鐘前", "8 分鐘前")
+
+    fingerprint = ListingCacheService.fingerprint(parse_job_items(find_job_list(html)))
+    assert ListingCacheService.fingerprint(parse_job_items(find_job_list(aged))) == fingerprint
+    assert lambda_function.ListingCache.fingerprint(lambda_function.parse_job_list(aged)) == fingerprint
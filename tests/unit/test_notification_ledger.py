@@ -0,0 +1,139 @@
+import fakeredis
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from app.services.notification_ledger import SENT_KEY, NotificationLedger
+from app.services.notification_service import NotificationService
+from app.services.subscription_index import SubscriptionIndex
+
+@pytest.fixture
+def mock_db():
+    db = AsyncMock()
+    db.add = Mock()
+    db.execute.return_value = Mock()
+    return db
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+def inserted_rows(mock_db) -> list:
+    return [row for call in mock_db.execute.await_args_list if len(call.args) > 1 for row in call.args[1]]
+
+@pytest.mark.asyncio
+async def test_flushes_at_batch_size(mock_db):
+    ledger = NotificationLedger(mock_db, batch_size=3, flush_interval=60)
+
+    for user_id in range(7):
+        await ledger.record(user_id, 1)
+
+    assert mock_db.execute.await_count == 2
+    assert mock_db.commit.await_count == 2
+    assert len(ledger.pending) == 1
+
+    await ledger.flush()
+    assert [row["user_id"] for row in inserted_rows(mock_db)] == list(range(7))
+
+@pytest.mark.asyncio
+async def test_flushes_after_interval(mock_db):
+    ledger = NotificationLedger(mock_db, batch_size=100, flush_interval=2)
+
+    with patch('app.services.notification_ledger.time.monotonic', side_effect=[1.0, 2.0, 10.0, 10.0]):
+        ledger.flushed_at = 0.0
+        await ledger.record(1, 1)
+        mock_db.execute.assert_not_awaited()
+        await ledger.record(2, 1)
+
+    assert inserted_rows(mock_db) == [{"user_id": 1, "job_id": 1}, {"user_id": 2, "job_id": 1}]
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_records(mock_db):
+    ledger = NotificationLedger(mock_db, batch_size=100, flush_interval=60)
+    await ledger.record(1, 1)
+    mock_db.commit.side_effect = [Exception("db down"), None]
+
+    with pytest.raises(Exception):
+        await ledger.flush()
+    mock_db.rollback.assert_awaited_once()
+    assert ledger.pending == [{"user_id": 1, "job_id": 1}]
+
+    await ledger.flush()
+    assert ledger.pending == []
+
+def test_claim_is_granted_once_per_user_and_job(mock_db, redis):
+    ledger = NotificationLedger(mock_db, redis)
+    other_consumer = NotificationLedger(mock_db, redis)
+
+    assert ledger.claim(1, 7)
+    assert not other_consumer.claim(1, 7)
+    assert other_consumer.claim(2, 7)
+    assert ledger.claim(1, 8)
+    assert redis.ttl(SENT_KEY.format(job_id=7)) > 0
+
+    ledger.release(1, 7)
+    assert other_consumer.claim(1, 7)
+
+def test_claim_allows_sends_when_redis_is_down(mock_db):
+    redis = Mock()
+    redis.pipeline.return_value.execute.side_effect = ConnectionError("redis down")
+
+    assert NotificationLedger(mock_db, redis).claim(1, 7)
+
+def make_service(mock_db, redis, user_ids):
+    index = SubscriptionIndex()
+    index.loaded = True
+    for user_id in user_ids:
+        index.apply({"action": "subscribe", "keyword": "咖啡", "user_id": user_id})
+    mock_db.execute.return_value.scalars.return_value.first.return_value = Mock(id=7)
+    mock_db.execute.return_value.all.return_value = [
+        (user_id, "Discord", None, f"d{user_id}", None) for user_id in user_ids
+    ]
+    with patch('app.services.notification_service.get_subscription_index', return_value=index):
+        service = NotificationService(mock_db, redis)
+    service.get_subscription_index = AsyncMock(return_value=index)
+    service.strategies["Discord"] = AsyncMock()
+    return service
+
+@pytest.mark.asyncio
+async def test_redelivered_job_is_not_sent_twice(mock_db, redis):
+    service = make_service(mock_db, redis, [1, 2])
+    await service.process_job({"title": "咖啡廳", "url": "https://a"})
+
+    # Redelivery to another consumer after user 3 subscribed
+    replay = make_service(mock_db, redis, [1, 2, 3])
+    await replay.process_job({"title": "咖啡廳", "url": "https://a"})
+
+    assert service.strategies["Discord"].send.await_count == 2
+    assert [call.args[0].user_id for call in replay.strategies["Discord"].send.await_args_list] == [3]
+    assert sorted(row["user_id"] for row in inserted_rows(mock_db)) == [1, 2, 3]
+
+@pytest.mark.asyncio
+async def test_failed_send_can_be_retried(mock_db, redis):
+    service = make_service(mock_db, redis, [1, 2])
+    service.strategies["Discord"].send.side_effect = [None, Exception("discord down"), None]
+
+    await service.process_job({"title": "咖啡廳", "url": "https://a"})
+    await service.process_job({"title": "咖啡廳", "url": "https://a"})
+
+    assert [call.args[0].user_id for call in service.strategies["Discord"].send.await_args_list] == [1, 2, 2]
+    assert redis.smembers(SENT_KEY.format(job_id=7)) == {"1", "2"}
+
+@pytest.mark.asyncio
+async def test_process_job_records_sends_before_a_failure(mock_db):
+    index = SubscriptionIndex()
+    index.loaded = True
+    for user_id in (1, 2, 3):
+        index.apply({"action": "subscribe", "keyword": "咖啡", "user_id": user_id})
+    mock_db.execute.return_value.scalars.return_value.first.return_value = Mock(id=7)
+    mock_db.execute.return_value.all.return_value = [
+        (user_id, "Discord", None, f"d{user_id}", None) for user_id in (1, 2, 3)
+    ]
+
+    with patch('app.services.notification_service.get_subscription_index', return_value=index):
+        service = NotificationService(mock_db, Mock())
+        service.strategies["Discord"] = AsyncMock()
+        service.strategies["Discord"].send.side_effect = [None, None, Exception("discord down")]
+        await service.process_job({"title": "咖啡廳", "url": "https://a"})
+
+    mock_db.add.assert_not_called()
+    assert mock_db.commit.await_count == 1
+    assert inserted_rows(mock_db) == [{"user_id": 1, "job_id": 7}, {"user_id": 2, "job_id": 7}]
@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from datetime import datetime
+from app.services.scrape_runner import stream_sources
+from app.services.scraper_service import JobDetail
+from app.services.scrapers.base import ScraperSource
+from app.services.scrapers.chickpt import ChickptSource
+from app.services.scrapers.registry import get_sources
+
+def job(url):
+    return JobDetail(
+        title=url,
+        employer="employer",
+        location="location",
+        salary="salary",
+        content=None,
+        url=url,
+        job_time=None,
+        created_at=datetime.now(),
+    )
+
+class FakeSource(ScraperSource):
+    def __init__(self, name, urls, delay=0, error=None, time_budget=None):
+        self.name = name
+        self.urls = urls
+        self.delay = delay
+        self.error = error
+        self.time_budget = time_budget
+
+    async def stream(self, is_known, redis=None):
+        known = is_known(self.urls)
+        for url in self.urls:
+            await asyncio.sleep(self.delay)
+            if url not in known:
+                yield job(url)
+        if self.error:
+            raise self.error
+
+async def collect(stream):
+    return [job async for job in stream]
+
+@pytest.mark.asyncio
+async def test_sources_run_concurrently_and_merge():
+    sources = [
+        FakeSource("slow", ["https://a/1", "https://a/2"], delay=0.05),
+        FakeSource("fast", ["https://b/1", "https://b/2"]),
+    ]
+
+    jobs = await collect(stream_sources(sources, lambda urls: {"https://a/2"}))
+
+    assert [(j.source, j.url) for j in jobs] == [
+        ("fast", "https://b/1"),
+        ("fast", "https://b/2"),
+        ("slow", "https://a/1"),
+    ]
+
+@pytest.mark.asyncio
+async def test_duplicate_urls_are_yielded_once():
+    sources = [
+        FakeSource("first", ["https://x/1", "https://x/1", "https://x/2"]),
+        FakeSource("second", ["https://x/2", "https://x/3"], delay=0.01),
+    ]
+
+    jobs = await collect(stream_sources(sources, lambda urls: set()))
+
+    assert [(j.source, j.url) for j in jobs] == [
+        ("first", "https://x/1"),
+        ("first", "https://x/2"),
+        ("second", "https://x/3"),
+    ]
+
+@pytest.mark.asyncio
+async def test_source_is_cut_off_at_its_time_budget():
+    sources = [
+        FakeSource("hung", ["https://h/1", "https://h/2"], delay=0.2, time_budget=0.3),
+        FakeSource("ok", ["https://o/1"]),
+    ]
+
+    jobs = await collect(stream_sources(sources, lambda urls: set(), time_budget=5))
+
+    assert [j.url for j in jobs] == ["https://o/1", "https://h/1"]
+
+@pytest.mark.asyncio
+async def test_failing_source_keeps_what_it_already_yielded():
+    sources = [
+        FakeSource("broken", ["https://b/1"], error=RuntimeError("site changed")),
+        FakeSource("ok", ["https://o/1"]),
+    ]
+
+    jobs = await collect(stream_sources(sources, lambda urls: set()))
+
+    assert sorted(j.url for j in jobs) == ["https://b/1", "https://o/1"]
+
+def test_get_sources_skips_unknown_names():
+    sources = get_sources(["chickpt", "missing"])
+
+    assert len(sources) == 1
+    assert isinstance(sources[0], ChickptSource)
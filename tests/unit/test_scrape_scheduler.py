@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch
+from app.services.scrape_scheduler import AdaptivePollingPolicy, ScrapeScheduler
+
+@pytest.fixture
+def policy():
+    return AdaptivePollingPolicy(
+        min_interval=30,
+        max_interval=600,
+        active_max_interval=120,
+        active_hours=(8, 23),
+        backoff_factor=2,
+    )
+
+ACTIVE = datetime(2025, 1, 10, 14, 0)
+QUIET = datetime(2025, 1, 10, 3, 0)
+
+def test_interval_resets_when_new_jobs_appear(policy):
+    policy.record(0)
+    policy.record(0)
+    assert policy.next_interval(ACTIVE) == 120
+
+    policy.record(3)
+    assert policy.next_interval(ACTIVE) == 30
+
+def test_empty_ticks_back_off_to_quiet_hours_cap(policy):
+    for _ in range(10):
+        policy.record(0)
+
+    assert policy.next_interval(ACTIVE) == 120
+    assert policy.next_interval(QUIET) == 600
+
+def test_active_hours_can_wrap_midnight():
+    policy = AdaptivePollingPolicy(active_hours=(20, 2))
+
+    assert policy.is_active(datetime(2025, 1, 10, 23, 0))
+    assert policy.is_active(datetime(2025, 1, 10, 1, 0))
+    assert not policy.is_active(datetime(2025, 1, 10, 12, 0))
+
+@pytest.mark.asyncio
+async def test_run_tick_reschedules_from_policy(policy):
+    scrape_scheduler = ScrapeScheduler(Mock(), Mock(), policy)
+    scrape_scheduler.tick = AsyncMock(return_value=0)
+
+    with patch.object(scrape_scheduler, "schedule") as schedule, \
+         patch("app.services.scrape_scheduler.datetime") as mock_datetime:
+        mock_datetime.now.return_value = QUIET
+        await scrape_scheduler.run_tick()
+
+    schedule.assert_called_once_with(60)
+
+@pytest.mark.asyncio
+async def test_failed_tick_counts_as_empty(policy):
+    scrape_scheduler = ScrapeScheduler(Mock(), Mock(), policy)
+    scrape_scheduler.tick = AsyncMock(side_effect=RuntimeError("site down"))
+
+    with patch.object(scrape_scheduler, "schedule"):
+        await scrape_scheduler.run_tick()
+
+    assert policy.empty_ticks == 1
+
+@pytest.mark.asyncio
+async def test_late_tick_still_runs_and_reschedules(policy):
+    scrape_scheduler = ScrapeScheduler(Mock(), Mock(), policy)
+    scrape_scheduler.tick = AsyncMock(return_value=0)
+    scrape_scheduler.scheduler.start()
+    try:
+        # A busy event loop makes the one-shot job fire well past its run date
+        scrape_scheduler.schedule(-30)
+        await asyncio.sleep(0.2)
+
+        scrape_scheduler.tick.assert_awaited_once()
+        assert scrape_scheduler.scheduler.get_job(ScrapeScheduler.JOB_ID) is not None
+    finally:
+        scrape_scheduler.shutdown()
+
+@pytest.mark.asyncio
+async def test_known_url_checks_use_their_own_session(policy):
+    sessions = [Mock(name="save"), Mock(name="lookup")]
+    scrape_scheduler = ScrapeScheduler(Mock(side_effect=sessions), Mock(), policy)
+    repos = []
+
+    def make_repo(db, redis):
+        repo = Mock(db=db)
+        repo.save_job_stream.side_effect = lambda jobs, executor: jobs
+        repos.append(repo)
+        return repo
+
+    async def sources(is_known):
+        is_known(["https://a"])
+        yield Mock(url="https://a")
+
+    with patch("app.services.scrape_scheduler.JobRepository", side_effect=make_repo), \
+         patch("app.services.scrape_scheduler.stream_sources", side_effect=lambda _, is_known, redis: sources(is_known)), \
+         patch("app.services.job_publisher.publish_new_job"):
+        assert await scrape_scheduler.tick() == 1
+
+    save_repo, lookup_repo = repos
+    assert save_repo.db is sessions[0] and lookup_repo.db is sessions[1]
+    lookup_repo.get_known_urls.assert_called_once_with(["https://a"])
+    save_repo.get_known_urls.assert_not_called()
+    assert all(session.close.called for session in sessions)
+
+@pytest.mark.asyncio
+async def test_saves_and_publishes_run_on_one_thread_off_the_loop(policy):
+    db = Mock()
+    scrape_scheduler = ScrapeScheduler(Mock(side_effect=[db, Mock()]), Mock(), policy)
+    threads = set()
+
+    def save_job(job):
+        threads.add(threading.get_ident())
+        return Mock(url=job.url)
+
+    async def sources(is_known):
+        for i in range(3):
+            yield Mock(url=f"https://job/{i}")
+
+    with patch("app.repositories.job_repository.JobRepository.save_job", side_effect=save_job), \
+         patch("app.services.scrape_scheduler.stream_sources", side_effect=lambda _, is_known, redis: sources(is_known)), \
+         patch("app.services.job_publisher.publish_new_job", side_effect=lambda redis, job: threads.add(threading.get_ident())):
+        assert await scrape_scheduler.tick() == 3
+
+    assert len(threads) == 1
+    assert threading.get_ident() not in threads
+    db.close.assert_called_once()
@@ -0,0 +1,26 @@
+import pytest
+from app.services.scraper_service import parse_job_list, parse_job_detail
+from tests.helpers import DETAIL_FIXTURES, read_fixture
+
+def test_fast_listing_parse_matches_html_parser():
+    html = read_fixture("cases.html")
+
+    fast_items = parse_job_list(html, fast=True)
+    slow_items = parse_job_list(html, fast=False)
+
+    assert len(slow_items) == 20
+    assert fast_items == slow_items
+
+@pytest.mark.parametrize("name", DETAIL_FIXTURES)
+def test_fast_detail_parse_matches_html_parser(name):
+    html = read_fixture(name)
+
+    assert parse_job_detail(html, fast=True) == parse_job_detail(html, fast=False)
+
+def test_detail_parse_output():
+    content, job_time = parse_job_detail(read_fixture("job_201500.html"), fast=True)
+
+    assert content.splitlines()[0] == "工作內容: 協助門市活動佈置與引導來賓"
+    assert "此筆不屬於條列內容" not in content
+    assert job_time == "2025/01/18~2025/01/19"
+    assert parse_job_detail(read_fixture("job_201494.html"), fast=True)[1] is None
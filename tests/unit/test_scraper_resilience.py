@@ -0,0 +1,115 @@
+import time
+import fakeredis
+import pytest
+import requests
+from unittest.mock import Mock, patch
+from app.services.http_client import ScraperHttpClient
+from app.services.retry_queue_service import RetryQueueService
+from app.services.scraper_resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    HostGuard,
+    ScrapeError,
+    TokenBucket,
+)
+from app.services.scraper_service import scrape_chickpt, stream_retry_queue
+from tests.helpers import detail_page, listing_page
+
+def make_response(status_code: int, text: str = "", headers: dict = None) -> Mock:
+    response = Mock()
+    response.status_code = status_code
+    response.text = text
+    response.headers = headers or {}
+    response.raise_for_status.return_value = None
+    return response
+
+def make_client(responses, **kwargs) -> ScraperHttpClient:
+    client = ScraperHttpClient(
+        max_retries=kwargs.pop("max_retries", 2),
+        backoff_base=0,
+        backoff_max=0,
+        guard=kwargs.pop("guard", HostGuard(rate=1000, burst=1000, failure_threshold=10, reset_timeout=60)),
+    )
+    client.session = Mock()
+    client.session.get.side_effect = responses
+    return client
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+
+    assert time.monotonic() - start >= 0.09
+
+def test_circuit_breaker_opens_then_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    breaker.before_request("host")
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request("host")
+
+    time.sleep(0.06)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_client_retries_retryable_statuses():
+    client = make_client([make_response(503), requests.ConnectionError("reset"), make_response(200, "ok")])
+
+    assert client.get("https://www.chickpt.com.tw/cases").text == "ok"
+    assert client.session.get.call_count == 3
+
+def test_client_gives_up_and_does_not_retry_not_found():
+    client = make_client([make_response(429)] * 3)
+    with pytest.raises(ScrapeError):
+        client.get("https://www.chickpt.com.tw/cases")
+
+    client = make_client([make_response(404)])
+    assert client.get("https://www.chickpt.com.tw/cases").status_code == 404
+    assert client.session.get.call_count == 1
+
+def test_client_stops_while_circuit_is_open():
+    guard = HostGuard(rate=1000, burst=1000, failure_threshold=2, reset_timeout=60)
+    client = make_client([make_response(500)] * 5, guard=guard, max_retries=4)
+
+    with pytest.raises(CircuitOpenError):
+        client.get("https://www.chickpt.com.tw/cases")
+    assert client.session.get.call_count == 2
+
+@pytest.mark.asyncio
+async def test_failed_detail_is_queued_not_returned():
+    retry_queue = RetryQueueService(fakeredis.FakeRedis(decode_responses=True), delay=0)
+
+    def fake_get(url, **kwargs):
+        if url.endswith("/cases"):
+            return make_response(200, listing_page(3))
+        if url.endswith("/1"):
+            raise ScrapeError("HTTP 503")
+        return make_response(200, detail_page(int(url.rsplit("/", 1)[1])))
+
+    with patch('app.services.scraper_service.get_http_client') as mock_client:
+        mock_client.return_value.get.side_effect = fake_get
+        jobs = await scrape_chickpt(limit=None, retry_queue=retry_queue)
+
+        assert [job.title for job in jobs] == ["job 0", "job 2"]
+        assert [item["url"] for item in retry_queue.due()] == ["https://www.chickpt.com.tw/cases/1"]
+
+        mock_client.return_value.get.side_effect = lambda url, **kwargs: make_response(200, detail_page(1))
+        retried = [job async for job in stream_retry_queue(retry_queue)]
+
+    assert [job.title for job in retried] == ["job 1"]
+    assert retry_queue.size() == 0
+
+def test_retry_queue_drops_after_max_attempts():
+    retry_queue = RetryQueueService(fakeredis.FakeRedis(decode_responses=True), delay=0, max_attempts=2)
+    item = {"url": "https://a", "title": "a"}
+
+    retry_queue.push(item)
+    retry_queue.push(retry_queue.due()[0])
+    assert retry_queue.due()[0]["attempts"] == 2
+
+    retry_queue.push(retry_queue.due()[0])
+    assert retry_queue.size() == 0
@@ -0,0 +1,151 @@
+import asyncio
+import threading
+import time
+import fakeredis
+import pytest
+from unittest.mock import Mock, patch
+from app.services.retry_queue_service import RETRY_QUEUE_KEY
+from app.services.scrape_cursor_service import SCRAPE_CURSOR_KEY, ScrapeCursorService
+from app.services.scrapers.chickpt import ChickptSource
+from app.services.scraper_service import scrape_chickpt, scrape_new_chickpt, stream_chickpt, parse_job_list
+from tests.helpers import detail_page, listing_page, paged_fake_get
+
+def fake_get_factory(count: int, delay_for=lambda index: 0):
+    lock = threading.Lock()
+    state = {"in_flight": 0, "max_in_flight": 0}
+
+    def fake_get(url, **kwargs):
+        response = Mock()
+        response.raise_for_status.return_value = None
+        if url.endswith("/cases"):
+            response.text = listing_page(count)
+            return response
+
+        index = int(url.rsplit("/", 1)[1])
+        with lock:
+            state["in_flight"] += 1
+            state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        time.sleep(delay_for(index))
+        with lock:
+            state["in_flight"] -= 1
+        response.text = detail_page(index)
+        return response
+
+    return fake_get, state
+
+def test_parse_job_list_respects_limit():
+    items = parse_job_list(listing_page(5), limit=3)
+    assert [item["title"] for item in items] == ["job 0", "job 1", "job 2"]
+    assert parse_job_list(listing_page(5), limit=None)[-1]["url"].endswith("/cases/4")
+
+@pytest.mark.asyncio
+async def test_scrape_chickpt_keeps_listing_order():
+    fake_get, _ = fake_get_factory(6, delay_for=lambda index: 0.05 * (6 - index))
+
+    with patch('app.services.scraper_service.get_http_client') as mock_client:
+        mock_client.return_value.get.side_effect = fake_get
+        jobs = await scrape_chickpt(limit=None, max_concurrency=6)
+
+    assert [job.title for job in jobs] == [f"job {i}" for i in range(6)]
+    assert jobs[2].content == "內容: job 2"
+    assert jobs[2].job_time == "2025/01/12"
+
+@pytest.mark.asyncio
+async def test_scrape_chickpt_bounds_in_flight_requests():
+    fake_get, state = fake_get_factory(8, delay_for=lambda index: 0.02)
+
+    with patch('app.services.scraper_service.get_http_client') as mock_client:
+        mock_client.return_value.get.side_effect = fake_get
+        jobs = await scrape_chickpt(limit=None, max_concurrency=3)
+
+    assert len(jobs) == 8
+    assert 1 < state["max_in_flight"] <= 3
+
+@pytest.mark.asyncio
+async def test_scrape_new_chickpt_stops_at_first_known_url():
+    fake_get = paged_fake_get({1: [9, 8, 7], 2: [6, 5, 4]})
+    known = {"https://www.chickpt.com.tw/cases/5", "https://www.chickpt.com.tw/cases/4"}
+
+    with patch('app.services.scraper_service.get_http_client') as mock_client:
+        mock_client.return_value.get.side_effect = fake_get
+        jobs = await scrape_new_chickpt(lambda urls: known & set(urls), max_pages=5)
+
+    assert [job.title for job in jobs] == ["job 9", "job 8", "job 7", "job 6"]
+    requested = [call.args[0] for call in mock_client.return_value.get.call_args_list]
+    assert not any("/cases/5" in url or "/cases/4" in url for url in requested)
+
+@pytest.mark.asyncio
+async def test_scrape_new_chickpt_fetches_nothing_when_head_is_known():
+    fake_get = paged_fake_get({1: [3, 2, 1]})
+
+    with patch('app.services.scraper_service.get_http_client') as mock_client:
+        mock_client.return_value.get.side_effect = fake_get
+        jobs = await scrape_new_chickpt(lambda urls: set(urls), max_pages=5)
+
+    assert jobs == []
+    assert mock_client.return_value.get.call_count == 1
+
+@pytest.mark.asyncio
+async def test_stream_chickpt_yields_jobs_as_they_finish():
+    fake_get = paged_fake_get({1: [9, 8, 7], 2: [6, 5]})
+    slow_get = lambda url, **kwargs: (time.sleep(0.1 if url.endswith("/9") else 0), fake_get(url))[1]
+
+    with patch('app.services.scraper_service.get_http_client') as mock_client:
+        mock_client.return_value.get.side_effect = slow_get
+        stream = stream_chickpt(lambda urls: {url for url in urls if url.endswith("/5")}, max_concurrency=4)
+        titles = [job.title async for job in stream]
+
+    assert sorted(titles) == ["job 6", "job 7", "job 8", "job 9"]
+    assert titles[-1] == "job 9"
+
+def saved_jobs_source(saved: dict, redis):
+    async def scrape():
+        async for job in ChickptSource().stream(lambda urls: set(saved) & set(urls), redis):
+            saved[job.url] = job.title
+    return scrape
+
+@pytest.mark.asyncio
+async def test_stream_chickpt_defers_jobs_cut_off_by_the_budget():
+    redis = fakeredis.FakeRedis(decode_responses=True)
+    fake_get = paged_fake_get({1: [5, 4, 3, 2, 1]})
+    slow_get = lambda url, **kwargs: (time.sleep(0.5 if url.endswith("/4") else 0), fake_get(url))[1]
+    saved = {}
+
+    with patch('app.services.scraper_service.get_http_client') as mock_client:
+        mock_client.return_value.get.side_effect = slow_get
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(saved_jobs_source(saved, redis)(), 0.2)
+        assert sorted(saved.values()) == ["job 1", "job 2", "job 3", "job 5"]
+
+        mock_client.return_value.get.side_effect = fake_get
+        await saved_jobs_source(saved, redis)()
+
+    assert sorted(saved.values()) == [f"job {i}" for i in range(1, 6)]
+    assert redis.zcard(RETRY_QUEUE_KEY) == 0
+    assert not redis.exists(SCRAPE_CURSOR_KEY)
+
+@pytest.mark.asyncio
+async def test_stream_chickpt_resumes_past_the_page_limit():
+    redis = fakeredis.FakeRedis(decode_responses=True)
+    listing = {1: [9, 8], 2: [7, 6], 3: [5, 4], 4: [3]}
+    saved = {"https://www.chickpt.com.tw/cases/3": "job 3"}
+
+    async def scrape():
+        stream = stream_chickpt(lambda urls: set(saved) & set(urls), max_pages=2, scrape_cursor=ScrapeCursorService(redis))
+        async for job in stream:
+            saved[job.url] = job.title
+
+    with patch('app.services.scraper_service.get_http_client') as mock_client:
+        mock_client.return_value.get.side_effect = paged_fake_get(listing)
+        await scrape()
+        assert sorted(saved.values()) == ["job 3", "job 6", "job 7", "job 8", "job 9"]
+
+        # Each resumed walk gets its own page limit counted from the cursor
+        await scrape()
+        assert sorted(saved.values()) == [f"job {i}" for i in range(3, 10)]
+        assert ScrapeCursorService(redis).load()["page"] == 3
+
+        await scrape()
+
+    assert len(saved) == 7
+    assert not redis.exists(SCRAPE_CURSOR_KEY)
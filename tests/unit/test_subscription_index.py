@@ -0,0 +1,179 @@
+import asyncio
+import json
+import fakeredis
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from app.dependencies.redis import listen
+from app.services.notification_service import NotificationService
+from app.services.subscription_index import (
+    SUBSCRIPTION_CHANGES_CHANNEL,
+    SubscriptionIndex,
+    publish_subscription_change,
+)
+from app.services.subscription_service import SubscriptionService
+from app.services.user_service import UserService
+
+@pytest.fixture
+def index():
+    index = SubscriptionIndex()
+    with patch('app.services.subscription_index.get_subscription_index', return_value=index), \
+         patch('app.services.notification_service.get_subscription_index', return_value=index):
+        yield index
+
+@pytest.fixture
+def mock_db():
+    db = AsyncMock()
+    db.add = Mock()
+    db.execute.return_value = Mock()
+    return db
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+def test_events_update_subscribers_and_matcher():
+    index = SubscriptionIndex()
+
+    index.apply({"action": "subscribe", "keyword": "咖啡", "user_id": 1})
+    index.apply({"action": "subscribe", "keyword": "咖啡", "user_id": 2})
+    index.apply({"action": "subscribe", "keyword": "外送", "user_id": 1})
+    assert index.match("咖啡外送") == {"咖啡", "外送"}
+    assert index.get_subscribers("咖啡") == {1, 2}
+
+    index.apply({"action": "unsubscribe", "keyword": "咖啡", "user_id": 2})
+    index.apply({"action": "delete_user", "user_id": 1})
+    assert index.match("咖啡外送") == set()
+    assert index.subscribers == {} and index.user_keywords == {}
+
+@pytest.mark.asyncio
+async def test_load_replays_changes_seen_during_the_query(mock_db):
+    index = SubscriptionIndex()
+
+    async def execute(*args):
+        # Committed after the snapshot was taken, but published while it is read
+        index.apply({"action": "subscribe", "keyword": "外送", "user_id": 3})
+        index.apply({"action": "unsubscribe", "keyword": "咖啡", "user_id": 2})
+        result = Mock()
+        result.all.return_value = [("咖啡", 1), ("咖啡", 2)]
+        return result
+
+    mock_db.execute.side_effect = execute
+    await index.load(mock_db)
+
+    assert index.loaded
+    assert index.get_subscribers("咖啡") == {1}
+    assert index.get_subscribers("外送") == {3}
+    assert index.match("咖啡外送") == {"咖啡", "外送"}
+
+def test_publish_applies_locally_and_notifies_other_processes(index, redis):
+    pubsub = redis.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(SUBSCRIPTION_CHANGES_CHANNEL)
+
+    publish_subscription_change(redis, "subscribe", 1, "咖啡")
+
+    assert index.get_subscribers("咖啡") == {1}
+    messages = [pubsub.get_message(timeout=0.1) for _ in range(2)]
+    events = [json.loads(message["data"]) for message in messages if message]
+    assert events == [{"action": "subscribe", "user_id": 1, "keyword": "咖啡"}]
+
+    other = SubscriptionIndex()
+    other.apply(events[0])
+    assert other.get_subscribers("咖啡") == {1}
+
+class StopListening(BaseException):
+    pass
+
+def test_listener_resyncs_before_handling_each_subscription():
+    calls = []
+    subscriptions = [
+        [{"type": "subscribe"}, {"type": "message", "data": '{"n": 1}'}, ConnectionError("lost")],
+        [{"type": "subscribe"}, {"type": "message", "data": '{"n": 2}'}, StopListening()],
+    ]
+
+    def messages():
+        for message in subscriptions.pop(0):
+            if isinstance(message, BaseException):
+                raise message
+            yield message
+
+    pubsub = Mock()
+    pubsub.listen.side_effect = messages
+    with patch('app.dependencies.redis.redis_client') as redis_client, \
+         patch('app.dependencies.redis.time.sleep'):
+        redis_client.pubsub.return_value = pubsub
+        with pytest.raises(StopListening):
+            listen(SUBSCRIPTION_CHANGES_CHANNEL, lambda data: calls.append(data["n"]), lambda: calls.append("resync"))
+
+    # Events published during the reconnect are covered by the second resync
+    assert calls == ["resync", 1, "resync", 2]
+
+@pytest.mark.asyncio
+async def test_resync_reloads_the_snapshot_on_the_loop(mock_db):
+    index = SubscriptionIndex()
+    index.apply({"action": "subscribe", "keyword": "stale", "user_id": 9})
+    result = Mock()
+    result.all.return_value = [("咖啡", 1)]
+    mock_db.execute.return_value = result
+    session_factory = Mock(return_value=mock_db)
+    mock_db.__aenter__.return_value = mock_db
+
+    await asyncio.to_thread(index.resync, session_factory, asyncio.get_running_loop())
+
+    assert index.loaded
+    assert index.subscribers == {"咖啡": {1}}
+    assert index.match("stale 咖啡") == {"咖啡"}
+
+@pytest.mark.asyncio
+async def test_process_job_resolves_subscribers_without_queries(index, mock_db):
+    index.loaded = True
+    index.apply({"action": "subscribe", "keyword": "咖啡", "user_id": 1})
+    index.apply({"action": "subscribe", "keyword": "咖啡廳", "user_id": 1})
+    index.apply({"action": "subscribe", "keyword": "咖啡廳", "user_id": 2})
+    service = NotificationService(mock_db, Mock())
+    service.subscription_service.get_keyword_subscribers = AsyncMock()
+    service.strategies["Discord"] = AsyncMock()
+    mock_db.execute.return_value.scalars.return_value.first.return_value = Mock(id=7)
+    mock_db.execute.return_value.all.return_value = [
+        (1, "Discord", "a@example.com", "d1", None),
+        (2, "Discord", "b@example.com", "d2", None),
+    ]
+
+    await service.process_job({"title": "咖啡廳兼職", "url": "https://a"})
+
+    service.subscription_service.get_keyword_subscribers.assert_not_awaited()
+    assert [call.args[0].discord_id for call in service.strategies["Discord"].send.await_args_list] == ["d1", "d2"]
+    # The job lookup, one recipient query for every subscriber and one ledger insert
+    assert mock_db.execute.await_count == 3
+
+@pytest.mark.asyncio
+async def test_process_job_loads_index_once(index, mock_db):
+    mock_db.execute.return_value.all.return_value = [("咖啡", 1)]
+    mock_db.execute.return_value.scalars.return_value.first.return_value = None
+    service = NotificationService(mock_db, Mock())
+
+    await service.process_job({"title": "外送員", "url": "https://a"})
+    await service.process_job({"title": "外送員", "url": "https://a"})
+
+    assert index.loaded
+    assert mock_db.execute.await_count == 1
+
+@pytest.mark.asyncio
+async def test_subscription_and_user_changes_are_published(index, mock_db, redis):
+    index.loaded = True
+    service = SubscriptionService(mock_db, redis)
+    service.ranking_service = AsyncMock()
+    mock_db.execute.return_value.scalars.return_value.first.side_effect = [Mock(item_id=1), None, Mock(item_id=1), None]
+
+    await service.create_subscription(1, "Barista")
+    await service.create_subscription(2, "barista")
+    assert index.match("barista wanted") == {"barista"}
+    assert index.get_subscribers("barista") == {1, 2}
+
+    mock_db.execute.return_value.scalars.return_value.first.side_effect = [Mock()]
+    mock_db.scalar.return_value = "barista"
+    await service.delete_subscription(1, 1)
+    assert index.get_subscribers("barista") == {2}
+
+    mock_db.execute.return_value.scalars.return_value.first.side_effect = [Mock()]
+    await UserService(mock_db, redis).delete_user(2)
+    assert index.match("barista wanted") == set()
@@ -0,0 +1,35 @@
+import fakeredis
+from unittest.mock import Mock
+from app.services.url_dedupe_service import UrlDedupeService, URL_BLOOM_KEY
+
+def make_service(urls, bits=2 ** 16):
+    mock_db = Mock()
+    mock_db.query.return_value.yield_per.return_value = [(url,) for url in urls]
+    return UrlDedupeService(mock_db, fakeredis.FakeRedis(), bits=bits, hashes=5), mock_db
+
+def test_loads_database_urls_once():
+    service, mock_db = make_service([f"https://job/{i}" for i in range(50)])
+
+    service.ensure_loaded()
+    service.ensure_loaded()
+
+    assert mock_db.query.return_value.yield_per.call_count == 1
+    assert all(service.might_contain_many([f"https://job/{i}" for i in range(50)]))
+
+def test_batch_check_uses_one_round_trip():
+    service, _ = make_service([])
+    service.ensure_loaded()
+    service.add_many(["https://job/1"])
+    service.redis = Mock(wraps=service.redis)
+
+    result = service.might_contain_many(["https://job/1", "https://job/2", "https://job/3"])
+
+    assert result[0] is True
+    assert service.redis.pipeline.call_count == 1
+
+def test_memory_is_fixed_by_bit_count():
+    service, _ = make_service([f"https://job/{i}" for i in range(2000)], bits=2 ** 16)
+    service.ensure_loaded()
+
+    assert service.redis.strlen(URL_BLOOM_KEY) == 2 ** 16 // 8
+    assert service.redis.dbsize() == 2
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from app.services.user_service import UserService
 from app.schemas.auth import UserRegister, UserLogin, UserUpdate
 from fastapi import HTTPException
@@ -7,13 +7,17 @@ from app.models.users import User
 
 @pytest.fixture
 def mock_db():
-    return Mock()
+    db = AsyncMock()
+    db.add = Mock()
+    db.execute.return_value = Mock()
+    return db
 
 @pytest.fixture
 def user_service(mock_db):
     return UserService(mock_db)
 
-def test_register_user_success(user_service, mock_db):
+@pytest.mark.asyncio
+async def test_register_user_success(user_service, mock_db):
     user_data = UserRegister(
         username="abcde",
         email="abcde@example.com",
@@ -22,15 +26,16 @@ def test_register_user_success(user_service, mock_db):
     )
     
 
-    mock_db.query.return_value.filter.return_value.first.return_value = None
+    mock_db.execute.return_value.scalars.return_value.first.return_value = None
 
-    response = user_service.register_user(user_data)
+    response = await user_service.register_user(user_data)
 
     assert response["message"] == "register success"
     mock_db.add.assert_called_once()
     mock_db.commit.assert_called_once()
 
-def test_register_duplicate_username(user_service, mock_db):
+@pytest.mark.asyncio
+async def test_register_duplicate_username(user_service, mock_db):
     user_data = UserRegister(
         username="abcde",
         email="abcde@example.com",
@@ -38,14 +43,15 @@ def test_register_duplicate_username(user_service, mock_db):
         notification_type_id=1
     )
     
-    mock_db.query.return_value.filter.return_value.first.return_value = User()
+    mock_db.execute.return_value.scalars.return_value.first.return_value = User()
     
     with pytest.raises(HTTPException) as exc:
-        user_service.register_user(user_data)
+        await user_service.register_user(user_data)
     assert exc.value.status_code == 400
     assert "username is already used" in exc.value.detail
 
-def test_login_user_success(user_service, mock_db):
+@pytest.mark.asyncio
+async def test_login_user_success(user_service, mock_db):
     login_data = UserLogin(
         username="abcde",
         password="password123"
@@ -54,32 +60,34 @@ def test_login_user_success(user_service, mock_db):
     mock_user = Mock()
     mock_user.password = "hash_password123" 
     mock_user.user_id = 1
-    mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+    mock_db.execute.return_value.scalars.return_value.first.return_value = mock_user
 
     with patch('app.services.user_service.verify_password', return_value=True):
-        response = user_service.login_user(login_data)
+        response = await user_service.login_user(login_data)
     
     assert "access_token" in response
 
-def test_login_user_invalid_credentials(user_service, mock_db):
+@pytest.mark.asyncio
+async def test_login_user_invalid_credentials(user_service, mock_db):
     login_data = UserLogin(
         username="testuser",
         password="wrongpass"
     )
     
     mock_user = Mock()
-    mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+    mock_db.execute.return_value.scalars.return_value.first.return_value = mock_user
     
     with patch('app.services.user_service.verify_password', return_value=False):
         with pytest.raises(HTTPException) as exc:
-            user_service.login_user(login_data)
+            await user_service.login_user(login_data)
         assert exc.value.status_code == 401
 
-def test_update_user_password(user_service, mock_db):
+@pytest.mark.asyncio
+async def test_update_user_password(user_service, mock_db):
     mock_user = Mock()
     mock_user.user_id = 1
     mock_user.password = "hashed_old_password"
-    mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+    mock_db.execute.return_value.scalars.return_value.first.return_value = mock_user
 
     update_data = UserUpdate(
         old_password="oldpassword123",
@@ -90,16 +98,17 @@ def test_update_user_password(user_service, mock_db):
 
     with patch('app.services.user_service.verify_password', return_value=True), \
          patch('app.services.user_service.get_password_hash', return_value="hashed_new_password"):
-        response = user_service.update_user(update_data, mock_user.user_id)
+        response = await user_service.update_user(update_data, mock_user.user_id)
     
     assert response["message"] == "update success"
     mock_db.commit.assert_called_once()
 
-def test_update_user_wrong_old_password(user_service, mock_db):
+@pytest.mark.asyncio
+async def test_update_user_wrong_old_password(user_service, mock_db):
     mock_user = Mock()
     mock_user.user_id = 1
     mock_user.password = "hashed_password"
-    mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+    mock_db.execute.return_value.scalars.return_value.first.return_value = mock_user
 
     update_data = UserUpdate(
         old_password="wrongpass123",
@@ -110,7 +119,7 @@ def test_update_user_wrong_old_password(user_service, mock_db):
 
     with patch('app.services.user_service.verify_password', return_value=False):
         with pytest.raises(HTTPException) as exc:
-            user_service.update_user(update_data, mock_user.user_id)
+            await user_service.update_user(update_data, mock_user.user_id)
     
     assert exc.value.status_code == 401
     assert "Old password is incorrect" in exc.value.detail
@@ -120,18 +129,34 @@ async def test_get_user_notification_preferences(user_service, mock_db):
     mock_user = Mock()
     mock_user.user_id = 1
     mock_user.notification_type_id = 1
-    mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+    mock_db.execute.return_value.scalars.return_value.first.return_value = mock_user
 
     mock_notification_type = Mock()
     mock_notification_type.type = "email"
     mock_notification_type.description = "Email notification"
-    mock_db.query.return_value.filter.return_value.first.return_value = mock_notification_type
+    mock_db.execute.return_value.scalars.return_value.first.return_value = mock_notification_type
 
     preferences = await user_service.get_user_notification_preferences(mock_user.user_id)
     assert preferences.user_id == mock_user.user_id
     assert preferences.notification_type == "email"
 
-def test_update_user_telegram_id(user_service, mock_db):
+@pytest.mark.asyncio
+async def test_get_notification_recipients_batches_one_query(user_service, mock_db):
+    mock_db.execute.return_value.all.return_value = [
+        (1, "Email", "a@example.com", None, None),
+        (2, "Telegram", "b@example.com", None, "t2"),
+    ]
+
+    with patch.object(UserService, 'RECIPIENT_BATCH_SIZE', 2):
+        recipients = await user_service.get_notification_recipients([2, 1, 2, 3])
+
+    assert mock_db.execute.await_count == 2
+    assert recipients[1].email == "a@example.com"
+    assert recipients[2].notification_type == "Telegram"
+    assert recipients[2].telegram_id == "t2"
+
+@pytest.mark.asyncio
+async def test_update_user_telegram_id(user_service, mock_db):
     mock_user = Mock()
     mock_user.user_id = 1
     mock_user.email = "abcde@example.com"
@@ -139,7 +164,7 @@ def test_update_user_telegram_id(user_service, mock_db):
     mock_user.notification_type_id = 1
 
 
-    mock_db.query.return_value.filter.return_value.first.side_effect = [
+    mock_db.execute.return_value.scalars.return_value.first.side_effect = [
         mock_user,
         None, 
     ]
@@ -150,18 +175,19 @@ def test_update_user_telegram_id(user_service, mock_db):
         email="abcde@example.com"
     )
     
-    response = user_service.update_user(update_data, mock_user.user_id)
+    response = await user_service.update_user(update_data, mock_user.user_id)
     assert response["message"] == "update success"
     mock_db.commit.assert_called()
 
-def test_update_user_discord_id(user_service, mock_db):
+@pytest.mark.asyncio
+async def test_update_user_discord_id(user_service, mock_db):
     mock_user = Mock()
     mock_user.user_id = 1
     mock_user.email = "abcde@example.com"
     mock_user.password = "old_password123"
     mock_user.notification_type_id = 1
 
-    mock_db.query.return_value.filter.return_value.first.side_effect = [
+    mock_db.execute.return_value.scalars.return_value.first.side_effect = [
         mock_user,
         None,
     ]
@@ -172,18 +198,19 @@ def test_update_user_discord_id(user_service, mock_db):
         email="abcde@example.com"
     )
     
-    response = user_service.update_user(update_data, mock_user.user_id)
+    response = await user_service.update_user(update_data, mock_user.user_id)
     assert response["message"] == "update success"
     mock_db.commit.assert_called()
 
-def test_update_multiple_fields(user_service, mock_db):
+@pytest.mark.asyncio
+async def test_update_multiple_fields(user_service, mock_db):
     mock_user = Mock()
     mock_user.user_id = 1
     mock_user.email = "abcde@example.com"
     mock_user.password = "hashed_old_password123"
     mock_user.notification_type_id = 1
 
-    mock_db.query.return_value.filter.return_value.first.side_effect = [
+    mock_db.execute.return_value.scalars.return_value.first.side_effect = [
         mock_user,
         None,
         None,
@@ -200,7 +227,7 @@ def test_update_multiple_fields(user_service, mock_db):
 
     with patch('app.services.user_service.verify_password', return_value=True), \
          patch('app.services.user_service.get_password_hash', return_value="hashed_new_password"):
-        response = user_service.update_user(update_data, mock_user.user_id)
+        response = await user_service.update_user(update_data, mock_user.user_id)
 
     assert response["message"] == "update success"
     mock_db.commit.assert_called_once()
@@ -214,7 +241,7 @@ async def test_get_user_profile(user_service, mock_db):
     mock_user.telegram_id = "tele123"
     mock_user.discord_id = "disc123"
     mock_user.notification_type_id = 1
-    mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+    mock_db.execute.return_value.scalars.return_value.first.return_value = mock_user
 
     profile = await user_service.get_user_profile(mock_user.user_id)
     assert profile.username == "abcde"
@@ -228,7 +255,7 @@ async def test_delete_user_success(user_service, mock_db):
     user_id = 1
     
     mock_user = Mock()
-    mock_db.query.return_value.filter.return_value.first.return_value = mock_user
+    mock_db.execute.return_value.scalars.return_value.first.return_value = mock_user
     
     response = await user_service.delete_user(user_id)
     
@@ -238,7 +265,7 @@ async def test_delete_user_success(user_service, mock_db):
 
 @pytest.mark.asyncio
 async def test_delete_nonexistent_user(user_service, mock_db):
-    mock_db.query.return_value.filter.return_value.first.return_value = None
+    mock_db.execute.return_value.scalars.return_value.first.return_value = None
     
     with pytest.raises(HTTPException) as exc:
         await user_service.delete_user(1)